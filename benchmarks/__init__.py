@@ -0,0 +1 @@
+# Framework-overhead benchmarks (python -m benchmarks.run)
@@ -0,0 +1,285 @@
+"""
+Framework-overhead benchmarks run against a static local HTML fixture
+
+Measures what the framework adds on top of the browser: context/page setup as the
+conftest fixtures do it, page-object construction, the BasePage primitives, the
+list getters and step lookup: ``bdd_steps.find`` matches every feature step through
+the pytest-bdd ``StepIndex`` the suite installs, ``async_steps.find`` through the
+async runner's registry. Each operation reports median/p95 latency and the number
+of Playwright protocol messages (round trips) it sends.
+
+Usage:
+    python -m benchmarks.run                      # print results
+    python -m benchmarks.run --save-baseline      # write benchmarks/baseline.json
+    python -m benchmarks.run --compare            # exit 1 if an operation regressed
+"""
+import argparse
+import importlib
+import importlib.metadata
+import json
+import os
+import pathlib
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from pages.base_page import BasePage
+from pages.cart_page import CartPage
+from pages.login_page import LoginPage
+from pages.products_page import ProductsPage
+from step_definitions import STEP_MODULES
+from utilities.async_runner import STEP_REGISTRY, collect_scenarios
+from utilities.bdd_collection import STEP_DEF_PREFIX, StepIndex
+from utilities.browser_pool import BrowserPool
+from utilities.helpers import ConfigManager
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_URL = pathlib.Path(BENCHMARK_DIR, 'fixture.html').as_uri()
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+# Latency changes smaller than this are noise, whatever the relative change
+MIN_REGRESSION_MS = 0.5
+
+OPERATIONS = {}
+
+
+def operation(name):
+    """Register a benchmark operation; it receives the BenchmarkEnvironment"""
+    def decorator(func):
+        OPERATIONS[name] = func
+        return func
+    return decorator
+
+
+def driver_connection(page):
+    """The Playwright connection behind a page, checked for the private send method RoundTripCounter wraps"""
+    connection = getattr(getattr(page, '_impl_obj', None), '_connection', None)
+    if not callable(getattr(connection, '_send_message_to_server', None)):
+        raise RuntimeError(
+            f"Cannot count round trips: playwright {importlib.metadata.version('playwright')} has no "
+            f"page._impl_obj._connection._send_message_to_server; update benchmarks.run.driver_connection")
+    return connection
+
+
+class RoundTripCounter:
+    """Counts protocol messages sent to the Playwright driver by wrapping the connection of a page"""
+
+    def __init__(self, page):
+        self.count = 0
+        self._connection = driver_connection(page)
+        self._send = self._connection._send_message_to_server
+
+        def counting_send(*args, **kwargs):
+            self.count += 1
+            return self._send(*args, **kwargs)
+        self._connection._send_message_to_server = counting_send
+
+    def close(self):
+        self._connection._send_message_to_server = self._send
+
+
+class StepFixtures:
+    """Step definitions of STEP_MODULES, in the shape StepIndex reads from pytest's FixtureManager"""
+
+    def __init__(self, modules):
+        self._arg2fixturedefs = {}
+        for module in modules:
+            for name, func in vars(importlib.import_module(module)).items():
+                if name.startswith(STEP_DEF_PREFIX):
+                    self._arg2fixturedefs.setdefault(name, []).append(SimpleNamespace(func=func))
+
+    def getfixturedefs(self, name, nodeid):
+        return self._arg2fixturedefs.get(name)
+
+
+class BenchmarkEnvironment:
+    """Browser, a page on the fixture and the page objects the operations use"""
+
+    def __init__(self, browser_name, headless=True):
+        self.config = ConfigManager.instance()
+        self.browser_name = browser_name
+        self.pool = BrowserPool(launch_options={'headless': headless})
+        self.pool.start()
+        self.context = self.pool.new_context(browser_name, viewport={'width': 1280, 'height': 720})
+        self.page = self.context.new_page()
+        self.page.goto(FIXTURE_URL)
+        self.base_page = BasePage(self.page, self.config)
+        self.login_page = LoginPage(self.page, self.config)
+        self.products_page = ProductsPage(self.page, self.config)
+        self.cart_page = CartPage(self.page, self.config)
+        import step_definitions.async_steps  # noqa: F401 - registers the async steps
+        self.steps = [step for scenario in collect_scenarios([os.path.join(
+            os.path.dirname(BENCHMARK_DIR), 'features')]) for step in scenario.steps]
+        self.step_fixtures = StepFixtures(STEP_MODULES)
+
+    def close(self):
+        self.pool.release(self.context)
+        self.pool.close()
+
+
+@operation('fixture.context_and_page')
+def context_and_page(env):
+    context = env.pool.new_context(env.browser_name, viewport={'width': 1280, 'height': 720})
+    context.new_page()
+    env.pool.release(context)
+
+
+@operation('page_objects.construct')
+def construct_page_objects(env):
+    BasePage(env.page, env.config)
+    LoginPage(env.page, env.config)
+    ProductsPage(env.page, env.config)
+    CartPage(env.page, env.config)
+
+
+@operation('BasePage.click_element')
+def click_element(env):
+    env.base_page.click_element(LoginPage.USERNAME_INPUT)
+
+
+@operation('BasePage.fill_element')
+def fill_element(env):
+    env.base_page.fill_element(LoginPage.USERNAME_INPUT, 'standard_user')
+
+
+@operation('BasePage.get_text')
+def get_text(env):
+    env.base_page.get_text(ProductsPage.PRODUCTS_TITLE)
+
+
+@operation('BasePage.verify_page_contains_text')
+def verify_page_contains_text(env):
+    env.base_page.verify_page_contains_text('Add to cart')
+
+
+@operation('ProductsPage.get_product_names')
+def get_product_names(env):
+    env.products_page.get_product_names()
+
+
+@operation('ProductsPage.get_product_prices')
+def get_product_prices(env):
+    env.products_page.get_product_prices()
+
+
+@operation('CartPage.get_cart_item_names')
+def get_cart_item_names(env):
+    env.cart_page.get_cart_item_names()
+
+
+@operation('bdd_steps.find')
+def find_bdd_steps(env):
+    # A fresh index, as in each pytest process: built once, then every step matched once
+    index = StepIndex()
+    for step in env.steps:
+        list(index.find_fixturedefs_for_step(step, env.step_fixtures, 'tests/test_benchmark.py::test'))
+
+
+@operation('async_steps.find')
+def find_async_steps(env):
+    for step in env.steps:
+        STEP_REGISTRY.find(step.name)
+
+
+def run_benchmarks(browser_name='chromium', repeat=30, warmup=3, names=None):
+    """Run each operation ``repeat`` times after ``warmup`` runs and return its statistics"""
+    env = BenchmarkEnvironment(browser_name)
+    results = {}
+    try:
+        for name, func in OPERATIONS.items():
+            if names and name not in names:
+                continue
+            for _ in range(warmup):
+                func(env)
+            samples = []
+            counter = RoundTripCounter(env.page)
+            try:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    func(env)
+                    samples.append((time.perf_counter() - started) * 1000)
+            finally:
+                counter.close()
+            ordered = sorted(samples)
+            results[name] = {
+                'median_ms': round(statistics.median(samples), 3),
+                'p95_ms': round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 3),
+                'round_trips': counter.count / repeat,
+            }
+    finally:
+        env.close()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Regressions of results against a baseline: slower median beyond threshold, or more round trips"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = base['median_ms'] * (1 + threshold)
+        if result['median_ms'] > limit and result['median_ms'] - base['median_ms'] > MIN_REGRESSION_MS:
+            regressions.append(f"{name}: median {result['median_ms']:.3f}ms > {base['median_ms']:.3f}ms "
+                               f"+{threshold:.0%}")
+        if result['round_trips'] > base['round_trips']:
+            regressions.append(f"{name}: {result['round_trips']:g} round trips > {base['round_trips']:g}")
+    return regressions
+
+
+def load_baseline(path, browser_name):
+    """Baseline operations for a browser, or {} if none was saved"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as file:
+        return json.load(file).get(browser_name, {})
+
+
+def save_baseline(path, browser_name, results):
+    """Store results as the baseline for a browser, keeping other browsers' baselines"""
+    data = {}
+    if os.path.exists(path):
+        with open(path, 'r') as file:
+            data = json.load(file)
+    data[browser_name] = results
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark framework overhead against a static fixture page")
+    parser.add_argument('--browser', default=None, help="Browser to use (chromium, firefox, webkit)")
+    parser.add_argument('--repeat', type=int, default=30, help="Measured runs per operation")
+    parser.add_argument('--only', nargs='*', default=None, help="Only run these operations")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument('--save-baseline', action='store_true', help="Save the results as the new baseline")
+    parser.add_argument('--compare', action='store_true', help="Fail if an operation regressed against the baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed relative slowdown of the median")
+    args = parser.parse_args(argv)
+
+    browser_name = args.browser or ConfigManager.instance().get('browser', 'chromium')
+    results = run_benchmarks(browser_name, args.repeat, names=args.only)
+    baseline = load_baseline(args.baseline, browser_name)
+
+    print(f"{'operation':<36} {'median':>10} {'p95':>10} {'round trips':>12} {'baseline':>10}")
+    for name, result in results.items():
+        base = f"{baseline[name]['median_ms']:8.3f}ms" if name in baseline else '         -'
+        print(f"{name:<36} {result['median_ms']:8.3f}ms {result['p95_ms']:8.3f}ms {result['round_trips']:12g} {base}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, browser_name, results)
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        if not baseline:
+            print(f"No {browser_name} baseline in {args.baseline}; run with --save-baseline first")
+            return 1
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
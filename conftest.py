@@ -2,82 +2,318 @@
 Pytest configuration and fixtures for the test framework
 """
 import pytest
-import yaml
+import logging
 import os
-from playwright.sync_api import sync_playwright
-from pages.login_page import LoginPage
-from pages.products_page import ProductsPage
-from pages.cart_page import CartPage
+import re
+import sys
+import time
+# Playwright, the browser pool and the page objects are imported by the fixtures that need them,
+# so collection and runs without browser tests do not pay for them (see utilities/import_profile.py)
+from utilities.helpers import ConfigManager, LogManager, WorkerManager
+from utilities.artifact_writer import ArtifactWriter
+from utilities.artifacts import ArtifactPolicy
+from utilities import bdd_collection
+from utilities.catalogue import CaseCatalogue
+from utilities.change_impact import ChangeImpact
+from utilities.data_sources import DATA_TAG_PREFIX, DataSource
+from utilities.instrumentation import Instrumentation, InstrumentationRecorder, TimedProxy
+from utilities.local_storefront import LocalStorefront
+from utilities.network_archive import NETWORK_MODES, HarArchive, NetworkRecorder, NetworkReplayer
+from utilities.resource_policy import ResourcePolicy, ResourceSizes
+from utilities.structured_logging import LogContext
+from utilities.duration_history import DurationHistory, DurationRecorder, parse_shard, split_into_shards
+from step_definitions import STEP_MODULES
+
+# Step definitions are plugins, so every test module sees them without importing (and re-binding) them
+pytest_plugins = STEP_MODULES
 
 def pytest_addoption(parser):
     """Add command line options for pytest"""
     parser.addoption(
         "--browser-name",
         action="store",
-        default="chromium",
-        help="Browser to use for testing (chromium, firefox, webkit)"
+        default=None,
+        help="Browser to use for testing (chromium, firefox, webkit); defaults to BROWSER or config.yaml"
+    )
+    parser.addoption(
+        "--headed",
+        action="store_true",
+        default=False,
+        help="Show the browser window (headless: false), whatever HEADLESS or config.yaml say"
     )
+    parser.addoption(
+        "--feature-affinity",
+        action="store_true",
+        default=False,
+        help="With -n, keep scenarios of the same feature file and Background user on the same xdist worker"
+    )
+    parser.addoption(
+        "--shard",
+        action="store",
+        type=parse_shard,
+        default=None,
+        help="Only run shard i of N (e.g. 2/4), split into equal-time shards using the duration history"
+    )
+    parser.addoption(
+        "--longest-first",
+        action="store_true",
+        default=False,
+        help="Run the historically slowest scenarios first"
+    )
+    parser.addoption(
+        "--instrument",
+        action="store_true",
+        default=False,
+        help="Record step, page-object method and Playwright call latency (see utilities/instrumentation.py)"
+    )
+    parser.addoption(
+        "--network",
+        action="store",
+        choices=NETWORK_MODES,
+        default=None,
+        help="live: use the network; record: capture traffic into per-feature HAR archives; "
+             "replay: serve traffic from the archives only (defaults to network.mode in config.yaml)"
+    )
+    parser.addoption(
+        "--calibrate-resources",
+        action="store_true",
+        default=False,
+        help="Let every request through and record response sizes, so later runs can report the bytes "
+             "the resource policy avoids"
+    )
+    parser.addoption(
+        "--data-shard",
+        action="store",
+        type=parse_shard,
+        default=None,
+        help="Only generate every Nth row (i/N) of data-driven tests, before collection instead of after it"
+    )
+    parser.addoption(
+        "--changed-since",
+        action="store",
+        default=None,
+        metavar="REF",
+        help="Only run the scenarios and test modules affected by changes since a git ref, plus the "
+             "change_impact smoke set (see utilities/change_impact.py)"
+    )
+
+step_started_key = pytest.StashKey()
+step_durations_key = pytest.StashKey()
+resource_stats_key = pytest.StashKey()
+test_failed_key = pytest.StashKey()
+console_messages_key = pytest.StashKey()
+catalogue_key = pytest.StashKey()
+expected_duration_key = pytest.StashKey()
+bdd_collection_key = pytest.StashKey()
+collection_stats_key = pytest.StashKey()
+change_impact_key = pytest.StashKey()
+
+step_logger = logging.getLogger('framework.steps')
+artifact_logger = logging.getLogger('framework.artifacts')
+
+BACKGROUND_LOGIN = re.compile(r'user enters user name as "([^"]*)"')
+
+def merges_logs(config):
+    """Whether this process owns the session log: not an xdist worker, and not a --collect-only run beside a real one"""
+    return not hasattr(config, "workerinput") and not config.option.collectonly
+
+def get_scenario(item):
+    """pytest-bdd scenario bound to a test item, or None for plain tests"""
+    return getattr(getattr(item, 'obj', None), '__scenario__', None)
+
+def affinity_group(item):
+    """xdist group for a scenario: its feature file plus the user its Background logs in as"""
+    scenario = get_scenario(item)
+    if scenario is None:
+        return None
+    feature = scenario.feature
+    for step in (feature.background.steps if feature.background else []):
+        match = BACKGROUND_LOGIN.search(step.name)
+        if match:
+            return f"{feature.rel_filename}:{match.group(1)}"
+    return feature.rel_filename
+
+def context_options(config, video_dir=None):
+    """Options shared by every browser context created for a test"""
+    return {
+        'viewport': {'width': 1280, 'height': 720},
+        'record_video_dir': video_dir
+    }
+
+def archive_name(item):
+    """HAR archive a test records into: its feature file, or its module for plain tests"""
+    scenario = get_scenario(item)
+    filename = scenario.feature.filename if scenario else item.path.name
+    return os.path.splitext(os.path.basename(filename))[0]
+
+def attach_network(request, config, context):
+    """Record or replay the context's traffic according to --network; returns None when live"""
+    mode = request.config.getoption("--network") or config.get('network.mode', 'live')
+    if mode == 'live':
+        return None
+    archive = HarArchive.from_config(config, archive_name(request.node))
+    network = (NetworkRecorder if mode == 'record' else NetworkReplayer)(archive, request.node.nodeid)
+    network.attach(context)
+    return network
+
+def finish_network(network):
+    """Save recorded traffic, or fail the test if replay had to answer requests it never saw"""
+    if isinstance(network, NetworkRecorder):
+        network.save()
+    elif network is not None:
+        network.check()
 
 def load_config():
-    """Load configuration from config.yaml"""
-    config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
-    with open(config_path, 'r') as file:
-        return yaml.safe_load(file)
+    """Get the shared configuration service for config.yaml"""
+    return ConfigManager.instance(os.path.join(os.path.dirname(__file__), 'config.yaml'))
 
 @pytest.fixture(scope="session")
 def config():
     """Provide configuration data"""
     return load_config()
 
+@pytest.fixture(scope="session", autouse=True)
+def local_storefront(config):
+    """Serve the bundled stand-in storefront and point base_url at it when storefront is 'local'"""
+    if not LocalStorefront.is_enabled(config):
+        yield None
+        return
+    with LocalStorefront.from_config(config) as storefront:
+        config.override('base_url', storefront.url)
+        yield storefront
+
 @pytest.fixture(scope="session")
 def browser_name(request):
     """Get browser name from command line"""
     return request.config.getoption("--browser-name")
 
+@pytest.fixture(scope="session")
+def browser_pool(request, config):
+    """Launch browsers once per session (per xdist worker) and share them across tests"""
+    from utilities.browser_pool import BrowserPool
+    # HEADLESS and DEMO_MODE environment variables override config.yaml; --headed overrides both
+    pool = BrowserPool.from_config(config, launch_options={
+        'headless': False if request.config.getoption("--headed") else config.get('headless', False),
+        # Slow every action down only when explicitly demoing, never just because the browser is headed
+        'slow_mo': config.get('slow_mo', 500) if config.get('demo_mode', False) else 0
+    })
+    pool.start()
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="session")
+def resource_sizes(config):
+    """Response sizes learned across runs, used to report the bytes the resource policy avoided"""
+    policy_config = config.get('resource_policy') or {}
+    sizes_path = policy_config.get('sizes_path', 'reports/resource_sizes.json')
+    sizes = ResourceSizes(os.path.join(os.path.dirname(__file__), sizes_path), limit=policy_config.get('sizes_limit', 5000))
+    yield sizes
+    sizes.save()
+
+@pytest.fixture(scope="session")
+def artifact_policy(config):
+    """Which videos and traces to record and keep (see the artifacts section of config.yaml)"""
+    keep_dir = (config.get('artifacts') or {}).get('keep_dir', 'reports/artifacts')
+    # Each xdist worker keeps (and trims) its own subdirectory
+    keep_dir = WorkerManager.get_artifact_dir(os.path.join(os.path.dirname(__file__), keep_dir))
+    return ArtifactPolicy.from_config(config, keep_dir=keep_dir)
+
 @pytest.fixture(scope="function")
-def browser_context(config, browser_name):
-    """Create browser context with Playwright"""
-    with sync_playwright() as p:
-        # Use browser name from command line or config
-        browser_type_name = browser_name or config.get('browser', 'chromium')
-        browser_type = getattr(p, browser_type_name)
-        
-        # Use headless mode from environment variable
-        headless = os.getenv('HEADLESS', 'false').lower() == 'true'
-        
-        browser = browser_type.launch(
-            headless=headless,
-            slow_mo=500 if not headless else 0  # Add delay for demo purposes in headed mode
-        )
-        context = browser.new_context(
-            viewport={'width': 1280, 'height': 720},
-            record_video_dir='videos/' if config.get('video_on_failure', False) else None
+def browser_context(request, config, browser_name, browser_pool, resource_sizes, artifact_policy):
+    """Create a fresh, isolated browser context from the session browser pool"""
+    # Use browser name from command line or config
+    browser_type_name = browser_name or config.get('browser', 'chromium')
+    # Videos and traces go to a temp directory and are only kept if the test fails (or is sampled)
+    capture = artifact_policy.new_capture(request.node.nodeid)
+    context = browser_pool.new_context(browser_type_name, **context_options(config, capture.video_dir))
+    capture.start(context)
+    # Registered before the resource policy, which falls back to it for allowed requests
+    network = attach_network(request, config, context)
+    
+    scenario = get_scenario(request.node)
+    policy = None
+    if request.config.getoption("--calibrate-resources"):
+        # Nothing is blocked, so the sizes of what the policy would block can be learned
+        context.on('response', resource_sizes.observe)
+    else:
+        policy = ResourcePolicy.from_config(
+            config,
+            markers=[marker.name for marker in request.node.iter_markers()],
+            feature=os.path.basename(scenario.feature.filename) if scenario else None,
+            sizes=resource_sizes
         )
-        yield context
-        context.close()
-        browser.close()
+    if policy:
+        policy.apply(context)
+        request.node.stash[resource_stats_key] = policy.stats
+    
+    yield context
+    capture.stop(context, failed=request.node.stash.get(test_failed_key, False))
+    browser_pool.release(context)
+    for path in capture.finish():
+        request.node.user_properties.append(('artifact', path))
+    finish_network(network)
+
+@pytest.fixture(scope="session")
+def auth_state_cache(config):
+    """Storage state of test users that already logged in during this session"""
+    from utilities.auth_state import AuthStateCache
+    return AuthStateCache(config)
+
+@pytest.fixture(scope="function")
+def authenticated_context(config, browser_name, browser_pool, auth_state_cache):
+    """Factory for contexts already logged in as a test user and open on the inventory page"""
+    browser_type_name = browser_name or config.get('browser', 'chromium')
+    contexts = []
+    
+    def _authenticated_context(user_key='valid_user'):
+        state = auth_state_cache.get(user_key)
+        if state is None:
+            login_context = browser_pool.new_context(browser_type_name, **context_options(config))
+            try:
+                state = auth_state_cache.capture(user_key, login_context)
+            finally:
+                browser_pool.release(login_context)
+        context = browser_pool.new_context(browser_type_name, storage_state=state, **context_options(config))
+        contexts.append(context)
+        context.new_page().goto(auth_state_cache.inventory_url)
+        return context
+    
+    yield _authenticated_context
+    for context in contexts:
+        browser_pool.release(context)
 
 @pytest.fixture(scope="function")
-def page(browser_context):
-    """Create a new page"""
+def page(request, browser_context):
+    """Create a new page, keeping its console messages for the failure report"""
     page = browser_context.new_page()
-    yield page
+    messages = request.node.stash[console_messages_key] = []
+    page.on('console', lambda message: messages.append(f"[{message.type}] {message.text}"))
+    yield TimedProxy.wrap_page(page) if Instrumentation.enabled else page
     page.close()
 
 @pytest.fixture(scope="function")
-def login_page(page):
+def base_page(page, config):
+    """Create BasePage instance for page-independent checks"""
+    from pages.base_page import BasePage
+    return BasePage(page, config)
+
+@pytest.fixture(scope="function")
+def login_page(page, config):
     """Create LoginPage instance"""
-    return LoginPage(page)
+    from pages.login_page import LoginPage
+    return LoginPage(page, config)
 
 @pytest.fixture(scope="function")
-def products_page(page):
+def products_page(page, config):
     """Create ProductsPage instance"""
-    return ProductsPage(page)
+    from pages.products_page import ProductsPage
+    return ProductsPage(page, config)
 
 @pytest.fixture(scope="function")
-def cart_page(page):
+def cart_page(page, config):
     """Create CartPage instance"""
-    return CartPage(page)
+    from pages.cart_page import CartPage
+    return CartPage(page, config)
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -85,18 +321,159 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     
-    if rep.when == "call" and rep.failed:
-        # Take screenshot on failure
+    if rep.when == "call":
+        # Carried to the xdist controller with the report for the duration history
+        rep.step_durations = item.stash.get(step_durations_key, [])
+        # Time this test spent in BasePage presence probes and waits (if it used page objects at all)
+        base_page_module = sys.modules.get('pages.base_page')
+        if base_page_module is not None:
+            rep.wait_stats = base_page_module.WaitStats.snapshot()
+            base_page_module.WaitStats.reset()
+    
+    if Instrumentation.enabled:
+        # Page-object and Playwright call spans recorded during this phase
+        rep.instrumentation = Instrumentation.drain()
+    
+    if rep.failed:
+        # Read by browser_context at teardown to decide which artifacts to keep
+        item.stash[test_failed_key] = True
+    
+    if rep.when == "teardown" and resource_stats_key in item.stash:
+        rep.resource_stats = item.stash[resource_stats_key].as_dict()
+    
+    if rep.when == "call" and rep.failed and load_config().get('screenshot_on_failure', True):
+        # Capture screenshot, DOM and console log; the files are written in the background
         try:
             page = item.funcargs.get('page')
             if page:
-                screenshots_dir = 'screenshots'
-                os.makedirs(screenshots_dir, exist_ok=True)
-                screenshot_path = f"{screenshots_dir}/failure_{item.name}_{call.when}.png"
-                page.screenshot(path=screenshot_path)
-                print(f"Screenshot saved: {screenshot_path}")
-        except Exception as e:
-            print(f"Failed to take screenshot: {e}")
+                writer = ArtifactWriter.instance(load_config())
+                label = f"{item.nodeid}:{call.when}"
+                for kind, path in (('screenshot', writer.screenshot(page, label)),
+                                   ('dom', writer.dom_snapshot(page, label)),
+                                   ('console', writer.console_log(label, item.stash.get(console_messages_key, [])))):
+                    item.user_properties.append((kind, path))
+                    rep.sections.append((f"failure {kind}", path))
+        except Exception:
+            artifact_logger.warning("Failed to capture failure artifacts for %s", item.nodeid, exc_info=True)
+
+def pytest_terminal_summary(terminalreporter):
+    """Report collection, the time tests spent waiting and the traffic the resource policy avoided"""
+    report_collection(terminalreporter)
+    report_change_impact(terminalreporter)
+    
+    totals = {}
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            for primitive, (calls, seconds) in (getattr(report, 'wait_stats', None) or {}).items():
+                entry = totals.setdefault(primitive, [0, 0.0])
+                entry[0] += calls
+                entry[1] += seconds
+    if totals:
+        terminalreporter.section("time spent waiting")
+        for primitive, (calls, seconds) in sorted(totals.items(), key=lambda entry: -entry[1][1]):
+            terminalreporter.write_line(f"{primitive:<20} {calls:6d} calls {seconds:9.3f}s")
+    
+    avoided = {'blocked': 0, 'stubbed': 0, 'bytes_avoided': 0, 'unsized': 0}
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            for key, value in (getattr(report, 'resource_stats', None) or {}).items():
+                avoided[key] += value
+    if avoided['blocked'] or avoided['stubbed']:
+        terminalreporter.section("resource policy")
+        sized = avoided['blocked'] + avoided['stubbed'] - avoided['unsized']
+        terminalreporter.write_line(
+            f"{avoided['blocked']} requests blocked, {avoided['stubbed']} stubbed; "
+            f"~{avoided['bytes_avoided'] / 1024:.1f} KiB avoided by the {sized} with a calibrated size")
+        if avoided['unsized']:
+            terminalreporter.write_line(
+                f"{avoided['unsized']} were never seen unblocked; run once with --calibrate-resources to size them")
+
+def report_collection(terminalreporter):
+    """Collection time, feature files parsed or loaded from the cache, and scenarios bound more than once"""
+    config = terminalreporter.config
+    stats = config.stash.get(collection_stats_key, {})
+    if bdd_collection_key not in config.stash or 'seconds' not in stats:
+        return
+    feature_cache, step_index = config.stash[bdd_collection_key]
+    if not feature_cache.parsed + feature_cache.loaded:
+        return
+    terminalreporter.section("collection")
+    terminalreporter.write_line(
+        f"{stats['items']} items collected in {stats['seconds']:.3f}s; feature files: {feature_cache.parsed} parsed, "
+        f"{feature_cache.loaded} from cache ({feature_cache.seconds * 1000:.1f}ms)")
+    if step_index.lookups:
+        terminalreporter.write_line(
+            f"{step_index.lookups} step lookups in {step_index.seconds * 1000:.1f}ms through the step index")
+    for nodeid in stats.get('duplicates', []):
+        terminalreporter.write_line(f"scenario bound more than once: {nodeid}", yellow=True)
+
+def report_change_impact(terminalreporter):
+    """What --changed-since selected, or why it ran the full suite"""
+    if change_impact_key not in terminalreporter.config.stash:
+        return
+    ref, impact, selected, collected = terminalreporter.config.stash[change_impact_key]
+    terminalreporter.section("change impact")
+    if impact.full_suite:
+        terminalreporter.write_line(f"full suite since {ref}: {impact.full_suite}")
+        return
+    terminalreporter.write_line(
+        f"{selected} of {collected} tests selected for {len(impact.changes)} files changed since {ref}: "
+        f"{len(impact.scenarios)} scenarios affected, smoke set {', '.join(impact.smoke) or 'empty'}")
+
+def pytest_bdd_before_scenario(request, feature, scenario):
+    """Stamp log records with the scenario being run"""
+    LogContext.scenario(scenario.name, request.node.nodeid)
+
+def pytest_bdd_after_scenario(request, feature, scenario):
+    """Stop stamping log records with the scenario"""
+    LogContext.clear()
+
+def pytest_bdd_before_step(request, feature, scenario, step, step_func):
+    """Start timing a BDD step"""
+    Instrumentation.start_step(step.name)
+    LogContext.step(step.name)
+    request.node.stash[step_started_key] = time.perf_counter()
+
+def record_step_duration(item, step, outcome):
+    """Store how long a BDD step took on the test item"""
+    duration = time.perf_counter() - item.stash.get(step_started_key, time.perf_counter())
+    item.stash.setdefault(step_durations_key, []).append(
+        {'step': step.name, 'duration': duration, 'outcome': outcome})
+    step_logger.log(logging.DEBUG if outcome == 'passed' else logging.WARNING, "%s %s %s", step.keyword, step.name,
+                    outcome, extra={'duration': round(duration, 6), 'outcome': outcome})
+
+def pytest_bdd_after_step(request, feature, scenario, step, step_func, step_func_args):
+    """Record a passed BDD step"""
+    record_step_duration(request.node, step, 'passed')
+
+def pytest_bdd_step_error(request, feature, scenario, step, step_func, step_func_args, exception):
+    """Record a failed BDD step"""
+    record_step_duration(request.node, step, 'failed')
+
+def pytest_bdd_apply_tag(tag, function):
+    """Turn a @data:<name> scenario tag into the data_source marker"""
+    if tag.startswith(DATA_TAG_PREFIX):
+        pytest.mark.data_source(tag[len(DATA_TAG_PREFIX):])(function)
+        return True
+    return None
+
+def pytest_generate_tests(metafunc):
+    """Parametrize data-driven tests and Scenario Outlines with lazily read rows of their data source"""
+    marker = metafunc.definition.get_closest_marker("data_source")
+    if marker is None:
+        return
+    source, options = DataSource.from_config(load_config(), marker.args[0])
+    options.update(marker.kwargs)
+    tags = options.get('tags')
+    shard = metafunc.config.getoption("--data-shard") or options.get('shard')
+    if "_pytest_bdd_example" in metafunc.fixturenames:
+        # The rows stand in for the Examples table of the outline
+        metafunc.parametrize("_pytest_bdd_example", source.refs(tags, shard), ids=lambda ref: ref.id)
+    elif "data_rows" in metafunc.fixturenames:
+        batches = source.batches(options.get('batch') or 100, tags, shard)
+        metafunc.parametrize("data_rows", batches, ids=lambda batch: batch.id)
+    elif "data_row" in metafunc.fixturenames:
+        metafunc.parametrize("data_row", source.refs(tags, shard), ids=lambda ref: ref.id)
 
 def pytest_configure(config):
     """Configure pytest with custom markers"""
@@ -104,15 +481,161 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "inventory: Inventory related tests")
     config.addinivalue_line("markers", "cart: Cart related tests")
     config.addinivalue_line("markers", "smoke: Smoke tests")
+    config.addinivalue_line("markers", "visual: Visual tests that load every resource (see resource_policy overrides)")
+    config.addinivalue_line("markers", "data_source(name, tags=None, batch=None, shard=None): "
+                                       "parametrize with the rows of a data source (see utilities/data_sources.py)")
+    config.addinivalue_line("markers", "priority(level): Priority of the test case in TestData/TestCaseDocument.xlsx")
+    
+    framework_config = load_config()
+    # Logging runs through a queue; the process that merges the worker logs starts from a clean slate
+    LogManager.configure(framework_config, clear=merges_logs(config))
+    
+    # Test case ids (TC_AUTH_01, ...) are registered from the compiled workbook catalogue
+    catalogue = CaseCatalogue.from_config(framework_config)
+    if catalogue is not None:
+        config.stash[catalogue_key] = catalogue
+        cases = [(case['id'], case['description']) for case in catalogue.cases()]
+    else:
+        cases, source = CaseCatalogue.fallback_cases(framework_config)
+        if source == 'static':
+            config.issue_config_time_warning(pytest.PytestConfigWarning(
+                "No test case workbook or catalogue cache: registering the built-in test case ids "
+                "(utilities/catalogue.py FALLBACK_CASES)"), stacklevel=2)
+    for case_id, description in cases:
+        config.addinivalue_line("markers", f"{case_id}: {description or case_id}")
+    
+    # Parsed features are cached on disk and step definitions looked up through an index
+    collection_config = framework_config.get('bdd_collection') or {}
+    if collection_config.get('enabled', True):
+        cache_dir = collection_config.get('cache_dir', 'reports/gherkin_cache')
+        config.stash[bdd_collection_key] = bdd_collection.install(os.path.join(os.path.dirname(__file__), cache_dir))
+    
+    # Feature affinity is xdist's loadgroup scheduling with groups derived from the feature files
+    if config.getoption("--feature-affinity"):
+        if hasattr(config, "workerinput"):
+            config.option.loadgroup = True
+        elif getattr(config.option, "dist", "no") != "no":
+            config.option.dist = "loadgroup"
+    
+    # Durations are recorded where all reports arrive: the xdist controller or a plain run
+    history_enabled = (framework_config.get('duration_history') or {}).get('enabled', True)
+    if history_enabled and not hasattr(config, "workerinput") and not config.getoption("collectonly"):
+        browser = config.getoption("--browser-name") or framework_config.get('browser', 'chromium')
+        config.pluginmanager.register(
+            DurationRecorder(DurationHistory.from_config(framework_config), browser), "duration_recorder")
+    
+    if config.getoption("--instrument"):
+        Instrumentation.enable()
+        if not hasattr(config, "workerinput") and not config.getoption("collectonly"):
+            spans_path = framework_config.get('instrumentation.path', 'reports/instrumentation.jsonl')
+            config.pluginmanager.register(
+                InstrumentationRecorder(os.path.join(os.path.dirname(__file__), spans_path)), "instrumentation_recorder")
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """Time collection for the collection report"""
+    started = time.perf_counter()
+    yield
+    if not hasattr(session, "items"):
+        return  # xdist controller: the workers collect
+    stats = session.config.stash.setdefault(collection_stats_key, {})
+    stats['seconds'] = time.perf_counter() - started
+    stats['items'] = len(session.items)
+
+def pytest_sessionfinish(session):
+    """Wait for background artifact and log writes once, at the end of the session"""
+    ArtifactWriter.close_all()
+    # Workers finish (and flush) before the controller's session does, so it merges complete files
+    LogManager.shutdown(merge=merges_logs(session.config))
 
+def pytest_unconfigure(config):
+    """Close the test case catalogue"""
+    catalogue = config.stash.get(catalogue_key, None)
+    if catalogue is not None:
+        catalogue.close()
+
+def apply_catalogue(catalogue, item):
+    """Attach the markers, priority and expected duration of the test cases an item is tagged with"""
+    for name in {marker.name for marker in item.iter_markers()}:
+        case = catalogue.get(name)
+        if case is None:
+            continue
+        for marker in catalogue.markers_for(case):
+            item.add_marker(getattr(pytest.mark, marker))
+        if case['priority']:
+            item.add_marker(pytest.mark.priority(case['priority']))
+        if case['expected_duration'] is not None:
+            item.stash[expected_duration_key] = case['expected_duration']
+        item.user_properties.append(('test_case', case['id']))
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on test names"""
+    feature_affinity = getattr(config.option, "loadgroup", False)
+    catalogue = config.stash.get(catalogue_key, None)
     for item in items:
+        if feature_affinity and not item.get_closest_marker("xdist_group"):
+            group = affinity_group(item)
+            if group:
+                item.add_marker(pytest.mark.xdist_group(name=group))
         if "auth" in item.name.lower():
             item.add_marker(pytest.mark.auth)
         if "inventory" in item.name.lower() or "inv" in item.name.lower():
             item.add_marker(pytest.mark.inventory)
         if "cart" in item.name.lower():
             item.add_marker(pytest.mark.cart)
-        if any(marker in item.name.lower() for marker in ["tc_auth_01", "tc_auth_02", "tc_inv_01", "tc_cart_01"]):
-            item.add_marker(pytest.mark.smoke)
+        if catalogue is not None:
+            apply_catalogue(catalogue, item)
+    
+    duplicates = bdd_collection.duplicate_bindings(items)
+    config.stash.setdefault(collection_stats_key, {})['duplicates'] = [item.nodeid for item in duplicates]
+    apply_change_impact(config, items)
+    apply_duration_ordering(config, items)
+
+def apply_change_impact(config, items):
+    """Apply --changed-since: keep the tests a change can affect and the smoke set"""
+    ref = config.getoption("--changed-since")
+    if not ref:
+        return
+    try:
+        impact = ChangeImpact.from_config(load_config(), ref)
+    except RuntimeError as error:
+        raise pytest.UsageError(f"--changed-since: {error}")
+    collected = len(items)
+    if impact.full_suite is None:
+        smoke = set(impact.smoke)
+        selected = []
+        for item in items:
+            scenario = get_scenario(item)
+            # A scenario is also affected through its test module, e.g. a changed scenarios() call
+            if impact.affects_module(str(item.path)) \
+                    or scenario and impact.affects_scenario(scenario.feature.filename, scenario.name) \
+                    or smoke & {marker.name for marker in item.iter_markers()}:
+                selected.append(item)
+        kept = set(map(id, selected))
+        deselected = [item for item in items if id(item) not in kept]
+        items[:] = selected
+        config.hook.pytest_deselected(items=deselected)
+    config.stash[change_impact_key] = (ref, impact, len(items), collected)
+
+def apply_duration_ordering(config, items):
+    """Apply --shard and --longest-first using the recorded duration history"""
+    shard = config.getoption("--shard")
+    longest_first = config.getoption("--longest-first")
+    if not shard and not longest_first:
+        return
+    history = DurationHistory.from_config(load_config())
+    try:
+        durations = history.expected_durations(
+            [item.nodeid for item in items],
+            defaults={item.nodeid: item.stash[expected_duration_key] for item in items if expected_duration_key in item.stash})
+    finally:
+        history.close()
+    if shard:
+        index, count = shard
+        selected = set(split_into_shards(durations, count)[index - 1])
+        deselected = [item for item in items if item.nodeid not in selected]
+        items[:] = [item for item in items if item.nodeid in selected]
+        config.hook.pytest_deselected(items=deselected)
+    if longest_first:
+        items.sort(key=lambda item: -durations[item.nodeid])
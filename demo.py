@@ -12,13 +12,11 @@ sys.path.insert(0, project_root)
 from pages.login_page import LoginPage
 from pages.products_page import ProductsPage
 from pages.cart_page import CartPage
-import yaml
+from utilities.helpers import ConfigManager
 
 def load_config():
     """Load configuration"""
-    config_path = os.path.join(project_root, 'config.yaml')
-    with open(config_path, 'r') as file:
-        return yaml.safe_load(file)
+    return ConfigManager.instance(os.path.join(project_root, 'config.yaml'))
 
 def demo_login_scenarios():
     """Demonstrate login scenarios without Playwright"""
@@ -19,3 +19,12 @@ Feature: Authentication Module
         And user clicks Login Button
         Then verify page has text "Login"
         And Login Button should be still displayed
+
+    @TC_AUTH_03 @data:logins
+    Scenario Outline: Login with credentials from the login data set
+        When user enters user name as "<username>" and password as "<password>"
+        And user clicks Login Button
+        Then verify page has text "<expected_text>"
+
+        Examples:
+            | username | password | expected_text |
@@ -12,6 +12,6 @@ Feature: Cart Module
 
     @TC_CART_01
     Scenario: View cart contents
-        And user clicks Add to cart
+        When user clicks Add to cart
         And user clicks cart icon
         Then verify page has text "Your Cart"
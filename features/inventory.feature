@@ -17,6 +17,6 @@ Feature: Inventory Module
 
     @TC_INV_02
     Scenario: Sort products by Name (A–Z)
-        And user clicks Sort Icon
+        When user clicks Sort Icon
         And user clicks Sort the Products by Name (A–Z)
         Then all the products must be sorted from A to Z
@@ -0,0 +1 @@
+# Async page objects (playwright.async_api twins of the classes in pages/)
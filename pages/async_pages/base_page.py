@@ -0,0 +1,161 @@
+"""
+Async Base Page class containing common functionality for all async page objects
+"""
+from playwright.async_api import Page, ElementHandle, TimeoutError as PlaywrightTimeoutError
+from functools import reduce
+from typing import List, Optional
+import time
+from pages.base_page import TEXT_PROBE_SCRIPT, BasePage, WaitStats
+from utilities.artifact_writer import ArtifactWriter
+from utilities.helpers import ConfigManager
+from utilities.selector_cache import SelectorCache
+
+class AsyncBasePage:
+    # Readiness (see BasePage)
+    READY_STATE = BasePage.READY_STATE
+    READY_SELECTOR: Optional[str] = None
+    READY_RESPONSE: Optional[str] = None
+    
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
+        self.page = page
+        self.config = config if config is not None else ConfigManager.instance()
+    
+    async def navigate_to(self, url: str = None) -> None:
+        """Navigate to a specific URL or base URL if no URL provided, and wait until the page is ready"""
+        if url is None:
+            url = self.config['base_url']
+        timeout = self.config.get('timeout', 30000)
+        if self.READY_RESPONSE:
+            async with self.page.expect_response(self.READY_RESPONSE, timeout=timeout):
+                await self.page.goto(url, wait_until=self.READY_STATE, timeout=timeout)
+        else:
+            await self.page.goto(url, wait_until=self.READY_STATE, timeout=timeout)
+        await self.wait_for_ready_selector(timeout)
+        
+    async def wait_for_element(self, selector: str, timeout: Optional[int] = None) -> ElementHandle:
+        """Wait for element to be visible"""
+        if timeout is None:
+            timeout = self.config.get('timeout', 30000)
+        return await self.page.wait_for_selector(selector, timeout=timeout)
+        
+    async def click_element(self, selector: str) -> None:
+        """Click on an element"""
+        element = await self.wait_for_element(selector)
+        await element.click()
+        
+    async def fill_element(self, selector: str, text: str) -> None:
+        """Fill text in an element"""
+        element = await self.wait_for_element(selector)
+        await element.fill(text)
+        
+    async def get_text(self, selector: str) -> str:
+        """Get text from an element"""
+        element = await self.wait_for_element(selector)
+        return await element.text_content()
+        
+    async def is_element_present(self, selector: str) -> bool:
+        """Check whether an element is visible right now, without waiting"""
+        started = time.perf_counter()
+        try:
+            return await self.page.locator(selector).first.is_visible()
+        finally:
+            WaitStats.record('is_element_present', time.perf_counter() - started)
+            
+    async def wait_for_visible(self, selector: str, timeout: Optional[int] = None) -> bool:
+        """Wait until an element is visible; False if it does not appear before the deadline"""
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        started = time.perf_counter()
+        try:
+            await self.page.wait_for_selector(selector, state='visible', timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        finally:
+            WaitStats.record('wait_for_visible', time.perf_counter() - started)
+            
+    async def wait_for_hidden(self, selector: str, timeout: Optional[int] = None) -> bool:
+        """Wait until an element is hidden or removed; False if it is still shown at the deadline"""
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        started = time.perf_counter()
+        try:
+            await self.page.wait_for_selector(selector, state='hidden', timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        finally:
+            WaitStats.record('wait_for_hidden', time.perf_counter() - started)
+            
+    async def is_element_visible(self, selector: str, timeout: Optional[int] = None) -> bool:
+        """Check if element is visible, waiting up to wait_time for it to appear"""
+        return await self.wait_for_visible(selector, timeout)
+            
+    async def locate(self, name: str, candidates: List[str], timeout: Optional[int] = None) -> Optional[str]:
+        """Return the candidate selector that matches on this page, or None if none appears
+        
+        Shares the selector cache with the sync page objects (see BasePage.locate).
+        """
+        cache_config = self.config.get('selector_cache') or {}
+        cache = SelectorCache.instance(self.config)
+        page_name = type(self).__name__[len('Async'):] if type(self).__name__.startswith('Async') else type(self).__name__
+        key = SelectorCache.make_key(page_name, name, cache_config.get('app_version', self.config.get('base_url')))
+        cached = cache.get(key)
+        race = reduce(lambda combined, selector: combined.or_(self.page.locator(selector)),
+                      candidates[1:], self.page.locator(candidates[0]))
+        if cached == SelectorCache.NO_MATCH and not await race.first.is_visible():
+            return None
+        if cached in candidates:
+            if await self.wait_for_visible(cached, cache_config.get('probe_timeout', 1000)):
+                return cached
+            cache.remove(key)
+        
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        started = time.perf_counter()
+        try:
+            await race.first.wait_for(state='visible', timeout=timeout)
+        except PlaywrightTimeoutError:
+            cache.set(key, SelectorCache.NO_MATCH)
+            return None
+        finally:
+            WaitStats.record('locate', time.perf_counter() - started)
+        for selector in candidates:
+            if await self.is_element_present(selector):
+                cache.set(key, selector)
+                return selector
+        return None
+            
+    async def wait_for_text(self, text: str, within: Optional[str] = None, timeout: Optional[int] = None) -> bool:
+        """Wait until text is rendered on the page, or inside the elements matching ``within``"""
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        try:
+            await self.page.wait_for_function(TEXT_PROBE_SCRIPT, arg={'text': text, 'within': within}, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+            
+    async def verify_page_contains_text(self, text: str, within: Optional[str] = None, timeout: Optional[int] = None) -> bool:
+        """Verify if page contains specific text, retrying until the text appears or the wait times out"""
+        return await self.wait_for_text(text, within, timeout)
+        
+    async def take_screenshot(self, name: str) -> str:
+        """Take a screenshot; it is written in the background and its path returned right away"""
+        writer = ArtifactWriter.instance(self.config)
+        return writer.write_screenshot(await self.page.screenshot(**writer.screenshot_options()), name)
+        
+    async def get_page_title(self) -> str:
+        """Get page title"""
+        return await self.page.title()
+        
+    async def wait_for_page_load(self) -> None:
+        """Wait until the page satisfies its declared readiness condition"""
+        timeout = self.config.get('timeout', 30000)
+        await self.page.wait_for_load_state(self.READY_STATE, timeout=timeout)
+        await self.wait_for_ready_selector(timeout)
+        
+    async def wait_for_ready_selector(self, timeout: Optional[int] = None) -> None:
+        """Wait for the page's sentinel element, if it declares one"""
+        if self.READY_SELECTOR:
+            await self.page.wait_for_selector(self.READY_SELECTOR, state='visible', timeout=timeout)
@@ -0,0 +1,80 @@
+"""
+Async Cart Page Object Model
+"""
+from playwright.async_api import Page
+from pages.async_pages.base_page import AsyncBasePage
+from pages.cart_page import CartPage, CartRecord, CART_SNAPSHOT_SCRIPT
+from utilities.helpers import ConfigManager
+from typing import List, Optional
+
+class AsyncCartPage(AsyncBasePage):
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
+        super().__init__(page, config)
+        
+    # Locators (shared with the sync page object)
+    CART_TITLE = CartPage.CART_TITLE
+    CART_ITEMS = CartPage.CART_ITEMS
+    CART_ITEM_NAMES = CartPage.CART_ITEM_NAMES
+    REMOVE_BUTTONS = CartPage.REMOVE_BUTTONS
+    CONTINUE_SHOPPING_BUTTON = CartPage.CONTINUE_SHOPPING_BUTTON
+    CHECKOUT_BUTTON = CartPage.CHECKOUT_BUTTON
+    CART_QUANTITY = CartPage.CART_QUANTITY
+    CART_ITEM_PRICES = CartPage.CART_ITEM_PRICES
+    
+    # Readiness (shared with the sync page object)
+    READY_STATE = CartPage.READY_STATE
+    READY_SELECTOR = CartPage.READY_SELECTOR
+    
+    async def snapshot(self) -> List[CartRecord]:
+        """Get all cart lines as records, in page order"""
+        rows = await self.page.eval_on_selector_all(self.CART_ITEMS, CART_SNAPSHOT_SCRIPT, {
+            'name': self.CART_ITEM_NAMES,
+            'price': self.CART_ITEM_PRICES,
+            'quantity': self.CART_QUANTITY,
+            'button': self.REMOVE_BUTTONS,
+        })
+        return [CartRecord(**row) for row in rows]
+    
+    async def verify_cart_page_loaded(self) -> bool:
+        """Verify that cart page is loaded"""
+        return await self.wait_for_visible(self.CART_TITLE) and "Your Cart" in await self.get_text(self.CART_TITLE)
+        
+    async def verify_your_cart_text_displayed(self) -> bool:
+        """Verify 'Your Cart' text is displayed"""
+        return await self.verify_page_contains_text("Your Cart")
+        
+    async def get_cart_items_count(self) -> int:
+        """Get the number of items in cart"""
+        return len(await self.snapshot())
+        
+    async def get_cart_item_names(self) -> List[str]:
+        """Get list of all cart item names"""
+        return [item.name for item in await self.snapshot()]
+        
+    async def remove_item_from_cart(self, item_name: str) -> None:
+        """Remove a specific item from cart by name"""
+        remove_button = f'[data-test="remove-{item_name.lower().replace(" ", "-")}"]'
+        await self.click_element(remove_button)
+        
+    async def remove_first_item_from_cart(self) -> None:
+        """Remove first item from cart"""
+        first_remove_btn = await self.page.query_selector(self.REMOVE_BUTTONS)
+        if first_remove_btn:
+            await first_remove_btn.click()
+            
+    async def click_continue_shopping(self) -> None:
+        """Click continue shopping button"""
+        await self.click_element(self.CONTINUE_SHOPPING_BUTTON)
+        
+    async def click_checkout(self) -> None:
+        """Click checkout button"""
+        await self.click_element(self.CHECKOUT_BUTTON)
+        
+    async def is_cart_empty(self) -> bool:
+        """Check if cart is empty"""
+        return await self.get_cart_items_count() == 0
+        
+    async def verify_item_in_cart(self, item_name: str) -> bool:
+        """Verify specific item is in cart"""
+        cart_items = await self.get_cart_item_names()
+        return item_name in cart_items
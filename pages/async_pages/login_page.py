@@ -0,0 +1,71 @@
+"""
+Async Login Page Object Model
+"""
+from playwright.async_api import Page
+from pages.async_pages.base_page import AsyncBasePage
+from pages.login_page import LoginPage
+from utilities.helpers import ConfigManager
+from typing import Optional
+
+class AsyncLoginPage(AsyncBasePage):
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
+        super().__init__(page, config)
+        
+    # Locators (shared with the sync page object)
+    USERNAME_INPUT = LoginPage.USERNAME_INPUT
+    PASSWORD_INPUT = LoginPage.PASSWORD_INPUT
+    LOGIN_BUTTON = LoginPage.LOGIN_BUTTON
+    ERROR_MESSAGE = LoginPage.ERROR_MESSAGE
+    LOGO = LoginPage.LOGO
+    
+    # Readiness (shared with the sync page object)
+    READY_STATE = LoginPage.READY_STATE
+    READY_SELECTOR = LoginPage.READY_SELECTOR
+    
+    async def navigate_to_login_page(self) -> None:
+        """Navigate to the login page and wait until the login form is ready"""
+        await self.navigate_to()
+        
+    async def enter_username(self, username: str) -> None:
+        """Enter username in the username field"""
+        await self.fill_element(self.USERNAME_INPUT, username)
+        
+    async def enter_password(self, password: str) -> None:
+        """Enter password in the password field"""
+        await self.fill_element(self.PASSWORD_INPUT, password)
+        
+    async def click_login_button(self) -> None:
+        """Click the login button"""
+        await self.click_element(self.LOGIN_BUTTON)
+        
+    async def login_with_credentials(self, username: str, password: str) -> None:
+        """Complete login process with given credentials"""
+        await self.enter_username(username)
+        await self.enter_password(password)
+        await self.click_login_button()
+        
+    async def login_with_valid_credentials(self) -> None:
+        """Login with valid credentials from config"""
+        valid_user = self.config['test_users']['valid_user']
+        await self.login_with_credentials(valid_user['username'], valid_user['password'])
+        
+    async def login_with_invalid_credentials(self) -> None:
+        """Login with invalid credentials from config"""
+        invalid_user = self.config['test_users']['invalid_user']
+        await self.login_with_credentials(invalid_user['username'], invalid_user['password'])
+        
+    async def is_login_button_visible(self) -> bool:
+        """Check if login button is visible"""
+        return await self.is_element_visible(self.LOGIN_BUTTON)
+        
+    async def get_error_message(self) -> str:
+        """Get error message text"""
+        return await self.get_text(self.ERROR_MESSAGE)
+        
+    async def is_error_message_displayed(self) -> bool:
+        """Check if error message is displayed"""
+        return await self.is_element_visible(self.ERROR_MESSAGE)
+        
+    async def verify_login_page_loaded(self) -> bool:
+        """Verify that login page is loaded"""
+        return await self.wait_for_visible(self.LOGO) and await self.is_element_present(self.LOGIN_BUTTON)
@@ -0,0 +1,130 @@
+"""
+Async Products/Inventory Page Object Model
+"""
+from playwright.async_api import Page
+from pages.async_pages.base_page import AsyncBasePage
+from pages.products_page import ProductsPage, ProductRecord, PRODUCTS_SNAPSHOT_SCRIPT, is_sorted
+from utilities.helpers import ConfigManager
+from typing import List, Optional
+
+class AsyncProductsPage(AsyncBasePage):
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
+        super().__init__(page, config)
+        
+    # Locators (shared with the sync page object)
+    PRODUCTS_TITLE = ProductsPage.PRODUCTS_TITLE
+    PRODUCT_ITEMS = ProductsPage.PRODUCT_ITEMS
+    ADD_TO_CART_BUTTONS = ProductsPage.ADD_TO_CART_BUTTONS
+    CART_ICON = ProductsPage.CART_ICON
+    CART_ICON_CANDIDATES = ProductsPage.CART_ICON_CANDIDATES
+    CART_BADGE = ProductsPage.CART_BADGE
+    SORT_DROPDOWN = ProductsPage.SORT_DROPDOWN
+    PRODUCT_NAMES = ProductsPage.PRODUCT_NAMES
+    PRODUCT_PRICES = ProductsPage.PRODUCT_PRICES
+    PRODUCT_DESCRIPTIONS = ProductsPage.PRODUCT_DESCRIPTIONS
+    PRODUCT_BUTTONS = ProductsPage.PRODUCT_BUTTONS
+    
+    # Readiness (shared with the sync page object)
+    READY_STATE = ProductsPage.READY_STATE
+    READY_SELECTOR = ProductsPage.READY_SELECTOR
+    
+    async def snapshot(self) -> List[ProductRecord]:
+        """Get all displayed products as records, in page order"""
+        rows = await self.page.eval_on_selector_all(self.PRODUCT_ITEMS, PRODUCTS_SNAPSHOT_SCRIPT, {
+            'name': self.PRODUCT_NAMES,
+            'price': self.PRODUCT_PRICES,
+            'description': self.PRODUCT_DESCRIPTIONS,
+            'button': self.PRODUCT_BUTTONS,
+        })
+        return [ProductRecord(**row) for row in rows]
+    
+    async def verify_products_page_loaded(self) -> bool:
+        """Verify that products page is loaded"""
+        return await self.is_element_visible(self.PRODUCTS_TITLE) and "Products" in await self.get_text(self.PRODUCTS_TITLE)
+        
+    async def verify_products_text_displayed(self) -> bool:
+        """Verify 'Products' text is displayed"""
+        return await self.verify_page_contains_text("Products")
+        
+    async def verify_add_to_cart_text_displayed(self) -> bool:
+        """Verify 'Add to cart' text is displayed"""
+        return await self.verify_page_contains_text("Add to cart")
+        
+    async def get_product_count(self) -> int:
+        """Get the number of products displayed"""
+        return len(await self.snapshot())
+        
+    async def add_first_product_to_cart(self) -> None:
+        """Add the first product to cart"""
+        first_add_to_cart_btn = await self.page.query_selector(self.ADD_TO_CART_BUTTONS)
+        if first_add_to_cart_btn:
+            await first_add_to_cart_btn.click()
+            
+    async def add_product_to_cart_by_name(self, product_name: str) -> None:
+        """Add a specific product to cart by name"""
+        product_button = f'[data-test="add-to-cart-{product_name.lower().replace(" ", "-")}"]'
+        await self.click_element(product_button)
+        
+    async def click_cart_icon(self) -> None:
+        """Click on cart icon"""
+        selector = await self.locate('CART_ICON', self.CART_ICON_CANDIDATES)
+        if selector:
+            await self.page.click(selector)
+        else:
+            # No known cart link on the page (or last time, per the selector cache): open the cart URL
+            base_url = self.page.url.split('/inventory')[0]
+            await self.page.goto(f"{base_url}/cart.html")
+        await self.page.wait_for_url("**/cart.html", timeout=self.config.get('wait_time', 5) * 1000)
+        
+    async def get_cart_badge_count(self) -> str:
+        """Get cart badge count"""
+        if await self.is_element_present(self.CART_BADGE):
+            return await self.get_text(self.CART_BADGE)
+        return "0"
+        
+    async def sort_products(self, option: str) -> None:
+        """Sort products using a value of the sort dropdown (az, za, lohi, hilo)"""
+        await self.click_element(self.SORT_DROPDOWN)
+        await self.page.select_option(self.SORT_DROPDOWN, option)
+        
+    async def sort_products_by_name_a_to_z(self) -> None:
+        """Sort products by name A to Z"""
+        await self.sort_products("az")
+        
+    async def sort_products_by_name_z_to_a(self) -> None:
+        """Sort products by name Z to A"""
+        await self.sort_products("za")
+        
+    async def sort_products_by_price_low_to_high(self) -> None:
+        """Sort products by price low to high"""
+        await self.sort_products("lohi")
+        
+    async def sort_products_by_price_high_to_low(self) -> None:
+        """Sort products by price high to low"""
+        await self.sort_products("hilo")
+        
+    async def get_product_names(self) -> List[str]:
+        """Get list of all product names"""
+        return [product.name for product in await self.snapshot()]
+        
+    async def get_product_prices(self) -> List[Optional[float]]:
+        """Get list of all product prices (None where a product shows no price)"""
+        return [product.price for product in await self.snapshot()]
+        
+    async def verify_products_sorted_a_to_z(self) -> bool:
+        """Verify products are sorted from A to Z"""
+        product_names = await self.get_product_names()
+        return product_names == sorted(product_names)
+        
+    async def verify_products_sorted_z_to_a(self) -> bool:
+        """Verify products are sorted from Z to A"""
+        product_names = await self.get_product_names()
+        return product_names == sorted(product_names, reverse=True)
+        
+    async def verify_products_sorted_price_low_to_high(self) -> bool:
+        """Verify products are sorted by price from low to high"""
+        return is_sorted(await self.get_product_prices())
+        
+    async def verify_products_sorted_price_high_to_low(self) -> bool:
+        """Verify products are sorted by price from high to low"""
+        return is_sorted(await self.get_product_prices(), reverse=True)
@@ -1,73 +1,211 @@
 """
 Base Page class containing common functionality for all page objects
 """
-from playwright.sync_api import Page, Locator
-from typing import Optional
-import yaml
-import os
+from playwright.sync_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
+from functools import reduce
+from typing import Dict, List, Optional
+import time
+from utilities.artifact_writer import ArtifactWriter
+from utilities.helpers import ConfigManager
+from utilities.instrumentation import timed
+from utilities.selector_cache import SelectorCache
+
+# Evaluated inside the browser so the DOM never crosses the wire. Matches the rendered
+# text of the page (or of every element matching a selector) plus the labels of
+# button-like inputs, which only exist as value attributes.
+TEXT_PROBE_SCRIPT = """({ text, within }) => {
+    const roots = within ? Array.from(document.querySelectorAll(within)) : [document.body];
+    return roots.some(root => {
+        if (!root) return false;
+        if ((root.innerText || root.textContent || '').includes(text)) return true;
+        const buttons = root.querySelectorAll('input[type="submit"], input[type="button"], input[type="reset"]');
+        return Array.from(buttons).some(button => button.value.includes(text));
+    });
+}"""
+
+class WaitStats:
+    """Calls and seconds spent in each presence/absence primitive since the last reset"""
+    
+    totals: Dict[str, list] = {}
+    
+    @classmethod
+    def record(cls, primitive: str, seconds: float) -> None:
+        """Add one call of a primitive"""
+        entry = cls.totals.setdefault(primitive, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+        
+    @classmethod
+    def snapshot(cls) -> Dict[str, list]:
+        """Copy of the totals, safe to attach to a test report"""
+        return {primitive: list(entry) for primitive, entry in cls.totals.items()}
+        
+    @classmethod
+    def reset(cls) -> None:
+        """Start counting from zero"""
+        cls.totals = {}
 
 class BasePage:
-    def __init__(self, page: Page):
+    # Readiness: the load state to wait for, plus an optional element that must be
+    # visible and an optional response (URL glob) that must arrive during navigation
+    READY_STATE = 'load'
+    READY_SELECTOR: Optional[str] = None
+    READY_RESPONSE: Optional[str] = None
+    
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
         self.page = page
-        self.config = self._load_config()
-        
-    def _load_config(self) -> dict:
-        """Load configuration from config.yaml"""
-        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.yaml')
-        with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
+        self.config = config if config is not None else ConfigManager.instance()
     
+    @timed
     def navigate_to(self, url: str = None) -> None:
-        """Navigate to a specific URL or base URL if no URL provided"""
+        """Navigate to a specific URL or base URL if no URL provided, and wait until the page is ready"""
         if url is None:
             url = self.config['base_url']
-        self.page.goto(url)
+        timeout = self.config.get('timeout', 30000)
+        if self.READY_RESPONSE:
+            with self.page.expect_response(self.READY_RESPONSE, timeout=timeout):
+                self.page.goto(url, wait_until=self.READY_STATE, timeout=timeout)
+        else:
+            self.page.goto(url, wait_until=self.READY_STATE, timeout=timeout)
+        self.wait_for_ready_selector(timeout)
         
+    @timed
     def wait_for_element(self, selector: str, timeout: Optional[int] = None) -> Locator:
         """Wait for element to be visible"""
         if timeout is None:
             timeout = self.config.get('timeout', 30000)
         return self.page.wait_for_selector(selector, timeout=timeout)
         
+    @timed
     def click_element(self, selector: str) -> None:
         """Click on an element"""
         element = self.wait_for_element(selector)
         element.click()
         
+    @timed
     def fill_element(self, selector: str, text: str) -> None:
         """Fill text in an element"""
         element = self.wait_for_element(selector)
         element.fill(text)
         
+    @timed
     def get_text(self, selector: str) -> str:
         """Get text from an element"""
         element = self.wait_for_element(selector)
         return element.text_content()
         
+    @timed
+    def is_element_present(self, selector: str) -> bool:
+        """Check whether an element is visible right now, without waiting"""
+        started = time.perf_counter()
+        try:
+            return self.page.locator(selector).first.is_visible()
+        finally:
+            WaitStats.record('is_element_present', time.perf_counter() - started)
+            
+    @timed
+    def wait_for_visible(self, selector: str, timeout: Optional[int] = None) -> bool:
+        """Wait until an element is visible; False if it does not appear before the deadline"""
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        started = time.perf_counter()
+        try:
+            self.page.wait_for_selector(selector, state='visible', timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        finally:
+            WaitStats.record('wait_for_visible', time.perf_counter() - started)
+            
+    @timed
+    def wait_for_hidden(self, selector: str, timeout: Optional[int] = None) -> bool:
+        """Wait until an element is hidden or removed; False if it is still shown at the deadline"""
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        started = time.perf_counter()
+        try:
+            self.page.wait_for_selector(selector, state='hidden', timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+        finally:
+            WaitStats.record('wait_for_hidden', time.perf_counter() - started)
+            
     def is_element_visible(self, selector: str, timeout: Optional[int] = None) -> bool:
-        """Check if element is visible"""
+        """Check if element is visible, waiting up to wait_time for it to appear"""
+        return self.wait_for_visible(selector, timeout)
+            
+    @timed
+    def locate(self, name: str, candidates: List[str], timeout: Optional[int] = None) -> Optional[str]:
+        """Return the candidate selector that matches on this page, or None if none appears
+        
+        The selector that won last time (per page object and app version) is probed
+        first with a short timeout and evicted if it no longer matches. Otherwise all
+        candidates are raced in one wait and the winner, or ``SelectorCache.NO_MATCH``
+        if none appeared, is written back to the selector cache for later runs. After
+        a ``NO_MATCH`` the candidates are only checked without waiting, so the caller's
+        fallback does not pay the timeout again.
+        """
+        cache_config = self.config.get('selector_cache') or {}
+        cache = SelectorCache.instance(self.config)
+        key = SelectorCache.make_key(type(self).__name__, name, cache_config.get('app_version', self.config.get('base_url')))
+        cached = cache.get(key)
+        race = reduce(lambda combined, selector: combined.or_(self.page.locator(selector)),
+                      candidates[1:], self.page.locator(candidates[0]))
+        if cached == SelectorCache.NO_MATCH and not race.first.is_visible():
+            return None
+        if cached in candidates:
+            if self.wait_for_visible(cached, cache_config.get('probe_timeout', 1000)):
+                return cached
+            cache.remove(key)
+        
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        started = time.perf_counter()
         try:
-            if timeout is None:
-                timeout = self.config.get('wait_time', 5) * 1000
-            self.page.wait_for_selector(selector, timeout=timeout)
+            race.first.wait_for(state='visible', timeout=timeout)
+        except PlaywrightTimeoutError:
+            cache.set(key, SelectorCache.NO_MATCH)
+            return None
+        finally:
+            WaitStats.record('locate', time.perf_counter() - started)
+        for selector in candidates:
+            if self.is_element_present(selector):
+                cache.set(key, selector)
+                return selector
+        return None
+            
+    @timed
+    def wait_for_text(self, text: str, within: Optional[str] = None, timeout: Optional[int] = None) -> bool:
+        """Wait until text is rendered on the page, or inside the elements matching ``within``"""
+        if timeout is None:
+            timeout = self.config.get('wait_time', 5) * 1000
+        try:
+            self.page.wait_for_function(TEXT_PROBE_SCRIPT, arg={'text': text, 'within': within}, timeout=timeout)
             return True
-        except:
+        except PlaywrightTimeoutError:
             return False
             
-    def verify_page_contains_text(self, text: str) -> bool:
-        """Verify if page contains specific text"""
-        return text in self.page.content()
+    def verify_page_contains_text(self, text: str, within: Optional[str] = None, timeout: Optional[int] = None) -> bool:
+        """Verify if page contains specific text, retrying until the text appears or the wait times out"""
+        return self.wait_for_text(text, within, timeout)
         
-    def take_screenshot(self, name: str) -> None:
-        """Take a screenshot"""
-        screenshots_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'screenshots')
-        os.makedirs(screenshots_dir, exist_ok=True)
-        self.page.screenshot(path=f"{screenshots_dir}/{name}.png")
+    def take_screenshot(self, name: str) -> str:
+        """Take a screenshot; it is written in the background and its path returned right away"""
+        return ArtifactWriter.instance(self.config).screenshot(self.page, name)
         
     def get_page_title(self) -> str:
         """Get page title"""
         return self.page.title()
         
+    @timed
     def wait_for_page_load(self) -> None:
-        """Wait for page to load completely"""
-        self.page.wait_for_load_state('networkidle')
+        """Wait until the page satisfies its declared readiness condition"""
+        timeout = self.config.get('timeout', 30000)
+        self.page.wait_for_load_state(self.READY_STATE, timeout=timeout)
+        self.wait_for_ready_selector(timeout)
+        
+    def wait_for_ready_selector(self, timeout: Optional[int] = None) -> None:
+        """Wait for the page's sentinel element, if it declares one"""
+        if self.READY_SELECTOR:
+            self.page.wait_for_selector(self.READY_SELECTOR, state='visible', timeout=timeout)
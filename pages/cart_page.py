@@ -3,11 +3,33 @@ Cart Page Object Model
 """
 from playwright.sync_api import Page
 from pages.base_page import BasePage
-from typing import List
+from utilities.helpers import ConfigManager
+from typing import List, NamedTuple, Optional
+
+class CartRecord(NamedTuple):
+    """One line of the cart"""
+    name: str
+    price: Optional[float]  # None if the item shows no price
+    quantity: int
+    data_test: str  # item id used by the remove button, e.g. "sauce-labs-backpack"
+
+# Reads every cart line in a single in-page evaluation instead of one round trip per element
+CART_SNAPSHOT_SCRIPT = """(items, selectors) => items.map(item => {
+    const text = selector => ((item.querySelector(selector) || {}).textContent || '').trim();
+    const button = item.querySelector(selectors.button);
+    // No price shown: null rather than NaN, which JSON cannot carry
+    const price = parseFloat(text(selectors.price).replace(/[^0-9.]/g, ''));
+    return {
+        name: text(selectors.name),
+        price: Number.isNaN(price) ? null : price,
+        quantity: parseInt(text(selectors.quantity), 10) || 0,
+        data_test: button ? button.getAttribute('data-test').replace(/^remove-/, '') : '',
+    };
+})"""
 
 class CartPage(BasePage):
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
+        super().__init__(page, config)
         
     # Locators
     CART_TITLE = '.title'
@@ -17,10 +39,25 @@ class CartPage(BasePage):
     CONTINUE_SHOPPING_BUTTON = '[data-test="continue-shopping"]'
     CHECKOUT_BUTTON = '[data-test="checkout"]'
     CART_QUANTITY = '.cart_quantity'
+    CART_ITEM_PRICES = '.inventory_item_price'
+    
+    # Readiness (the cart list may be empty, so the title is the sentinel)
+    READY_STATE = 'domcontentloaded'
+    READY_SELECTOR = CART_TITLE
+    
+    def snapshot(self) -> List[CartRecord]:
+        """Get all cart lines as records, in page order"""
+        rows = self.page.eval_on_selector_all(self.CART_ITEMS, CART_SNAPSHOT_SCRIPT, {
+            'name': self.CART_ITEM_NAMES,
+            'price': self.CART_ITEM_PRICES,
+            'quantity': self.CART_QUANTITY,
+            'button': self.REMOVE_BUTTONS,
+        })
+        return [CartRecord(**row) for row in rows]
     
     def verify_cart_page_loaded(self) -> bool:
         """Verify that cart page is loaded"""
-        return self.is_element_visible(self.CART_TITLE) and "Your Cart" in self.get_text(self.CART_TITLE)
+        return self.wait_for_visible(self.CART_TITLE) and "Your Cart" in self.get_text(self.CART_TITLE)
         
     def verify_your_cart_text_displayed(self) -> bool:
         """Verify 'Your Cart' text is displayed"""
@@ -28,12 +65,11 @@ class CartPage(BasePage):
         
     def get_cart_items_count(self) -> int:
         """Get the number of items in cart"""
-        return len(self.page.query_selector_all(self.CART_ITEMS))
+        return len(self.snapshot())
         
     def get_cart_item_names(self) -> List[str]:
         """Get list of all cart item names"""
-        item_elements = self.page.query_selector_all(self.CART_ITEM_NAMES)
-        return [element.text_content() for element in item_elements]
+        return [item.name for item in self.snapshot()]
         
     def remove_item_from_cart(self, item_name: str) -> None:
         """Remove a specific item from cart by name"""
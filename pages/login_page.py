@@ -3,10 +3,12 @@ Login Page Object Model
 """
 from playwright.sync_api import Page
 from pages.base_page import BasePage
+from utilities.helpers import ConfigManager
+from typing import Optional
 
 class LoginPage(BasePage):
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
+        super().__init__(page, config)
         
     # Locators
     USERNAME_INPUT = '[data-test="username"]'
@@ -15,10 +17,13 @@ class LoginPage(BasePage):
     ERROR_MESSAGE = '[data-test="error"]'
     LOGO = '.login_logo'
     
+    # Readiness
+    READY_STATE = 'domcontentloaded'
+    READY_SELECTOR = LOGIN_BUTTON
+    
     def navigate_to_login_page(self) -> None:
-        """Navigate to the login page"""
+        """Navigate to the login page and wait until the login form is ready"""
         self.navigate_to()
-        self.wait_for_page_load()
         
     def enter_username(self, username: str) -> None:
         """Enter username in the username field"""
@@ -62,4 +67,4 @@ class LoginPage(BasePage):
         
     def verify_login_page_loaded(self) -> bool:
         """Verify that login page is loaded"""
-        return self.is_element_visible(self.LOGO) and self.is_element_visible(self.LOGIN_BUTTON)
+        return self.wait_for_visible(self.LOGO) and self.is_element_present(self.LOGIN_BUTTON)
@@ -3,21 +3,67 @@ Products/Inventory Page Object Model
 """
 from playwright.sync_api import Page
 from pages.base_page import BasePage
-from typing import List
+from utilities.helpers import ConfigManager
+from typing import List, NamedTuple, Optional
+
+class ProductRecord(NamedTuple):
+    """One inventory item as shown on the products page"""
+    name: str
+    price: Optional[float]  # None if the item shows no price
+    description: str
+    data_test: str  # item id used by the add/remove buttons, e.g. "sauce-labs-backpack"
+    in_cart: bool
+
+# Reads every product in a single in-page evaluation instead of one round trip per element
+PRODUCTS_SNAPSHOT_SCRIPT = """(items, selectors) => items.map(item => {
+    const text = selector => ((item.querySelector(selector) || {}).textContent || '').trim();
+    const button = item.querySelector(selectors.button);
+    const dataTest = button ? button.getAttribute('data-test') : '';
+    // No price shown: null rather than NaN, which JSON cannot carry
+    const price = parseFloat(text(selectors.price).replace(/[^0-9.]/g, ''));
+    return {
+        name: text(selectors.name),
+        price: Number.isNaN(price) ? null : price,
+        description: text(selectors.description),
+        data_test: dataTest.replace(/^(add-to-cart|remove)-/, ''),
+        in_cart: dataTest.startsWith('remove'),
+    };
+})"""
+
+def is_sorted(values: List, reverse: bool = False) -> bool:
+    """Whether values are in order; a missing value (None) cannot be"""
+    return None not in values and values == sorted(values, reverse=reverse)
 
 class ProductsPage(BasePage):
-    def __init__(self, page: Page):
-        super().__init__(page)
+    def __init__(self, page: Page, config: Optional[ConfigManager] = None):
+        super().__init__(page, config)
         
     # Locators
     PRODUCTS_TITLE = '.title'
     PRODUCT_ITEMS = '.inventory_item'
     ADD_TO_CART_BUTTONS = '[data-test^="add-to-cart"]'
     CART_ICON = '[data-test="shopping-cart-link"]'
+    CART_ICON_CANDIDATES = [CART_ICON, '.shopping_cart_link']
     CART_BADGE = '.shopping_cart_badge'
     SORT_DROPDOWN = '[data-test="product_sort_container"]'
     PRODUCT_NAMES = '.inventory_item_name'
     PRODUCT_PRICES = '.inventory_item_price'
+    PRODUCT_DESCRIPTIONS = '.inventory_item_desc'
+    PRODUCT_BUTTONS = 'button[data-test]'
+    
+    # Readiness
+    READY_STATE = 'domcontentloaded'
+    READY_SELECTOR = PRODUCT_ITEMS
+    
+    def snapshot(self) -> List[ProductRecord]:
+        """Get all displayed products as records, in page order"""
+        rows = self.page.eval_on_selector_all(self.PRODUCT_ITEMS, PRODUCTS_SNAPSHOT_SCRIPT, {
+            'name': self.PRODUCT_NAMES,
+            'price': self.PRODUCT_PRICES,
+            'description': self.PRODUCT_DESCRIPTIONS,
+            'button': self.PRODUCT_BUTTONS,
+        })
+        return [ProductRecord(**row) for row in rows]
     
     def verify_products_page_loaded(self) -> bool:
         """Verify that products page is loaded"""
@@ -33,7 +79,7 @@ class ProductsPage(BasePage):
         
     def get_product_count(self) -> int:
         """Get the number of products displayed"""
-        return len(self.page.query_selector_all(self.PRODUCT_ITEMS))
+        return len(self.snapshot())
         
     def add_first_product_to_cart(self) -> None:
         """Add the first product to cart"""
@@ -48,30 +94,18 @@ class ProductsPage(BasePage):
         
     def click_cart_icon(self) -> None:
         """Click on cart icon"""
-        # Try different approaches to click the cart icon
-        try:
-            # First approach: use the data-test attribute
-            self.page.click('[data-test="shopping-cart-link"]')
-        except:
-            try:
-                # Second approach: use the class selector
-                self.page.click('.shopping_cart_link')
-            except:
-                # Third approach: navigate directly to cart URL
-                current_url = self.page.url
-                base_url = current_url.split('/inventory')[0]
-                self.page.goto(f"{base_url}/cart.html")
-        
-        # Wait for navigation to cart page or cart content
-        try:
-            self.page.wait_for_url("**/cart.html", timeout=5000)
-        except:
-            # Alternative: wait for cart title to appear
-            self.page.wait_for_selector('.title:has-text("Your Cart")', timeout=5000)
+        selector = self.locate('CART_ICON', self.CART_ICON_CANDIDATES)
+        if selector:
+            self.page.click(selector)
+        else:
+            # No known cart link on the page (or last time, per the selector cache): open the cart URL
+            base_url = self.page.url.split('/inventory')[0]
+            self.page.goto(f"{base_url}/cart.html")
+        self.page.wait_for_url("**/cart.html", timeout=self.config.get('wait_time', 5) * 1000)
         
     def get_cart_badge_count(self) -> str:
         """Get cart badge count"""
-        if self.is_element_visible(self.CART_BADGE):
+        if self.is_element_present(self.CART_BADGE):
             return self.get_text(self.CART_BADGE)
         return "0"
         
@@ -97,8 +131,11 @@ class ProductsPage(BasePage):
         
     def get_product_names(self) -> List[str]:
         """Get list of all product names"""
-        product_elements = self.page.query_selector_all(self.PRODUCT_NAMES)
-        return [element.text_content() for element in product_elements]
+        return [product.name for product in self.snapshot()]
+        
+    def get_product_prices(self) -> List[Optional[float]]:
+        """Get list of all product prices (None where a product shows no price)"""
+        return [product.price for product in self.snapshot()]
         
     def verify_products_sorted_a_to_z(self) -> bool:
         """Verify products are sorted from A to Z"""
@@ -109,3 +146,11 @@ class ProductsPage(BasePage):
         """Verify products are sorted from Z to A"""
         product_names = self.get_product_names()
         return product_names == sorted(product_names, reverse=True)
+        
+    def verify_products_sorted_price_low_to_high(self) -> bool:
+        """Verify products are sorted by price from low to high"""
+        return is_sorted(self.get_product_prices())
+        
+    def verify_products_sorted_price_high_to_low(self) -> bool:
+        """Verify products are sorted by price from high to low"""
+        return is_sorted(self.get_product_prices(), reverse=True)
@@ -1 +1,8 @@
 # Step definitions package
+
+# Modules conftest.py loads as plugins, so every test module sees their steps without importing (and re-binding) them
+STEP_MODULES = [
+    "step_definitions.test_authentication_steps",
+    "step_definitions.test_cart_steps",
+    "step_definitions.test_inventory_steps",
+]
@@ -0,0 +1,56 @@
+"""
+Async step definitions used by the asyncio scenario runner (utilities/async_runner.py)
+"""
+from utilities.async_runner import step
+
+@step('user is on Login Page')
+async def user_is_on_login_page(context):
+    """Navigate to login page"""
+    await context.login_page.navigate_to_login_page()
+    assert await context.login_page.verify_login_page_loaded(), "Login page did not load properly"
+
+@step('user enters user name as "{username}" and password as "{password}"')
+async def user_enters_credentials(context, username, password):
+    """Enter username and password"""
+    await context.login_page.enter_username(username)
+    await context.login_page.enter_password(password)
+
+@step('user clicks Login Button')
+async def user_clicks_login_button(context):
+    """Click login button"""
+    await context.login_page.click_login_button()
+
+@step('verify page has text "{text}"')
+async def verify_page_has_text(context, text):
+    """Verify page contains specific text"""
+    assert await context.login_page.verify_page_contains_text(text), f"Page does not contain text: {text}"
+
+@step('Login Button should be still displayed')
+async def login_button_still_displayed(context):
+    """Verify login button is still visible"""
+    assert await context.login_page.is_login_button_visible(), "Login button is not displayed"
+
+@step('user clicks Add to cart')
+async def user_clicks_add_to_cart(context):
+    """Click add to cart button for first product"""
+    await context.products_page.add_first_product_to_cart()
+
+@step('user clicks cart icon')
+async def user_clicks_cart_icon(context):
+    """Click cart icon"""
+    await context.products_page.click_cart_icon()
+
+@step('user clicks Sort Icon')
+async def user_clicks_sort_icon(context):
+    """Click sort dropdown"""
+    await context.products_page.click_element(context.products_page.SORT_DROPDOWN)
+
+@step('user clicks Sort the Products by Name (A–Z)')
+async def user_sorts_products_a_to_z(context):
+    """Sort products by name A to Z"""
+    await context.products_page.sort_products_by_name_a_to_z()
+
+@step('all the products must be sorted from A to Z')
+async def verify_products_sorted_a_to_z(context):
+    """Verify products are sorted A to Z"""
+    assert await context.products_page.verify_products_sorted_a_to_z(), "Products are not sorted from A to Z"
@@ -2,12 +2,7 @@
 Authentication step definitions for BDD tests
 """
 import pytest
-from pytest_bdd import scenarios, given, when, then, parsers
-from pages.login_page import LoginPage
-from pages.products_page import ProductsPage
-
-# Load scenarios from feature file
-scenarios('../features/authentication.feature')
+from pytest_bdd import given, when, then, parsers
 
 @given('user is on Login Page')
 def user_is_on_login_page(page, login_page):
@@ -15,21 +10,48 @@ def user_is_on_login_page(page, login_page):
     login_page.navigate_to_login_page()
     assert login_page.verify_login_page_loaded(), "Login page did not load properly"
 
+@pytest.fixture
+def login_attempt():
+    """Credentials entered by the current scenario, shared between login steps"""
+    return {}
+
+def can_restore_login(request):
+    """Scenarios that test the login itself always go through the UI"""
+    return request.node.get_closest_marker('auth') is None
+
 @when(parsers.parse('user enters user name as "{username}" and password as "{password}"'))
-def user_enters_credentials(page, login_page, username, password):
-    """Enter username and password"""
-    login_page.enter_username(username)
-    login_page.enter_password(password)
+def user_enters_credentials(request, page, login_page, auth_state_cache, login_attempt, username, password):
+    """Enter username and password, or defer to a cached login for known users"""
+    login_attempt['user_key'] = auth_state_cache.find_user(username, password)
+    login_attempt['restore'] = (
+        login_attempt['user_key'] is not None
+        and can_restore_login(request)
+        and auth_state_cache.get(login_attempt['user_key']) is not None
+    )
+    if not login_attempt['restore']:
+        login_page.enter_username(username)
+        login_page.enter_password(password)
 
 @when('user clicks Login Button')
-def user_clicks_login_button(page, login_page):
-    """Click login button"""
-    login_page.click_login_button()
+def user_clicks_login_button(page, login_page, auth_state_cache, login_attempt):
+    """Click login button, restoring the cached session when the user already logged in"""
+    user_key = login_attempt.get('user_key')
+    if login_attempt.get('restore'):
+        if auth_state_cache.restore(page, user_key):
+            return
+        # Cached session was rejected, fall back to a real login
+        login_page.navigate_to_login_page()
+        user = login_page.config['test_users'][user_key]
+        login_page.login_with_credentials(user['username'], user['password'])
+    else:
+        login_page.click_login_button()
+    if user_key is not None and auth_state_cache.INVENTORY_PATH in page.url:
+        auth_state_cache.store(user_key, page.context.storage_state())
 
 @then(parsers.parse('verify page has text "{text}"'))
-def verify_page_has_text(page, text):
+def verify_page_has_text(base_page, text):
     """Verify page contains specific text"""
-    assert text in page.content(), f"Page does not contain text: {text}"
+    assert base_page.verify_page_contains_text(text), f"Page does not contain text: {text}"
 
 @then('Login Button should be still displayed')
 def login_button_still_displayed(page, login_page):
@@ -0,0 +1,27 @@
+"""
+Runs in-page scripts of the page objects with Node against a stub DOM, without a browser
+"""
+import json
+import os
+import shutil
+import subprocess
+from functools import lru_cache
+
+import pytest
+
+
+@lru_cache(maxsize=None)
+def node():
+    """Node binary to run page scripts with: the one Playwright's driver ships, else node on PATH"""
+    import playwright  # only when a page script runs, so collection does not load Playwright
+    return next((path for path in (os.path.join(os.path.dirname(playwright.__file__), 'driver', 'node'),
+                                   shutil.which('node')) if path and os.path.exists(path)), None)
+
+
+def evaluate(script, prelude, arguments):
+    """Result of calling a page script with a JavaScript argument list, after running prelude (the stub DOM)"""
+    if node() is None:
+        pytest.skip("no Node binary to run page scripts with")
+    source = f"{prelude}\nconst script = {script};\nconsole.log(JSON.stringify(script(...{arguments})));"
+    completed = subprocess.run([node(), '-e', source], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
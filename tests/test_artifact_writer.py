@@ -0,0 +1,53 @@
+"""
+Unit tests for the background artifact writer
+"""
+import json
+import os
+
+from utilities.artifact_writer import ArtifactWriter
+
+
+class FakePage:
+    def __init__(self, image):
+        self.image = image
+        self.options = None
+
+    def screenshot(self, **options):
+        self.options = options
+        return self.image
+
+    def content(self):
+        return '<html><body>Products</body></html>'
+
+
+def test_duplicates_are_stored_once_and_indexed(tmp_path):
+    writer = ArtifactWriter(str(tmp_path), screenshot_format='jpeg', jpeg_quality=60, scale='css')
+    page = FakePage(b'jpeg-bytes')
+    first = writer.screenshot(page, 'test_a')
+    second = writer.screenshot(page, 'test_b')
+    dom = writer.dom_snapshot(page, 'test_a')
+    log = writer.console_log('test_a', ['[error] boom'])
+    writer.close()
+
+    assert page.options == {'type': 'jpeg', 'scale': 'css', 'full_page': False, 'quality': 60}
+    assert first == second and first.endswith('.jpg')
+    assert writer.duplicates == 1
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in (first, dom, log)) + ['index.jsonl']
+    with open(log) as file:
+        assert file.read() == '[error] boom'
+    with open(tmp_path / 'index.jsonl') as file:
+        entries = [json.loads(line) for line in file]
+    assert [(entry['label'], entry['kind']) for entry in entries] == [
+        ('test_a', 'screenshot'), ('test_b', 'screenshot'), ('test_a', 'dom'), ('test_a', 'console')]
+
+
+def test_instance_is_shared_and_closed(tmp_path, monkeypatch):
+    monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw1')
+    config = {'artifact_writer': {'directory': str(tmp_path)}}
+    writer = ArtifactWriter.instance(config)
+    assert ArtifactWriter.instance(config) is writer
+    assert writer.directory == os.path.join(str(tmp_path), 'gw1')
+    writer.write(b'data', 'bin', 'label')
+    ArtifactWriter.close_all()
+    assert len(os.listdir(tmp_path / 'gw1')) == 2
+    assert ArtifactWriter.instance(config) is not writer
@@ -0,0 +1,69 @@
+"""
+Unit tests for retain-on-failure video and trace capture
+"""
+import os
+
+from utilities.artifacts import ArtifactPolicy, enforce_size_cap
+
+
+class FakeTracing:
+    def __init__(self):
+        self.started = False
+
+    def start(self, **kwargs):
+        self.started = True
+
+    def stop(self, path=None):
+        if path:
+            with open(path, 'wb') as file:
+                file.write(b'trace')
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+
+def run_test(policy, name, failed):
+    capture = policy.new_capture(name)
+    context = FakeContext()
+    capture.start(context)
+    os.makedirs(capture.video_dir)
+    with open(os.path.join(capture.video_dir, 'page.webm'), 'wb') as file:
+        file.write(b'video')
+    capture.stop(context, failed)
+    temp_dir = capture.temp_dir
+    kept = capture.finish()
+    assert not os.path.exists(temp_dir)
+    return kept
+
+
+def test_only_failures_are_kept(tmp_path):
+    policy = ArtifactPolicy(video='retain-on-failure', trace='retain-on-failure', keep_dir=str(tmp_path / 'kept'))
+    assert run_test(policy, 'tests/test_cart.py::test_passes', failed=False) == []
+    kept = run_test(policy, 'tests/test_cart.py::test_fails', failed=True)
+    assert sorted(os.path.basename(path) for path in kept) == ['page.webm', 'trace.zip']
+    assert all('test_cart.py_test_fails' in path for path in kept)
+
+
+def test_passing_tests_are_sampled(tmp_path):
+    policy = ArtifactPolicy(video='retain-on-failure', keep_dir=str(tmp_path), pass_sample_rate=1.0)
+    assert policy.keep(failed=False) == {'video'}
+    assert ArtifactPolicy(video='on', trace='off').keep(failed=False) == {'video'}
+
+
+def test_video_on_failure_flag_is_honoured():
+    assert ArtifactPolicy.from_config({'video_on_failure': True}).video == 'retain-on-failure'
+    assert ArtifactPolicy.from_config({'video_on_failure': False}).video == 'off'
+    assert ArtifactPolicy.from_config({'video_on_failure': True, 'artifacts': {'video': 'on'}}).video == 'on'
+
+
+def test_size_cap_removes_oldest_files(tmp_path):
+    for index in range(3):
+        path = tmp_path / f'test_{index}' / 'page.webm'
+        path.parent.mkdir()
+        path.write_bytes(b'x' * 100)
+        os.utime(path, (index, index))
+    removed = enforce_size_cap(str(tmp_path), 250)
+    assert [os.path.basename(os.path.dirname(path)) for path in removed] == ['test_0']
+    assert sorted(os.listdir(tmp_path)) == ['test_1', 'test_2']
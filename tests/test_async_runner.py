@@ -0,0 +1,32 @@
+"""
+Unit tests for the asyncio scenario runner's step matching and scenario collection
+"""
+import os
+
+import pytest
+
+from utilities.async_runner import StepRegistry, collect_scenarios
+
+FEATURES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'features')
+
+
+def test_registry_matches_literal_and_parsed_steps():
+    registry = StepRegistry()
+
+    @registry.step('user clicks Login Button')
+    async def click_login(context):
+        pass
+
+    @registry.step('verify page has text "{text}"')
+    async def verify_text(context, text):
+        pass
+
+    assert registry.find('user clicks Login Button') == (click_login, {})
+    assert registry.find('verify page has text "Products"') == (verify_text, {'text': 'Products'})
+    with pytest.raises(LookupError):
+        registry.find('user does something undefined')
+
+
+def test_collect_scenarios_filters_by_tag():
+    names = [scenario.name for scenario in collect_scenarios([FEATURES_DIR], tags=['cart'])]
+    assert names == ['View cart contents']
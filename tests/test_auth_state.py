@@ -0,0 +1,47 @@
+"""
+Unit tests for the authenticated storage state cache
+"""
+import time
+
+from utilities.auth_state import AuthStateCache
+
+
+def make_config():
+    return {
+        'base_url': 'https://www.saucedemo.com',
+        'test_users': {
+            'valid_user': {'username': 'standard_user', 'password': 'secret_sauce'},
+        },
+    }
+
+
+def make_state(expires):
+    return {'cookies': [{'name': 'session-username', 'value': 'standard_user', 'expires': expires}], 'origins': []}
+
+
+def test_find_user_by_credentials():
+    cache = AuthStateCache(make_config())
+    assert cache.find_user('standard_user', 'secret_sauce') == 'valid_user'
+    assert cache.find_user('standard_use', 'secret_sauce') is None
+
+
+def test_state_is_reused_until_the_session_cookie_expires(monkeypatch):
+    cache = AuthStateCache(make_config())
+    cache.store('valid_user', make_state(time.time() + 600))
+    assert cache.get('valid_user') is not None
+    monkeypatch.setattr(time, 'time', lambda: 2 ** 40)
+    assert cache.get('valid_user') is None
+
+
+def test_expired_state_is_not_stored():
+    cache = AuthStateCache(make_config())
+    cache.store('valid_user', make_state(time.time() - 1))
+    assert cache.get('valid_user') is None
+
+
+def test_state_expires_when_the_config_changes():
+    config = make_config()
+    cache = AuthStateCache(config)
+    cache.store('valid_user', make_state(-1))
+    config['base_url'] = 'http://127.0.0.1:8000'
+    assert cache.get('valid_user') is None
@@ -4,10 +4,8 @@ Test runner for authentication module tests
 import pytest
 from pytest_bdd import scenarios
 
-# Import step definitions to register them
-from step_definitions.test_authentication_steps import *
-
 # Load scenarios from the feature file
+# Step definitions are registered for every module as plugins in conftest.py
 scenarios('../features/authentication.feature')
 
 class TestAuthentication:
@@ -0,0 +1,89 @@
+"""
+Unit tests for the Gherkin cache, the step index and duplicate binding detection
+"""
+from types import SimpleNamespace
+
+from pytest_bdd import parsers
+from pytest_bdd.parser import parse_feature
+from pytest_bdd.steps import StepFunctionContext
+
+from utilities.bdd_collection import FeatureCache, StepIndex, duplicate_bindings, index_key
+
+FEATURE = """Feature: Cart
+    Scenario: View cart contents
+        Given user is on Login Page
+        When user clicks cart icon
+"""
+
+
+def test_features_are_parsed_once_per_content(tmp_path):
+    (tmp_path / 'cart.feature').write_text(FEATURE)
+    cache = FeatureCache(str(tmp_path / 'cache'), parse_feature)
+    parsed = cache.parse_feature(str(tmp_path), 'cart.feature')
+    loaded = FeatureCache(str(tmp_path / 'cache'), parse_feature).parse_feature(str(tmp_path), 'cart.feature')
+    assert (cache.parsed, cache.loaded) == (1, 0)
+    assert loaded.filename == parsed.filename and list(loaded.scenarios) == ['View cart contents']
+    assert loaded.scenarios['View cart contents'].feature is loaded
+
+    (tmp_path / 'cart.feature').write_text(FEATURE.replace('cart icon', 'cart badge'))
+    changed = FeatureCache(str(tmp_path / 'cache'), parse_feature)
+    assert changed.parse_feature(str(tmp_path), 'cart.feature').scenarios['View cart contents'].steps[1].name \
+        == 'user clicks cart badge'
+    assert changed.parsed == 1
+
+
+def step_fixture(parser, type_=None):
+    context = StepFunctionContext(type=type_, step_func=lambda: None, parser=parser)
+    return SimpleNamespace(func=SimpleNamespace(_pytest_bdd_step_context=context))
+
+
+class FixtureManager:
+    """The parts of pytest's FixtureManager the step index uses"""
+
+    def __init__(self, fixturedefs, hidden=()):
+        self._arg2fixturedefs = fixturedefs
+        self.hidden = hidden
+
+    def getfixturedefs(self, name, nodeid):
+        return [fixturedef for fixturedef in self._arg2fixturedefs[name] if fixturedef not in self.hidden]
+
+
+def test_step_index_only_tries_definitions_that_can_match():
+    text = step_fixture(parsers.parse('verify page has text "{text}"'), 'then')
+    exact = step_fixture(parsers.string('user clicks cart icon'), 'when')
+    leading_placeholder = step_fixture(parsers.parse('{count:d} items are in the cart'))
+    pattern = step_fixture(parsers.re(r'user clicks (?P<button>.+)'), 'when')
+    other = step_fixture(parsers.parse('verify page has text "{text}"'), 'given')
+    assert index_key(text.func._pytest_bdd_step_context.parser) == ('word', 'verify')
+    assert index_key(leading_placeholder.func._pytest_bdd_step_context.parser) == ('any', None)
+
+    manager = FixtureManager({
+        'pytestbdd_stepdef_then_text': [text],
+        'pytestbdd_stepdef_when_icon': [exact],
+        'pytestbdd_stepdef_given_count': [leading_placeholder],
+        'pytestbdd_stepdef_when_re': [pattern],
+        'pytestbdd_stepdef_given_text': [other],
+        'page': [SimpleNamespace(func=lambda: None)],
+    }, hidden=[other])
+    index = StepIndex()
+    step = SimpleNamespace(type='when', name='user clicks cart icon')
+    assert list(index.find_fixturedefs_for_step(step, manager, 'tests/test_cart.py::test_a')) == [exact, pattern]
+    assert [entry[2] for entry in index.candidates('verify page has text "Products"')] == [text, leading_placeholder,
+                                                                                           pattern, other]
+    step = SimpleNamespace(type='then', name='verify page has text "Products"')
+    assert list(index.find_fixturedefs_for_step(step, manager, 'tests/test_cart.py::test_a')) == [text]
+    step = SimpleNamespace(type='given', name='3 items are in the cart')
+    assert list(index.find_fixturedefs_for_step(step, manager, 'tests/test_cart.py::test_a')) == [leading_placeholder]
+    assert index.lookups == 3
+
+
+def test_duplicate_bindings_are_reported():
+    feature = SimpleNamespace(filename='features/cart.feature')
+    scenario = SimpleNamespace(feature=feature, name='View cart contents')
+
+    def item(nodeid, row=None):
+        return SimpleNamespace(nodeid=nodeid, obj=SimpleNamespace(__scenario__=scenario),
+                               callspec=SimpleNamespace(id=row) if row else None)
+    items = [item('tests/test_cart.py::test_view_cart_contents'), item('tests/test_a.py::test_view_cart_contents'),
+             item('tests/test_cart.py::test_rows[a]', 'a'), item('tests/test_cart.py::test_rows[b]', 'b')]
+    assert [duplicate.nodeid for duplicate in duplicate_bindings(items)] == ['tests/test_a.py::test_view_cart_contents']
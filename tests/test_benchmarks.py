@@ -0,0 +1,57 @@
+"""
+Unit tests for the benchmark baseline comparison and the operations that need no browser
+"""
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from step_definitions import STEP_MODULES
+from utilities.async_runner import collect_scenarios
+from utilities.bdd_collection import StepIndex
+
+BASELINE = {
+    'BasePage.get_text': {'median_ms': 4.0, 'p95_ms': 5.0, 'round_trips': 2},
+    'bdd_steps.find': {'median_ms': 0.1, 'p95_ms': 0.2, 'round_trips': 0},
+}
+
+
+# benchmarks.run imports the page objects and Playwright, so it is imported in the tests
+
+
+def test_regressions_past_threshold_fail():
+    from benchmarks.run import compare
+    results = {
+        'BasePage.get_text': {'median_ms': 6.0, 'p95_ms': 7.0, 'round_trips': 3},
+        'bdd_steps.find': {'median_ms': 0.3, 'p95_ms': 0.4, 'round_trips': 0},  # 3x, but under the noise floor
+        'ProductsPage.get_product_names': {'median_ms': 9.0, 'p95_ms': 9.0, 'round_trips': 1},  # no baseline yet
+    }
+    regressions = compare(results, BASELINE, threshold=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('BasePage.get_text: median 6.000ms')
+    assert regressions[1] == 'BasePage.get_text: 3 round trips > 2'
+    assert compare({'BasePage.get_text': dict(BASELINE['BasePage.get_text'], median_ms=4.9)}, BASELINE, 0.25) == []
+
+
+def test_baselines_are_kept_per_browser(tmp_path):
+    from benchmarks.run import load_baseline, save_baseline
+    path = str(tmp_path / 'baseline.json')
+    assert load_baseline(path, 'chromium') == {}
+    save_baseline(path, 'chromium', BASELINE)
+    save_baseline(path, 'firefox', {})
+    assert load_baseline(path, 'chromium') == BASELINE
+
+
+def test_bdd_steps_are_found_through_the_step_index():
+    from benchmarks.run import OPERATIONS, StepFixtures
+    steps = [step for scenario in collect_scenarios([os.path.join(os.path.dirname(os.path.dirname(__file__)), 'features')]) for step in scenario.steps]
+    env = SimpleNamespace(steps=steps, step_fixtures=StepFixtures(STEP_MODULES))
+    index = StepIndex()
+    assert len(list(index.find_fixturedefs_for_step(steps[0], env.step_fixtures, 'tests/test_x.py::test'))) == 1
+    OPERATIONS['bdd_steps.find'](env)
+
+
+def test_round_trips_need_the_playwright_connection():
+    from benchmarks.run import driver_connection
+    with pytest.raises(RuntimeError, match="_send_message_to_server"):
+        driver_connection(SimpleNamespace(_impl_obj=SimpleNamespace()))
@@ -0,0 +1,78 @@
+"""
+Unit tests for the session browser pool
+"""
+import pytest
+
+from utilities.browser_pool import BrowserPool
+
+
+class FakeContext:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def new_context(self, **options):
+        return FakeContext()
+
+    def is_connected(self):
+        return not self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowserType:
+    def __init__(self):
+        self.launched = []
+
+    def launch(self, **options):
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeBrowserType()
+
+    def stop(self):
+        pass
+
+
+def make_pool(**kwargs):
+    pool = BrowserPool(**kwargs)
+    pool._playwright = FakePlaywright()
+    return pool
+
+
+def test_browser_is_launched_once_for_many_contexts():
+    pool = make_pool()
+    for _ in range(5):
+        context = pool.new_context('chromium')
+        pool.release(context)
+        assert context.closed
+    assert pool.launch_count == 1
+
+
+def test_browser_is_recycled_after_n_contexts():
+    pool = make_pool(recycle_after=2)
+    for _ in range(4):
+        pool.release(pool.new_context('chromium'))
+    launched = pool._playwright.chromium.launched
+    assert pool.launch_count == 2
+    assert all(browser.closed for browser in launched)
+
+
+def test_pool_is_exhausted_when_all_slots_are_busy():
+    pool = make_pool(size=1, max_contexts_per_browser=2)
+    pool.new_context('chromium')
+    pool.new_context('chromium')
+    with pytest.raises(RuntimeError):
+        pool.new_context('chromium')
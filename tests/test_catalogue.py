@@ -0,0 +1,77 @@
+"""
+Unit tests for the compiled test case catalogue
+"""
+import os
+import zipfile
+
+from utilities.catalogue import FALLBACK_CASES, CaseCatalogue, read_xlsx
+from utilities.duration_history import DurationHistory
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'TestData', 'TestCaseDocument.xlsx')
+MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+
+def write_workbook(path, rows):
+    """Minimal xlsx with inline-string cells; None leaves a cell out"""
+    cells = ''.join(
+        f'<row r="{number}">' + ''.join(
+            f'<c r="{chr(65 + column)}{number}" t="inlineStr"><is><t>{value}</t></is></c>'
+            for column, value in enumerate(values) if value is not None) + '</row>'
+        for number, values in enumerate(rows, 1))
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('xl/workbook.xml', f'<workbook xmlns="{MAIN}" xmlns:r="http://schemas.openxmlformats.org/'
+                                            f'officeDocument/2006/relationships"><sheets><sheet name="Cases" sheetId="1" '
+                                            f'r:id="rId1"/></sheets></workbook>')
+        archive.writestr('xl/_rels/workbook.xml.rels', f'<Relationships xmlns="{RELS}"><Relationship Id="rId1" '
+                                                       f'Target="worksheets/cases.xml"/></Relationships>')
+        archive.writestr('xl/worksheets/cases.xml', f'<worksheet xmlns="{MAIN}"><sheetData>{cells}</sheetData></worksheet>')
+
+
+def test_reads_the_repository_workbook():
+    rows = read_xlsx(WORKBOOK)
+    assert rows[0][:2] == [' Test Case Id', 'Module']
+    assert [row[0] for row in rows[1:]] == ['TC_AUTH_01', 'TC_AUTH_02', 'TC_INV_01', 'TC_INV_02', 'TC_CART_01', 'TC_AUTH_03']
+    assert sorted(row[0] for row in rows[1:]) == sorted(FALLBACK_CASES)
+
+
+def test_cache_is_compiled_once_per_workbook_version(tmp_path):
+    workbook = str(tmp_path / 'cases.xlsx')
+    cache = str(tmp_path / 'catalogue.sqlite')
+    header = ['Test Case Id', 'Module', 'Description', 'Priority', 'Expected Duration', 'Markers']
+    write_workbook(workbook, [header, ['TC_CART_01', 'Cart Module', 'View cart contents', 'P1', '4.5', 'smoke'],
+                              ['TC_INV_02', 'Inventory Module', None, None, None, None], [None, 'Cart Module']])
+    catalogue = CaseCatalogue(workbook, cache, module_markers={'Cart Module': 'cart'},
+                              extra_markers={'TC_CART_01': ['smoke', 'checkout']})
+    assert catalogue.rebuilt
+    case = catalogue.get('TC_CART_01')
+    assert (case['priority'], case['expected_duration']) == ('P1', 4.5)
+    assert catalogue.markers_for(case) == ['cart', 'smoke', 'checkout']
+    assert [case['id'] for case in catalogue.cases()] == ['TC_CART_01', 'TC_INV_02']
+    catalogue.close()
+
+    assert not CaseCatalogue(workbook, cache).rebuilt
+    write_workbook(workbook, [header, ['TC_CART_02', 'Cart Module', 'Remove item', 'P2', '', '']])
+    reopened = CaseCatalogue(workbook, cache)
+    assert reopened.rebuilt
+    assert reopened.get('TC_CART_01') is None and reopened.get('TC_CART_02')['priority'] == 'P2'
+
+
+def test_case_ids_without_a_workbook(tmp_path):
+    workbook = str(tmp_path / 'cases.xlsx')
+    config = {'test_catalogue': {'workbook': workbook, 'cache_path': str(tmp_path / 'catalogue.sqlite')}}
+    assert CaseCatalogue.from_config(config) is None
+    assert CaseCatalogue.fallback_cases(config) == (list(FALLBACK_CASES.items()), 'static')
+
+    write_workbook(workbook, [['Test Case Id', 'Description'], ['TC_CART_02', 'Remove item']])
+    CaseCatalogue.from_config(config).close()
+    config['test_catalogue']['enabled'] = False
+    assert CaseCatalogue.from_config(config) is None
+    assert CaseCatalogue.fallback_cases(config) == ([('TC_CART_02', 'Remove item')], 'cache')
+
+
+def test_expected_duration_is_the_default_without_history(tmp_path):
+    history = DurationHistory(str(tmp_path / 'history.sqlite'))
+    history.record_scenario('run', 'a', 2.0, 'passed')
+    assert history.expected_durations(['a', 'b', 'c'], defaults={'a': 9.0, 'b': 4.5}) == {'a': 2.0, 'b': 4.5, 'c': 2.0}
+    history.close()
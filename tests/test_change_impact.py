@@ -0,0 +1,172 @@
+"""
+Unit tests for change-impact test selection
+"""
+import subprocess
+from types import SimpleNamespace
+
+import conftest
+from utilities.change_impact import ChangeImpact, git_changes
+
+BASE_PAGE = '''"""
+Base page
+"""
+class BasePage:
+    def __init__(self, page):
+        self.page = page
+
+    def click_element(self, selector):
+        self.page.click(selector)
+
+    def has_text(self, text):
+        return text in self.page.content()
+'''
+
+PRODUCTS_PAGE = '''from pages.base_page import BasePage
+
+class ProductsPage(BasePage):
+    SORT_DROPDOWN = '.sort'
+    ADD_BUTTON = '.add'
+
+    def add_first_product_to_cart(self):
+        self.click_element(self.ADD_BUTTON)
+'''
+
+STEPS = '''from pytest_bdd import given, when, then, parsers
+
+@when('user adds a product')
+def user_adds_a_product(products_page):
+    products_page.add_first_product_to_cart()
+
+@when('user sorts the products')
+def user_sorts_the_products(products_page):
+    products_page.click_element(products_page.SORT_DROPDOWN)
+
+@then(parsers.parse('page has text "{text}"'))
+def page_has_text(base_page, text):
+    assert base_page.has_text(text)
+'''
+
+FEATURE = '''Feature: Products
+
+    @TC_CART_01
+    Scenario: Add a product
+        When user adds a product
+        Then page has text "1"
+
+    @TC_INV_02 @data:sorts
+    Scenario: Sort products
+        When user sorts the products
+        Then page has text "Products"
+'''
+
+
+def git(root, *args):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args], cwd=root,
+                   check=True, capture_output=True)
+
+
+def project(tmp_path):
+    files = {'pages/base_page.py': BASE_PAGE, 'pages/products_page.py': PRODUCTS_PAGE,
+             'step_definitions/product_steps.py': STEPS, 'features/products.feature': FEATURE,
+             'tests/test_pages.py': 'from pages.products_page import ProductsPage\n',
+             'tests/test_other.py': 'import json\n',
+             'tests/test_products.py': "from pytest_bdd import scenarios\n\nscenarios('../features/products.feature')\n",
+             'conftest.py': '', 'README.md': '', 'TestData/sorts.jsonl': ''}
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'base')
+    return tmp_path
+
+
+def impact(root):
+    config = {'change_impact': {'full_suite': ['conftest.py'], 'ignore': ['*.md']},
+              'data_sources': {'sources': {'sorts': {'path': 'TestData/sorts.jsonl'}}}}
+    return ChangeImpact.from_config(config, 'HEAD', root=str(root))
+
+
+def edit(root, path, old, new):
+    (root / path).write_text((root / path).read_text().replace(old, new))
+
+
+def test_changed_lines_come_from_git(tmp_path):
+    root = project(tmp_path)
+    edit(root, 'pages/products_page.py', "'.sort'", "'.sort-by'")
+    (root / 'new.txt').write_text('')
+    assert git_changes('HEAD', str(root)) == {'pages/products_page.py': {4}, 'new.txt': None}
+
+
+def test_page_object_changes_select_the_scenarios_that_use_them(tmp_path):
+    root = project(tmp_path)
+    edit(root, 'pages/products_page.py', "'.sort'", "'.sort-by'")
+    assert impact(root).scenarios == {('features/products.feature', 'Sort products')}
+
+    git(root, 'checkout', '-q', '--', '.')
+    edit(root, 'pages/base_page.py', 'self.page.click(selector)', 'self.page.locator(selector).click()')
+    result = impact(root)
+    assert result.scenarios == {('features/products.feature', 'Add a product'),
+                                ('features/products.feature', 'Sort products')}
+    assert result.affects_module('tests/test_pages.py')
+    assert result.affects_module(str(root / 'tests' / 'test_other.py')) is False
+
+    git(root, 'checkout', '-q', '--', '.')
+    edit(root, 'pages/products_page.py', 'self.ADD_BUTTON', "'.add-to-cart'")
+    result = impact(root)
+    assert result.scenarios == {('features/products.feature', 'Add a product')}
+    assert result.affects_module('tests/test_pages.py') and not result.affects_module('tests/test_other.py')
+
+
+def test_feature_step_and_data_changes(tmp_path):
+    root = project(tmp_path)
+    edit(root, 'features/products.feature', 'page has text "1"', 'page has text "2"')
+    edit(root, 'README.md', '', 'docs')
+    assert impact(root).scenarios == {('features/products.feature', 'Add a product')}
+
+    git(root, 'checkout', '-q', '--', '.')
+    edit(root, 'step_definitions/product_steps.py', 'assert base_page', 'assert not not base_page')
+    assert len(impact(root).scenarios) == 2
+
+    git(root, 'checkout', '-q', '--', '.')
+    edit(root, 'features/products.feature', 'Feature: Products', 'Feature: Product listing')
+    assert len(impact(root).scenarios) == 2
+
+    git(root, 'checkout', '-q', '--', '.')
+    (root / 'TestData' / 'sorts.jsonl').write_text('{"order": "az"}\n')
+    assert impact(root).scenarios == {('features/products.feature', 'Sort products')}
+
+
+def test_unmapped_changes_run_the_full_suite(tmp_path):
+    root = project(tmp_path)
+    (root / 'conftest.py').write_text('import pytest\n')
+    result = impact(root)
+    assert result.full_suite == 'conftest.py changed'
+    assert result.affects_scenario('features/products.feature', 'Add a product')
+
+    git(root, 'checkout', '-q', '--', '.')
+    (root / 'utilities.py').write_text('')
+    assert impact(root).full_suite == 'utilities.py is not covered by the change-impact map'
+
+
+def test_changed_bdd_test_module_keeps_its_scenarios(tmp_path, monkeypatch):
+    root = project(tmp_path)
+    edit(root, 'tests/test_products.py', "'../features/products.feature'", "'features/products.feature'")
+    result = impact(root)
+    assert result.full_suite is None and result.scenarios == set()
+
+    def item(module, name):
+        feature = SimpleNamespace(filename=str(root / 'features' / 'products.feature'))
+        return SimpleNamespace(path=root / 'tests' / module, iter_markers=lambda: [],
+                               obj=SimpleNamespace(__scenario__=SimpleNamespace(feature=feature, name=name)))
+
+    items = [item('test_products.py', 'Add a product'), item('test_elsewhere.py', 'Add a product')]
+    deselected = []
+    config = SimpleNamespace(getoption=lambda name: 'HEAD', stash={},
+                             hook=SimpleNamespace(pytest_deselected=lambda items: deselected.extend(items)))
+    monkeypatch.setattr(conftest, 'load_config', dict)
+    monkeypatch.setattr(conftest, 'ChangeImpact', SimpleNamespace(from_config=lambda config, ref: result))
+    selected = list(items)
+    conftest.apply_change_impact(config, selected)
+    assert [selected_item.path.name for selected_item in selected] == ['test_products.py']
+    assert [deselected_item.path.name for deselected_item in deselected] == ['test_elsewhere.py']
@@ -0,0 +1,68 @@
+"""
+Unit tests for the shared configuration service
+"""
+import os
+
+from utilities.helpers import ConfigManager
+
+
+def write_config(path, base_url, mtime_ns):
+    path.write_text(f"base_url: \"{base_url}\"\nheadless: false\ntest_users:\n  valid_user:\n    username: standard_user\n")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_dotted_lookups(tmp_path):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file, 'https://example.test', 10 ** 18)
+    config = ConfigManager(str(config_file))
+    assert config.get('test_users.valid_user.username') == 'standard_user'
+    assert config.get('test_users.missing.username', 'fallback') == 'fallback'
+    assert config['base_url'] == 'https://example.test'
+    assert 'timeout' not in config
+
+
+def test_file_is_parsed_once_until_mtime_changes(tmp_path, monkeypatch):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file, 'https://first.test', 10 ** 18)
+    config = ConfigManager(str(config_file))
+    loads = []
+    original_load = config._load_config
+    monkeypatch.setattr(config, '_load_config', lambda: loads.append(1) or original_load())
+
+    assert config.get('base_url') == 'https://first.test'
+    assert config.get('base_url') == 'https://first.test'
+    assert len(loads) == 1
+
+    write_config(config_file, 'https://second.test', 2 * 10 ** 18)
+    # Within CHECK_INTERVAL the file is not looked at again
+    assert config.get('base_url') == 'https://first.test'
+    config.reload()
+    assert config.get('base_url') == 'https://second.test'
+    assert len(loads) == 2
+
+
+def test_sections_are_copies(tmp_path):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file, 'https://example.test', 10 ** 18)
+    config = ConfigManager(str(config_file))
+    config.get('test_users')['valid_user']['username'] = 'changed'
+    assert config.get('test_users.valid_user.username') == 'standard_user'
+
+
+def test_environment_overlays_and_overrides(tmp_path, monkeypatch):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file, 'https://example.test', 10 ** 18)
+    config = ConfigManager(str(config_file))
+    monkeypatch.setenv('HEADLESS', 'true')
+    monkeypatch.setenv('BASE_URL', 'http://127.0.0.1:8000')
+    assert config.get('headless') is True
+    assert config.get('base_url') == 'http://127.0.0.1:8000'
+
+    config.override('test_users.valid_user.username', 'problem_user')
+    assert config.get('test_users.valid_user.username') == 'problem_user'
+
+
+def test_instance_is_shared_per_file(tmp_path):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file, 'https://example.test', 10 ** 18)
+    assert ConfigManager.instance(str(config_file)) is ConfigManager.instance(str(config_file))
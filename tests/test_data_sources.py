@@ -0,0 +1,59 @@
+"""
+Unit tests for the streaming data sources
+"""
+import json
+
+from utilities.data_sources import DataSource, RowRef
+
+
+def write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_formats_stream_rows_and_read_them_back_by_position(tmp_path):
+    jsonl = write(tmp_path / 'rows.jsonl', '{"id": "a", "user": "standard_user"}\n\n{"id": "b", "user": "problem_user"}\n')
+    csv = write(tmp_path / 'rows.csv', 'id,user,note\na,standard_user,"two\nlines"\nb,problem_user,x\n')
+    yaml = write(tmp_path / 'rows.yaml', '# chunk 1\n- {id: a, user: standard_user}\n'
+                                         '--- {id: b, user: problem_user}\n---\n- {id: c, user: visual_user}\n')
+    for path, ids in ((jsonl, ['a', 'b']), (csv, ['a', 'b']), (yaml, ['a', 'b', 'c'])):
+        source = DataSource.open(path)
+        assert [row['id'] for row in source] == ids
+        refs = list(source.refs())
+        assert [ref.id for ref in refs] == ids
+        assert [ref['user'] for ref in reversed(refs)] == [row['user'] for row in reversed(list(source))]
+    assert DataSource.open(csv).row_at(list(DataSource.open(csv).refs())[0].position)['note'] == 'two\nlines'
+
+
+def test_tags_and_shards_select_rows(tmp_path):
+    rows = [{'id': f"u{number}", 'tags': ['smoke'] if number % 2 else 'regression, slow'} for number in range(6)]
+    path = write(tmp_path / 'tagged.jsonl', ''.join(json.dumps(row) + '\n' for row in rows))
+    source = DataSource.open(path)
+    assert [ref.id for ref in source.refs(tags=['@smoke'])] == ['u1', 'u3', 'u5']
+    assert [ref.id for ref in source.refs(tags=['slow'], shard=(2, 2))] == ['u2']
+    shards = [[ref.id for ref in source.refs(shard=(index, 3))] for index in (1, 2, 3)]
+    assert sorted(sum(shards, [])) == [row['id'] for row in rows]
+    assert [batch.id for batch in source.batches(4)] == ['u0..u3', 'u4..u5']
+    assert [row['id'] for row in list(source.batches(4))[1]] == ['u4', 'u5']
+
+
+def test_index_is_cached_until_the_file_changes(tmp_path):
+    path = write(tmp_path / 'cached.jsonl', '{"id": "a"}\n')
+    index_dir = tmp_path / 'index'
+    assert [ref.id for ref in DataSource.FORMATS['.jsonl'](path, str(index_dir)).refs()] == ['a']
+    assert len(list(index_dir.iterdir())) == 1
+    other_worker = DataSource.FORMATS['.jsonl'](path, str(index_dir))
+    other_worker.records = None  # a cache hit must not scan the file
+    assert [ref.id for ref in other_worker.refs()] == ['a']
+    write(tmp_path / 'cached.jsonl', '{"id": "a"}\n{"id": "bb"}\n')
+    assert [ref.id for ref in DataSource.FORMATS['.jsonl'](path, str(index_dir)).refs()] == ['a', 'bb']
+
+
+def test_row_ref_renders_a_scenario_outline_step(tmp_path):
+    from pytest_bdd.parser import Step
+
+    path = write(tmp_path / 'logins.jsonl', '{"username": "locked_out_user", "password": "secret_sauce"}\n')
+    ref = next(DataSource.open(path).refs())
+    assert isinstance(ref, RowRef) and ref.id == 'logins-0'
+    step = Step('user enters user name as "<username>" and password as "<password>"', 'when', 8, 8, 'When')
+    assert step.render(ref) == 'user enters user name as "locked_out_user" and password as "secret_sauce"'
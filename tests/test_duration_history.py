@@ -0,0 +1,57 @@
+"""
+Unit tests for the duration history and timing-balanced sharding
+"""
+import argparse
+
+import pytest
+
+from utilities.duration_history import DurationHistory, parse_shard, split_into_shards, strip_xdist_group
+
+
+def test_parse_shard():
+    assert parse_shard('2/4') == (2, 4)
+    for value in ('0/4', '5/4', 'two/4', '1'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(value)
+
+
+def test_shards_have_balanced_total_duration():
+    durations = {'slow': 10.0, 'medium_a': 6.0, 'medium_b': 5.0, 'fast_a': 3.0, 'fast_b': 2.0}
+    shards = split_into_shards(durations, 2)
+    totals = sorted(sum(durations[nodeid] for nodeid in shard) for shard in shards)
+    assert totals == [13.0, 13.0]
+    assert sorted(nodeid for shard in shards for nodeid in shard) == sorted(durations)
+
+
+def test_strip_xdist_group():
+    assert strip_xdist_group('tests/test_cart.py::test_view@features/cart.feature:standard_user') == 'tests/test_cart.py::test_view'
+    assert strip_xdist_group('tests/test_data.py::test_row[a@b]') == 'tests/test_data.py::test_row[a@b]'
+
+
+def test_expected_durations_use_recent_median_and_fallback(tmp_path):
+    history = DurationHistory(str(tmp_path / 'history.sqlite'), window=3)
+    for duration in (1.0, 2.0, 9.0):
+        history.record_scenario(history.new_run_id(), 'tests/test_a.py::test_a', duration, 'passed', 'chromium',
+                                [{'step': 'user clicks Login Button', 'duration': duration / 2, 'outcome': 'passed'}])
+    history.commit()
+    durations = history.expected_durations(['tests/test_a.py::test_a', 'tests/test_b.py::test_new'])
+    assert durations == {'tests/test_a.py::test_a': 2.0, 'tests/test_b.py::test_new': 2.0}
+    assert history.step_summary()[0][:2] == ('user clicks Login Button', 3)
+    history.close()
+
+
+def test_import_junit(tmp_path):
+    junit = tmp_path / 'junit.xml'
+    junit.write_text(
+        '<testsuites><testsuite>'
+        '<testcase classname="tests.test_cart" name="test_view_cart_contents" time="4.5"/>'
+        '<testcase classname="tests.test_cart.TestCart" name="test_other" time="1.0"><failure/></testcase>'
+        '</testsuite></testsuites>'
+    )
+    history = DurationHistory(str(tmp_path / 'history.sqlite'))
+    assert history.import_junit(str(junit)) == 2
+    durations = history.expected_durations(['tests/test_cart.py::test_view_cart_contents',
+                                            'tests/test_cart.py::TestCart::test_other'])
+    assert durations == {'tests/test_cart.py::test_view_cart_contents': 4.5,
+                         'tests/test_cart.py::TestCart::test_other': 1.0}
+    history.close()
@@ -0,0 +1,40 @@
+"""
+Unit tests for feature-affinity scheduling groups and per-worker artifact directories
+"""
+import os
+from types import SimpleNamespace
+
+from pytest_bdd.parser import parse_feature
+
+from conftest import affinity_group
+from utilities.helpers import WorkerManager
+
+FEATURES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'features')
+
+
+def scenario_items(filename):
+    feature = parse_feature(FEATURES_DIR, filename)
+    return [SimpleNamespace(obj=SimpleNamespace(__scenario__=scenario)) for scenario in feature.scenarios.values()]
+
+
+def test_scenarios_of_a_feature_share_one_group():
+    groups = {filename: {affinity_group(item) for item in scenario_items(filename)}
+              for filename in ('authentication.feature', 'inventory.feature')}
+    assert len(scenario_items('inventory.feature')) == 2
+    assert len(groups['inventory.feature']) == 1
+    assert groups['inventory.feature'].pop().endswith('inventory.feature:standard_user')
+    # No Background login: grouped by the feature file alone
+    (group,) = groups['authentication.feature']
+    assert group.endswith('authentication.feature')
+    assert affinity_group(SimpleNamespace(obj=lambda: None)) is None
+
+
+def test_artifact_dir_is_private_to_the_worker(tmp_path, monkeypatch):
+    monkeypatch.setenv('PYTEST_XDIST_WORKER', 'gw3')
+    assert WorkerManager.get_worker_id() == 'gw3'
+    assert WorkerManager.get_artifact_dir(str(tmp_path)) == os.path.join(str(tmp_path), 'gw3')
+    assert os.path.isdir(tmp_path / 'gw3')
+
+    monkeypatch.delenv('PYTEST_XDIST_WORKER')
+    assert WorkerManager.get_worker_id() == 'master'
+    assert WorkerManager.get_artifact_dir(str(tmp_path)) == str(tmp_path)
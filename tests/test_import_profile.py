@@ -0,0 +1,37 @@
+"""
+Unit tests for the import-time profile and the lazy Playwright imports
+"""
+import subprocess
+import sys
+
+import pytest
+
+from utilities.import_profile import PROJECT_ROOT, by_package, parse_importtime, profile
+
+OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       4200 |   pytest_bdd.parser
+import time:      2700 |       2700 |     pytest_bdd.types
+import time:       800 |       5000 | pytest_bdd
+============================= test session starts ==============================
+"""
+
+
+def test_importtime_output_is_parsed():
+    imports = parse_importtime(OUTPUT)
+    assert imports[1] == ('pytest_bdd.parser', 0.0015, 0.0042, 1)
+    assert [module for module, _, _, depth in imports if depth == 0] == ['pytest_bdd']
+    assert by_package(imports) == [('pytest_bdd', pytest.approx(0.005)), ('_io', pytest.approx(0.00012))]
+
+
+def test_conftest_does_not_import_playwright():
+    modules = {module for module, _, _, _ in profile(['-c', 'import conftest'])}
+    assert 'conftest' in modules and 'utilities.helpers' in modules
+    assert not any(module.split('.')[0] in ('playwright', 'pages') for module in modules)
+
+
+def test_collection_does_not_import_playwright():
+    completed = subprocess.run([sys.executable, '-m', 'utilities.import_profile', '--top', '0',
+                                '--forbid', 'playwright', 'pages', 'benchmarks'],
+                               cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stdout + completed.stderr
@@ -0,0 +1,52 @@
+"""
+Unit tests for step latency instrumentation
+"""
+import pytest
+
+from utilities.instrumentation import Instrumentation, TimedProxy, percentile, summarize, timed
+
+
+@pytest.fixture
+def instrumentation():
+    Instrumentation.enable()
+    Instrumentation.drain()
+    yield Instrumentation
+    Instrumentation.enabled = False
+    Instrumentation.drain()
+
+
+class FakePage:
+    def goto(self, url):
+        return url
+
+
+class FakePageObject:
+    def __init__(self, page):
+        self.page = page
+
+    @timed
+    def navigate_to(self, url):
+        return self.page.goto(url)
+
+
+def test_spans_are_attributed_to_the_running_step(instrumentation):
+    instrumentation.start_step('user is on Login Page')
+    assert FakePageObject(TimedProxy(FakePage(), 'page')).navigate_to('https://shop.test') == 'https://shop.test'
+    spans = instrumentation.drain()
+    assert [(span['kind'], span['name'], span['step']) for span in spans] == [
+        ('playwright', 'page.goto', 'user is on Login Page'),
+        ('page', 'FakePageObject.navigate_to', 'user is on Login Page'),
+    ]
+    assert instrumentation.drain() == []
+
+
+def test_disabled_instrumentation_records_nothing():
+    FakePageObject(FakePage()).navigate_to('https://shop.test')
+    assert Instrumentation.drain() == []
+
+
+def test_percentile_summary():
+    assert percentile(list(range(1, 101)), 0.95) == 95
+    spans = [{'kind': 'step', 'name': 'slow', 'duration': d} for d in (1.0, 2.0, 10.0)]
+    spans += [{'kind': 'step', 'name': 'fast', 'duration': 0.1}, {'kind': 'page', 'name': 'x', 'duration': 99}]
+    assert summarize(spans) == [('slow', 3, 2.0, 10.0, 10.0), ('fast', 1, 0.1, 0.1, 0.1)]
@@ -0,0 +1,39 @@
+"""
+Unit tests for the load runner's profile and report
+"""
+from utilities.load_runner import LoadProfile, LoadReport
+
+
+def record(scenario, started, duration, passed=True, steps=()):
+    return {'feature': 'cart.feature', 'scenario': scenario, 'passed': passed,
+            'error': None if passed else 'AssertionError: Page does not contain text: Your Cart',
+            'failed_step': None if passed else 'verify page has text "Your Cart"',
+            'started': started, 'duration': duration, 'steps': list(steps), 'user': 0, 'process': 0}
+
+
+def test_profile_spreads_users_over_processes_and_ramp_up():
+    profile = LoadProfile(users=5, processes=2, ramp_up=10, duration=60, rate=2)
+    assert profile.users_for_process(0) == [0, 2, 4]
+    assert profile.users_for_process(1) == [1, 3]
+    assert [profile.start_offset(user) for user in range(5)] == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert profile.pacing == 2.5
+    assert LoadProfile(users=2, processes=8).processes == 2
+    assert LoadProfile.from_config({'load_runner': {'users': 3, 'rate': None}}, users=7).users == 7
+
+
+def test_report_throughput_error_rate_and_step_percentiles():
+    records = [
+        record('View cart contents', 100.0, 2.0, steps=[('user clicks cart icon', 0.5)]),
+        record('View cart contents', 101.0, 3.0, steps=[('user clicks cart icon', 1.5)]),
+        record('View cart contents', 102.0, 1.0, passed=False),
+        record('View cart contents', 103.0, 1.0, steps=[('user clicks cart icon', 0.7)]),
+    ]
+    report = LoadReport(LoadProfile(users=2), records)
+    assert report.elapsed == 4.0
+    assert report.throughput == 1.0
+    assert report.error_rate == 0.25
+    assert report.top_errors()[0][1] == 1
+    lines = report.lines()
+    assert lines[0] == "4 scenarios in 4.0s: 1.00/s, 1 failed (25.0% error rate)"
+    step_line = next(line for line in lines if line.startswith('user clicks cart icon'))
+    assert step_line.split()[4:] == ['3', '0.700s', '1.500s', '1.500s']
@@ -0,0 +1,49 @@
+"""
+Unit tests for the local stand-in storefront server
+"""
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from utilities.local_storefront import Fault, LocalStorefront
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.status, response.read().decode()
+
+
+def test_serves_pages_with_page_object_markup():
+    with LocalStorefront() as storefront:
+        status, login = fetch(storefront.url + '/')
+        assert status == 200
+        assert 'data-test="login-button"' in login and 'class="login_logo"' in login
+        assert 'data-test="product_sort_container"' in fetch(storefront.url + '/inventory.html')[1]
+        assert 'data-test="continue-shopping"' in fetch(storefront.url + '/cart.html')[1]
+        assert "'session-username'" in fetch(storefront.url + '/static/app.js?v=1')[1]
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(storefront.url + '/server.py')
+        assert error.value.code == 404
+
+
+def test_injected_latency_and_errors():
+    with LocalStorefront(faults=[Fault('/cart.html', status=503)]) as storefront:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(storefront.url + '/cart.html')
+        assert error.value.code == 503
+
+        with storefront.inject('/inventory.html', latency_ms=200):
+            started = time.perf_counter()
+            fetch(storefront.url + '/inventory.html')
+            assert time.perf_counter() - started >= 0.2
+        assert len(storefront.faults) == 1
+        assert storefront.request_count == 2
+
+
+def test_enabled_by_one_setting():
+    assert LocalStorefront.is_enabled({'storefront': 'local'})
+    assert not LocalStorefront.is_enabled({'storefront': 'remote'})
+    storefront = LocalStorefront.from_config({'local_storefront': {'latency_ms': 50, 'faults': [{'path': '*.js', 'status': 500}]}})
+    assert [(fault.path, fault.latency_ms, fault.status) for fault in storefront.faults] == [('*', 50, None), ('*.js', 0, 500)]
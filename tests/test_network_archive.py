@@ -0,0 +1,112 @@
+"""
+Unit tests for HAR record-and-replay
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utilities.network_archive import HarArchive, NetworkRecorder, NetworkReplayer, ReplayMissError
+
+
+class FakeRequest:
+    def __init__(self, url, method='GET', post_data=None):
+        self.url = url
+        self.method = method
+        self.post_data_buffer = post_data
+        self.headers = {'content-type': 'application/json'} if post_data else {}
+
+    def headers_array(self):
+        return [{'name': name, 'value': value} for name, value in self.headers.items()]
+
+
+class FakeResponse:
+    def __init__(self, body, status=200):
+        self._body = body
+        self.status = status
+        self.status_text = 'OK'
+
+    def body(self):
+        return self._body
+
+    def headers_array(self):
+        return [{'name': 'Content-Type', 'value': 'text/html'}, {'name': 'Content-Encoding', 'value': 'gzip'}]
+
+
+class FakeRoute:
+    def __init__(self, request, network_body=None):
+        self.request = request
+        self.network_body = network_body
+        self.fulfilled = None
+        self.aborted = None
+
+    def fetch(self, max_redirects=None):
+        return FakeResponse(self.network_body)
+
+    def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    def abort(self, error_code=None):
+        self.aborted = error_code
+
+
+def record(archive, scenario, pages):
+    recorder = NetworkRecorder(archive, scenario)
+    for url, body in pages:
+        recorder.handle(FakeRoute(FakeRequest(url), body))
+    recorder.save()
+
+
+def test_record_then_replay(tmp_path):
+    archive = HarArchive(str(tmp_path), 'cart')
+    record(archive, 'cart::view', [('https://shop.test/', b'<login>'), ('https://shop.test/app.js', b'js')])
+
+    replayer = NetworkReplayer(HarArchive(str(tmp_path), 'cart'), 'cart::view')
+    route = FakeRoute(FakeRequest('https://shop.test/app.js'))
+    replayer.handle(route)
+    assert route.fulfilled['body'] == b'js'
+    assert route.fulfilled['status'] == 200
+    assert route.fulfilled['headers'] == {'content-type': 'text/html'}
+    replayer.check()
+
+
+def test_bodies_are_deduplicated_across_scenarios(tmp_path):
+    archive = HarArchive(str(tmp_path), 'inventory')
+    record(archive, 'inventory::listing', [('https://shop.test/', b'<login>'), ('https://shop.test/app.js', b'js')])
+    record(archive, 'inventory::sort', [('https://shop.test/', b'<login>'), ('https://shop.test/app.js', b'js')])
+    record(HarArchive(str(tmp_path), 'cart'), 'cart::view', [('https://shop.test/app.js', b'js')])
+
+    assert len(archive.load_entries()) == 4
+    assert len(os.listdir(archive.blob_dir)) == 2
+
+    # Re-recording a scenario replaces its entries instead of appending
+    record(archive, 'inventory::sort', [('https://shop.test/', b'<login v2>')])
+    assert len(archive.load_entries()) == 3
+
+
+def test_replay_prefers_own_scenario_and_reports_misses(tmp_path):
+    archive = HarArchive(str(tmp_path), 'auth')
+    record(archive, 'auth::valid', [('https://shop.test/', b'valid')])
+    record(archive, 'auth::invalid', [('https://shop.test/', b'invalid')])
+
+    replayer = NetworkReplayer(archive, 'auth::invalid')
+    route = FakeRoute(FakeRequest('https://shop.test/'))
+    replayer.handle(route)
+    assert route.fulfilled['body'] == b'invalid'
+
+    missed = FakeRoute(FakeRequest('https://shop.test/api', method='POST', post_data=b'{}'))
+    replayer.handle(missed)
+    assert missed.aborted == 'internetdisconnected'
+    with pytest.raises(ReplayMissError, match="POST https://shop.test/api"):
+        replayer.check()
+
+
+def test_concurrent_recordings_keep_every_scenario(tmp_path):
+    def save(index):
+        # One archive object per recorder, as on separate xdist workers
+        record(HarArchive(str(tmp_path), 'inventory'), f"inventory::{index}", [('https://shop.test/', b'page')])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(save, range(16)))
+    scenarios = {entry['_scenario'] for entry in HarArchive(str(tmp_path), 'inventory').load_entries()}
+    assert scenarios == {f"inventory::{index}" for index in range(16)}
@@ -0,0 +1,52 @@
+"""
+Unit tests for declared page readiness conditions
+"""
+from contextlib import contextmanager
+
+
+class RecordingPage:
+    def __init__(self):
+        self.calls = []
+
+    def goto(self, url, wait_until=None, timeout=None):
+        self.calls.append(('goto', url, wait_until))
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        self.calls.append(('wait_for_selector', selector, state))
+
+    def wait_for_load_state(self, state, timeout=None):
+        self.calls.append(('wait_for_load_state', state))
+
+    @contextmanager
+    def expect_response(self, url, timeout=None):
+        self.calls.append(('expect_response', url))
+        yield
+
+
+CONFIG = {'base_url': 'https://shop.test', 'timeout': 1000}
+
+
+def test_login_page_waits_for_dom_and_login_button():
+    from pages.login_page import LoginPage
+    page = RecordingPage()
+    LoginPage(page, CONFIG).navigate_to_login_page()
+    assert page.calls == [
+        ('goto', 'https://shop.test', 'domcontentloaded'),
+        ('wait_for_selector', LoginPage.LOGIN_BUTTON, 'visible'),
+    ]
+    assert not any('networkidle' in call for call in page.calls)
+
+
+def test_declared_response_is_awaited_during_navigation():
+    from pages.base_page import BasePage
+
+    class ApiBackedPage(BasePage):
+        READY_RESPONSE = '**/api/items'
+
+    page = RecordingPage()
+    ApiBackedPage(page, CONFIG).navigate_to('https://shop.test/items')
+    assert page.calls == [('expect_response', '**/api/items'), ('goto', 'https://shop.test/items', 'load')]
+
+    page.calls.clear()
+    ApiBackedPage(page, CONFIG).wait_for_page_load()
+    assert page.calls == [('wait_for_load_state', 'load')]
@@ -0,0 +1,71 @@
+"""
+Unit tests for the presence primitives and the time they report to WaitStats
+"""
+import pytest
+
+
+class PresencePage:
+    """Elements are 'visible', 'hidden' or absent; a wait for a state they never reach times out"""
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.waits = []
+
+    def locator(self, selector):
+        page = self
+
+        class Locator:
+            first = property(lambda self: self)
+
+            def is_visible(self):
+                return page.elements.get(selector) == 'visible'
+        return Locator()
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        self.waits.append((selector, state, timeout))
+        if (self.elements.get(selector) == 'visible') != (state == 'visible'):
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded.")
+
+
+@pytest.fixture
+def base_page():
+    from pages.base_page import BasePage, WaitStats
+    WaitStats.reset()
+    yield BasePage(PresencePage({'.title': 'visible', '.spinner': 'hidden'}), {'wait_time': 3})
+    WaitStats.reset()
+
+
+def test_is_element_present_does_not_wait(base_page):
+    assert base_page.is_element_present('.title') is True
+    assert base_page.is_element_present('.spinner') is False
+    assert base_page.is_element_present('.missing') is False
+    assert base_page.page.waits == []
+
+
+def test_waits_for_appear_and_disappear(base_page):
+    assert base_page.wait_for_visible('.title') is True
+    assert base_page.wait_for_visible('.missing', timeout=200) is False
+    assert base_page.wait_for_hidden('.spinner') is True
+    assert base_page.wait_for_hidden('.missing') is True
+    assert base_page.wait_for_hidden('.title', timeout=100) is False
+    assert base_page.is_element_visible('.title') is True
+    assert base_page.page.waits[:2] == [('.title', 'visible', 3000), ('.missing', 'visible', 200)]
+    assert base_page.page.waits[-2] == ('.title', 'hidden', 100)
+
+
+def test_wait_stats_count_every_call_including_timeouts(base_page):
+    from pages.base_page import WaitStats
+    base_page.is_element_present('.title')
+    base_page.wait_for_visible('.title')
+    base_page.wait_for_visible('.missing', timeout=1)
+    base_page.wait_for_hidden('.title', timeout=1)
+    snapshot = WaitStats.snapshot()
+    assert {primitive: calls for primitive, (calls, _) in snapshot.items()} == \
+        {'is_element_present': 1, 'wait_for_visible': 2, 'wait_for_hidden': 1}
+    assert all(seconds >= 0 for _, seconds in snapshot.values())
+
+    snapshot['wait_for_visible'][0] = 99
+    assert WaitStats.totals['wait_for_visible'][0] == 2
+    WaitStats.reset()
+    assert WaitStats.snapshot() == {}
@@ -0,0 +1,78 @@
+"""
+Unit tests for the network resource policy
+"""
+from types import SimpleNamespace
+
+from utilities.resource_policy import ResourcePolicy, ResourceSizes
+
+CONFIG = {
+    'resource_policy': {
+        'enabled': True,
+        'block_resource_types': ['image', 'font'],
+        'block_urls': ['*google-analytics.com*'],
+        'stub_urls': ['*/metrics*'],
+        'overrides': {
+            'visual': {'enabled': False},
+            'cart.feature': {'block_resource_types': ['font']},
+        },
+    }
+}
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    def abort(self, error_code):
+        self.outcome = ('abort', error_code)
+
+    def fulfill(self, **kwargs):
+        self.outcome = ('fulfill', kwargs['status'])
+
+    def fallback(self):
+        self.outcome = ('fallback',)
+
+
+def test_overrides_by_marker_and_feature():
+    assert ResourcePolicy.from_config(CONFIG, markers=['smoke', 'visual']) is None
+    assert ResourcePolicy.from_config(CONFIG, feature='cart.feature').block_resource_types == {'font'}
+    assert ResourcePolicy.from_config(CONFIG).block_resource_types == {'image', 'font'}
+    assert ResourcePolicy.from_config({}).is_active is False
+
+
+def test_handle_blocks_stubs_and_falls_back():
+    sizes = ResourceSizes()
+    sizes.sizes['https://example.test/logo.png'] = 2048
+    policy = ResourcePolicy.from_config(CONFIG, sizes=sizes)
+    routes = [
+        FakeRoute('https://example.test/logo.png', 'image'),
+        FakeRoute('https://www.google-analytics.com/collect', 'script'),
+        FakeRoute('https://example.test/metrics?x=1', 'fetch'),
+        FakeRoute('https://example.test/inventory.html', 'document'),
+    ]
+    for route in routes:
+        policy.handle(route)
+
+    assert [route.outcome[0] for route in routes] == ['abort', 'abort', 'fulfill', 'fallback']
+    assert policy.stats.as_dict() == {'blocked': 2, 'stubbed': 1, 'bytes_avoided': 2048, 'unsized': 2}
+
+
+def test_sizes_are_merged_on_save(tmp_path):
+    path = str(tmp_path / 'sizes.json')
+    first, second = ResourceSizes(path), ResourceSizes(path)
+    first.observe(SimpleNamespace(url='a', headers={'content-length': '10'}))
+    second.observe(SimpleNamespace(url='b', headers={'content-length': '20'}))
+    first.save()
+    second.save()
+    assert ResourceSizes(path).sizes == {'a': 10, 'b': 20}
+
+
+def test_sizes_are_capped_and_saved_atomically(tmp_path):
+    path = str(tmp_path / 'sizes.json')
+    sizes = ResourceSizes(path, limit=2)
+    for url in ['a', 'b', 'c', 'a']:
+        sizes.observe(SimpleNamespace(url=url, headers={'content-length': '1'}))
+    sizes.save()
+    assert list(ResourceSizes(path).sizes) == ['c', 'a']
+    assert [file.name for file in tmp_path.iterdir()] == ['sizes.json']
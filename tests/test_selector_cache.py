@@ -0,0 +1,118 @@
+"""
+Unit tests for the persistent selector cache and BasePage.locate, which races candidates through it
+"""
+import pytest
+
+from utilities.selector_cache import SelectorCache
+
+CANDIDATES = ['[data-test="shopping-cart-link"]', '.shopping_cart_link']
+
+
+class RacePage:
+    """Stub page whose visible selectors can change; waits for anything else time out"""
+
+    def __init__(self, visible):
+        self.visible = set(visible)
+        self.waits = []
+
+    def locator(self, selector):
+        return RaceLocator(self, [selector])
+
+    def wait_for_selector(self, selector, state=None, timeout=None):
+        RaceLocator(self, [selector]).wait_for(state, timeout)
+
+
+class RaceLocator:
+    def __init__(self, page, selectors):
+        self.page = page
+        self.selectors = selectors
+
+    first = property(lambda self: self)
+
+    def or_(self, other):
+        return RaceLocator(self.page, self.selectors + other.selectors)
+
+    def is_visible(self):
+        return any(selector in self.page.visible for selector in self.selectors)
+
+    def wait_for(self, state=None, timeout=None):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        self.page.waits.append((tuple(self.selectors), timeout))
+        if not self.is_visible():
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded.")
+
+
+@pytest.fixture
+def products_page(tmp_path):
+    from pages.products_page import ProductsPage
+    config = {'wait_time': 3, 'selector_cache': {'path': str(tmp_path / 'selector_cache.json'),
+                                                 'app_version': 'v1', 'probe_timeout': 100}}
+    return ProductsPage(RacePage(['.shopping_cart_link']), config)
+
+
+def test_winner_is_persisted_and_merged_across_instances(tmp_path):
+    path = str(tmp_path / 'selector_cache.json')
+    key = SelectorCache.make_key('ProductsPage', 'CART_ICON', 'saucedemo')
+
+    first = SelectorCache(path)
+    assert first.get(key) is None
+    first.set(key, '.shopping_cart_link')
+
+    second = SelectorCache(path)
+    assert second.get(key) == '.shopping_cart_link'
+    other_key = SelectorCache.make_key('CartPage', 'CHECKOUT', 'saucedemo')
+    second.set(other_key, '[data-test="checkout"]')
+
+    first.set(key, '[data-test="shopping-cart-link"]')
+    reloaded = SelectorCache(path)
+    assert reloaded.get(key) == '[data-test="shopping-cart-link"]'
+    assert reloaded.get(other_key) == '[data-test="checkout"]'
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / 'selector_cache.json'
+    path.write_text('{not json')
+    assert SelectorCache(str(path)).get('anything') is None
+
+
+def test_locate_writes_the_race_winner_back_and_probes_it_next_time(products_page, tmp_path):
+    key = SelectorCache.make_key('ProductsPage', 'CART_ICON', 'v1')
+    assert products_page.locate('CART_ICON', CANDIDATES) == '.shopping_cart_link'
+    assert products_page.page.waits == [(tuple(CANDIDATES), 3000)]
+    assert SelectorCache(str(tmp_path / 'selector_cache.json')).get(key) == '.shopping_cart_link'
+
+    products_page.page.waits = []
+    assert products_page.locate('CART_ICON', CANDIDATES) == '.shopping_cart_link'
+    assert products_page.page.waits == [(('.shopping_cart_link',), 100)]
+
+
+def test_locate_repairs_a_stale_entry_and_remembers_no_match(products_page, tmp_path):
+    key = SelectorCache.make_key('ProductsPage', 'CART_ICON', 'v1')
+    products_page.locate('CART_ICON', CANDIDATES)
+    products_page.page.visible = {CANDIDATES[0]}
+    products_page.page.waits = []
+    assert products_page.locate('CART_ICON', CANDIDATES) == CANDIDATES[0]
+    assert products_page.page.waits == [(('.shopping_cart_link',), 100), (tuple(CANDIDATES), 3000)]
+    assert SelectorCache(str(tmp_path / 'selector_cache.json')).get(key) == CANDIDATES[0]
+
+    # Markup without any candidate: one full wait, then the fallback is taken without waiting
+    products_page.page.visible = set()
+    assert products_page.locate('CART_ICON', CANDIDATES) is None
+    assert SelectorCache(str(tmp_path / 'selector_cache.json')).get(key) == SelectorCache.NO_MATCH
+    products_page.page.waits = []
+    assert products_page.locate('CART_ICON', CANDIDATES) is None
+    assert products_page.page.waits == []
+
+    # A candidate that shows up again replaces the negative entry
+    products_page.page.visible = {'.shopping_cart_link'}
+    assert products_page.locate('CART_ICON', CANDIDATES) == '.shopping_cart_link'
+    assert SelectorCache(str(tmp_path / 'selector_cache.json')).get(key) == '.shopping_cart_link'
+
+
+def test_remove_forgets_an_entry(tmp_path):
+    path = str(tmp_path / 'selector_cache.json')
+    cache = SelectorCache(path)
+    cache.set('a', '.a')
+    cache.set('b', '.b')
+    cache.remove('a')
+    assert SelectorCache(path).get('a') is None and SelectorCache(path).get('b') == '.b'
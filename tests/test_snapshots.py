@@ -0,0 +1,72 @@
+"""
+Unit tests for the one-round-trip product and cart snapshots and the sort checks built on them
+"""
+import json
+
+from tests.page_scripts import evaluate
+
+# Stub DOM elements: item(fields, button) answers querySelector with the text of fields[selector]
+ITEMS = """
+const item = (fields, button) => ({
+    querySelector: selector => selector === 'button' ? (button ? { getAttribute: () => button } : null)
+        : (selector in fields ? { textContent: fields[selector] } : null),
+});
+"""
+SELECTORS = {'name': '.name', 'price': '.price', 'description': '.desc', 'quantity': '.qty', 'button': 'button'}
+
+
+class ScriptPage:
+    """Evaluates eval_on_selector_all's script against stub items"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def eval_on_selector_all(self, selector, script, arg):
+        return evaluate(script, ITEMS, f"[[{', '.join(self.items)}], {json.dumps(arg)}]")
+
+
+def products_page(items):
+    from pages.products_page import ProductsPage
+    page = ProductsPage(ScriptPage(items), {})
+    for locator, key in (('PRODUCT_NAMES', 'name'), ('PRODUCT_PRICES', 'price'), ('PRODUCT_DESCRIPTIONS', 'description'),
+                         ('PRODUCT_BUTTONS', 'button')):
+        setattr(page, locator, SELECTORS[key])
+    return page
+
+
+def product(name, price, button='add-to-cart-item'):
+    fields = {'.name': f' {name} '} if price is None else {'.name': f' {name} ', '.price': price}
+    return f"item({json.dumps(fields)}, {json.dumps(button)})"
+
+
+def test_product_snapshot_parses_every_field():
+    from pages.products_page import ProductRecord
+    page = products_page([product('Backpack', '$29.99', 'remove-sauce-labs-backpack'), product('Free sticker', '$0.00')])
+    assert page.snapshot() == [ProductRecord('Backpack', 29.99, '', 'sauce-labs-backpack', True),
+                               ProductRecord('Free sticker', 0.0, '', 'item', False)]
+
+
+def test_price_sort_checks():
+    assert products_page([product('A', '$7.99'), product('B', '$9.99'), product('C', '$29.99')]) \
+        .verify_products_sorted_price_low_to_high()
+    assert products_page([product('A', '$29.99'), product('B', '$9.99')]).verify_products_sorted_price_high_to_low()
+    assert not products_page([product('A', '$29.99'), product('B', '$9.99')]).verify_products_sorted_price_low_to_high()
+    assert products_page([product('B', '$1'), product('A', '$2')]).verify_products_sorted_z_to_a()
+
+
+def test_missing_price_fails_the_sort_check_instead_of_raising():
+    page = products_page([product('A', '$7.99'), product('B', None), product('C', 'sold out')])
+    assert page.get_product_prices() == [7.99, None, None]
+    assert page.verify_products_sorted_price_low_to_high() is False
+    assert page.verify_products_sorted_price_high_to_low() is False
+
+
+def test_cart_snapshot_parses_quantity_and_missing_price():
+    from pages.cart_page import CartPage, CartRecord
+    page = CartPage(ScriptPage([
+        "item({'.name': 'Backpack', '.price': '$29.99', '.qty': '2'}, 'remove-sauce-labs-backpack')",
+        "item({'.name': 'Bike Light'}, null)",
+    ]), {})
+    page.CART_ITEM_NAMES, page.CART_ITEM_PRICES, page.CART_QUANTITY, page.REMOVE_BUTTONS = '.name', '.price', '.qty', 'button'
+    assert page.snapshot() == [CartRecord('Backpack', 29.99, 2, 'sauce-labs-backpack'), CartRecord('Bike Light', None, 0, '')]
+    assert page.get_cart_item_names() == ['Backpack', 'Bike Light'] and page.get_cart_items_count() == 2
@@ -0,0 +1,60 @@
+"""
+Unit tests for the queue-based JSON-lines logging backend
+"""
+import json
+import logging
+
+from utilities.helpers import LogManager
+from utilities.structured_logging import LogContext, QueueLogging, worker_id
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+def test_records_carry_context_and_extras(tmp_path):
+    backend = QueueLogging(str(tmp_path / 'framework.jsonl'), console_level=None)
+    # Outside the framework tree, which propagates to the session's log
+    logger = logging.getLogger('test_structured_logging')
+    logger.setLevel(logging.DEBUG)
+    backend.attach(logger)
+    backend.attach(logging.getLogger('test_structured_logging.child'))
+    try:
+        LogContext.scenario('View cart contents', 'tests/test_cart.py::test_view_cart_contents')
+        LogContext.step('user clicks cart icon')
+        logger.debug("clicked %s", 'cart', extra={'duration': 0.25})
+        logging.getLogger('test_structured_logging.child').info("child")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("failed")
+    finally:
+        LogContext.clear()
+        backend.close()
+    logger.info("after close")
+
+    records = read_lines(backend.worker_path)
+    assert [record['message'] for record in records] == ['clicked cart', 'child', 'failed']
+    first = records[0]
+    assert (first['scenario'], first['step'], first['worker'], first['duration']) == \
+        ('View cart contents', 'user clicks cart icon', worker_id(), 0.25)
+    assert first['nodeid'] == 'tests/test_cart.py::test_view_cart_contents' and first['step_elapsed'] >= 0
+    assert records[2]['exception'].endswith('ValueError: boom')
+
+
+def test_worker_files_are_merged_in_time_order(tmp_path):
+    path = str(tmp_path / 'framework.jsonl')
+    for worker, times in (('gw0', ['00:01', '00:04']), ('gw1', ['00:02', '00:03'])):
+        with open(QueueLogging.worker_file(path, worker), 'w') as file:
+            file.writelines(json.dumps({'time': time, 'worker': worker}) + '\n' for time in times)
+    assert QueueLogging.merge(path) == 4
+    assert [record['worker'] for record in read_lines(path)] == ['gw0', 'gw1', 'gw1', 'gw0']
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ['framework.jsonl']
+
+
+def test_levels_are_set_per_module():
+    config = {'logging': {'levels': {'pages': 'DEBUG', 'pages.cart_page': 'WARNING'}}}
+    assert LogManager.level_for('pages.cart_page.CartPage', config) == 'WARNING'
+    assert LogManager.level_for('pages.login_page', config) == 'DEBUG'
+    assert LogManager.level_for('utilities', config, 'INFO') == 'INFO'
@@ -0,0 +1,55 @@
+"""
+Unit tests for the in-browser text probe behind wait_for_text and verify_page_contains_text
+"""
+import json
+
+from tests.page_scripts import evaluate
+
+# body renders 'Products' and a submit input labelled 'Login'; '.title' matches one element, '.missing' none
+DOCUMENT = """
+const element = (text, values = []) => ({ innerText: text, querySelectorAll: () => values.map(value => ({ value })) });
+const elements = { '.title': [element('Swag Labs')], '.missing': [] };
+globalThis.document = {
+    body: element('Products Add to cart', ['Login']),
+    querySelectorAll: selector => elements[selector] || [],
+};
+"""
+
+
+def probe(text, within=None):
+    from pages.base_page import TEXT_PROBE_SCRIPT
+    return evaluate(TEXT_PROBE_SCRIPT, DOCUMENT, json.dumps([{'text': text, 'within': within}]))
+
+
+def test_probe_matches_rendered_text_and_button_values():
+    assert probe('Add to cart') is True
+    assert probe('Login') is True
+    assert probe('Checkout') is False
+
+
+def test_probe_is_scoped_to_within():
+    assert probe('Swag Labs', within='.title') is True
+    assert probe('Products', within='.title') is False
+    assert probe('Products', within='.missing') is False
+
+
+class ProbePage:
+    """Runs wait_for_function's script once against the stub document; a false result is a timeout"""
+
+    def __init__(self):
+        self.calls = []
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        self.calls.append((arg, timeout))
+        if not evaluate(script, DOCUMENT, json.dumps([arg])):
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded.")
+
+
+def test_wait_for_text_is_false_when_the_text_never_appears():
+    from pages.base_page import BasePage
+    page = ProbePage()
+    base_page = BasePage(page, {'wait_time': 2})
+    assert base_page.verify_page_contains_text('Login') is True
+    assert base_page.wait_for_text('Checkout', within='.title', timeout=500) is False
+    assert page.calls == [({'text': 'Login', 'within': None}, 2000), ({'text': 'Checkout', 'within': '.title'}, 500)]
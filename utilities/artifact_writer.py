@@ -0,0 +1,134 @@
+"""
+Background writer for failure screenshots, DOM snapshots and console logs
+
+Capturing happens on the test thread (Playwright objects are not thread-safe), but
+hashing aside, all disk I/O runs on a small thread pool. Files are named after the
+sha256 of their content, so identical artifacts are stored once. Each xdist worker
+writes into its own subdirectory (``gw0``, ...), where ``index.jsonl`` maps each
+test/label to the file that holds it.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+from utilities.helpers import WorkerManager
+
+
+class ArtifactWriter:
+    """Writes artifacts off the test thread and flushes them once at session end"""
+
+    _instances = {}
+
+    def __init__(self, directory, workers=2, screenshot_format='png', jpeg_quality=80, scale='device', full_page=False):
+        self.directory = directory
+        self.workers = workers
+        self.screenshot_format = screenshot_format
+        self.jpeg_quality = jpeg_quality
+        self.scale = scale
+        self.full_page = full_page
+        self.duplicates = 0
+        self._executor = None
+        self._futures = []
+        self._written = set()
+        self._index = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls, config):
+        """Get the process-wide writer for the directory configured in config.yaml"""
+        writer_config = config.get('artifact_writer') or {}
+        directory = writer_config.get('directory', 'reports/failures')
+        if not os.path.isabs(directory):
+            directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), directory)
+        directory = WorkerManager.get_artifact_dir(directory)
+        if directory not in cls._instances:
+            cls._instances[directory] = cls(
+                directory,
+                workers=writer_config.get('workers', 2),
+                screenshot_format=writer_config.get('screenshot_format', 'png'),
+                jpeg_quality=writer_config.get('jpeg_quality', 80),
+                scale=writer_config.get('scale', 'device'),
+                full_page=writer_config.get('full_page', False)
+            )
+        return cls._instances[directory]
+
+    @classmethod
+    def close_all(cls):
+        """Flush and stop every writer created in this process"""
+        for writer in cls._instances.values():
+            writer.close()
+        cls._instances = {}
+
+    def screenshot_options(self):
+        """Options for page.screenshot: JPEG encoding and CSS-pixel downscaling if configured"""
+        options = {'type': self.screenshot_format, 'scale': self.scale, 'full_page': self.full_page}
+        if self.screenshot_format == 'jpeg':
+            options['quality'] = self.jpeg_quality
+        return options
+
+    def screenshot(self, page, label):
+        """Capture a screenshot and queue it for writing"""
+        return self.write_screenshot(page.screenshot(**self.screenshot_options()), label)
+
+    def write_screenshot(self, data, label):
+        """Queue screenshot bytes (e.g. captured through the async API) for writing"""
+        return self.write(data, 'jpg' if self.screenshot_format == 'jpeg' else 'png', label, 'screenshot')
+
+    def dom_snapshot(self, page, label):
+        """Queue the page's current HTML for writing"""
+        return self.write(page.content().encode('utf-8'), 'html', label, 'dom')
+
+    def console_log(self, label, lines):
+        """Queue console messages for writing"""
+        return self.write('\n'.join(lines).encode('utf-8'), 'log', label, 'console')
+
+    def write(self, data, extension, label, kind='artifact'):
+        """Queue bytes for writing under their content hash and return the final path"""
+        path = os.path.join(self.directory, f"{hashlib.sha256(data).hexdigest()[:20]}.{extension}")
+        with self._lock:
+            self._index.append({'label': label, 'kind': kind, 'path': path,
+                                'worker': WorkerManager.get_worker_id(), 'at': datetime.now().isoformat()})
+            if path in self._written:
+                self.duplicates += 1
+                return path
+            self._written.add(path)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='artifact-writer')
+            self._futures.append(self._executor.submit(self._write_file, path, data))
+        return path
+
+    def flush(self):
+        """Wait for queued writes and append their entries to index.jsonl"""
+        with self._lock:
+            futures, self._futures = self._futures, []
+            index, self._index = self._index, []
+        wait(futures)
+        for future in futures:
+            future.result()  # surface write errors
+        if index:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, 'index.jsonl'), 'a') as file:
+                file.write(''.join(json.dumps(entry) + '\n' for entry in index))
+
+    def close(self):
+        """Flush and shut the thread pool down"""
+        try:
+            self.flush()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _write_file(self, path, data):
+        """Write a file atomically unless an identical one (same hash) is already there"""
+        if os.path.exists(path):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,152 @@
+"""
+Retain-on-failure capture of Playwright videos and traces
+
+Each test records into its own temporary directory. Once the outcome is known the
+artifacts are either moved into the artifact directory or deleted, and the artifact
+directory is trimmed (oldest files first) to stay under its size cap.
+"""
+import os
+import random
+import re
+import shutil
+import tempfile
+
+CAPTURE_MODES = ('off', 'on', 'retain-on-failure')
+
+
+def enforce_size_cap(directory, max_bytes):
+    """Delete the oldest files under a directory until it holds at most max_bytes"""
+    files = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    removed = []
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed.append(path)
+    for root, _, _ in os.walk(directory, topdown=False):
+        if root != directory:
+            try:
+                os.rmdir(root)  # only succeeds for directories that are now empty
+            except OSError:
+                pass
+    return removed
+
+
+class ArtifactPolicy:
+    """When to record videos and traces, and which ones to keep"""
+
+    def __init__(self, video='retain-on-failure', trace='off', keep_dir='reports/artifacts',
+                 temp_dir=None, pass_sample_rate=0.0, max_dir_mb=500, seed=None):
+        for kind, mode in (('video', video), ('trace', trace)):
+            if mode not in CAPTURE_MODES:
+                raise ValueError(f"artifacts.{kind} must be one of {', '.join(CAPTURE_MODES)}, got '{mode}'")
+        self.video = video
+        self.trace = trace
+        self.keep_dir = keep_dir
+        self.temp_dir = temp_dir
+        self.pass_sample_rate = pass_sample_rate
+        self.max_dir_mb = max_dir_mb
+        self.random = random.Random(seed)
+
+    @classmethod
+    def from_config(cls, config, keep_dir=None):
+        """Build the policy from the artifacts section of config.yaml
+
+        Without an explicit ``artifacts.video``, the older ``video_on_failure``
+        flag selects retain-on-failure (true) or off (false).
+        """
+        artifacts_config = config.get('artifacts') or {}
+        default_video = 'retain-on-failure' if config.get('video_on_failure', False) else 'off'
+        return cls(
+            video=artifacts_config.get('video', default_video),
+            trace=artifacts_config.get('trace', 'off'),
+            keep_dir=keep_dir or artifacts_config.get('keep_dir', 'reports/artifacts'),
+            temp_dir=artifacts_config.get('temp_dir'),
+            pass_sample_rate=artifacts_config.get('pass_sample_rate', 0.0),
+            max_dir_mb=artifacts_config.get('max_dir_mb', 500),
+            seed=artifacts_config.get('seed')
+        )
+
+    def keep(self, failed):
+        """Artifact kinds to keep for a test; passing tests are kept at pass_sample_rate"""
+        sampled = not failed and self.pass_sample_rate > 0 and self.random.random() < self.pass_sample_rate
+        return {kind for kind, mode in (('video', self.video), ('trace', self.trace))
+                if mode == 'on' or (mode == 'retain-on-failure' and (failed or sampled))}
+
+    def new_capture(self, test_name):
+        """Start capturing artifacts for one test"""
+        return ArtifactCapture(self, test_name)
+
+
+class ArtifactCapture:
+    """Video and trace of one test, held in a temporary directory until the outcome is known"""
+
+    def __init__(self, policy, test_name):
+        self.policy = policy
+        self.name = re.sub(r'[^\w.-]+', '_', test_name).strip('_')
+        self.temp_dir = None
+        self.tracing = False
+        self.kept_kinds = set()
+        if policy.video != 'off' or policy.trace != 'off':
+            self.temp_dir = tempfile.mkdtemp(prefix='pw-artifacts-', dir=policy.temp_dir)
+
+    @property
+    def video_dir(self):
+        """Directory to pass as record_video_dir, or None when videos are off"""
+        return os.path.join(self.temp_dir, 'video') if self.policy.video != 'off' else None
+
+    def start(self, context):
+        """Start tracing the context if traces are enabled"""
+        if self.policy.trace != 'off':
+            context.tracing.start(screenshots=True, snapshots=True)
+            self.tracing = True
+
+    def stop(self, context, failed):
+        """Decide what to keep and stop tracing; call before the context is closed"""
+        self.kept_kinds = self.policy.keep(failed)
+        if self.tracing:
+            # Without a path Playwright discards the trace instead of writing it
+            context.tracing.stop(path=os.path.join(self.temp_dir, 'trace.zip') if 'trace' in self.kept_kinds else None)
+            self.tracing = False
+
+    def finish(self):
+        """Move kept artifacts into the artifact directory and delete the rest; call after the context is closed
+
+        Returns the paths of the kept files.
+        """
+        if self.temp_dir is None:
+            return []
+        kept = []
+        try:
+            sources = []
+            if 'video' in self.kept_kinds and os.path.isdir(os.path.join(self.temp_dir, 'video')):
+                sources.extend(os.path.join(self.temp_dir, 'video', name)
+                               for name in sorted(os.listdir(os.path.join(self.temp_dir, 'video'))))
+            if 'trace' in self.kept_kinds and os.path.exists(os.path.join(self.temp_dir, 'trace.zip')):
+                sources.append(os.path.join(self.temp_dir, 'trace.zip'))
+            if sources:
+                target_dir = os.path.join(self.policy.keep_dir, self.name)
+                os.makedirs(target_dir, exist_ok=True)
+                for source in sources:
+                    target = os.path.join(target_dir, os.path.basename(source))
+                    shutil.move(source, target)
+                    kept.append(target)
+                if self.policy.max_dir_mb:
+                    enforce_size_cap(self.policy.keep_dir, self.policy.max_dir_mb * 1024 * 1024)
+        finally:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+        return [path for path in kept if os.path.exists(path)]
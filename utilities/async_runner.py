@@ -0,0 +1,204 @@
+"""
+Asyncio scenario runner that executes many feature scenarios concurrently in one event loop
+
+Usage:
+    python -m utilities.async_runner features/ --concurrency 12 --tags smoke
+"""
+import argparse
+import asyncio
+import glob
+import os
+import sys
+import time
+
+import parse
+from pytest_bdd.feature import get_feature
+
+from utilities.helpers import ConfigManager
+from utilities.local_storefront import LocalStorefront
+
+
+class StepRegistry:
+    """Maps step text to async step functions
+
+    Patterns without ``{}`` placeholders are matched with a dictionary lookup,
+    everything else is matched with a compiled ``parse`` pattern.
+    """
+
+    def __init__(self):
+        self._literal_steps = {}
+        self._parsed_steps = []
+
+    def step(self, pattern):
+        """Register an async step function for a step text pattern"""
+        def decorator(func):
+            if '{' in pattern:
+                self._parsed_steps.append((parse.compile(pattern), func))
+            else:
+                self._literal_steps[pattern] = func
+            return func
+        return decorator
+
+    def find(self, text):
+        """Return the step function and its parsed arguments for a step text"""
+        func = self._literal_steps.get(text)
+        if func is not None:
+            return func, {}
+        for parser, func in self._parsed_steps:
+            result = parser.parse(text)
+            if result is not None:
+                return func, dict(result.named)
+        raise LookupError(f"No async step definition matches: {text}")
+
+
+STEP_REGISTRY = StepRegistry()
+step = STEP_REGISTRY.step
+
+
+class ScenarioContext:
+    """Per-scenario state handed to every async step"""
+
+    def __init__(self, page, config):
+        # The async page objects (and Playwright) are only imported once a scenario actually runs
+        from pages.async_pages.cart_page import AsyncCartPage
+        from pages.async_pages.login_page import AsyncLoginPage
+        from pages.async_pages.products_page import AsyncProductsPage
+        self.page = page
+        self.config = config
+        self.login_page = AsyncLoginPage(page, config)
+        self.products_page = AsyncProductsPage(page, config)
+        self.cart_page = AsyncCartPage(page, config)
+        self.data = {}
+
+
+class ScenarioResult:
+    """Outcome and timings of one scenario run"""
+
+    def __init__(self, feature, name):
+        self.feature = feature
+        self.name = name
+        self.passed = False
+        self.error = None
+        self.failed_step = None
+        self.duration = 0.0
+        self.step_durations = []
+
+    def __repr__(self):
+        status = 'passed' if self.passed else f'failed at "{self.failed_step}": {self.error}'
+        return f"<ScenarioResult {self.feature}::{self.name} {status} in {self.duration:.2f}s>"
+
+
+def collect_scenarios(feature_paths, tags=None):
+    """Parse feature files and return rendered scenarios, optionally filtered by tags"""
+    filenames = []
+    for path in feature_paths:
+        if os.path.isdir(path):
+            filenames.extend(sorted(glob.glob(os.path.join(path, '**', '*.feature'), recursive=True)))
+        else:
+            filenames.append(path)
+    wanted_tags = set(tags or [])
+    scenarios = []
+    for filename in filenames:
+        feature = get_feature(os.path.dirname(os.path.abspath(filename)), os.path.basename(filename))
+        for template in feature.scenarios.values():
+            if wanted_tags and not wanted_tags & (template.tags | feature.tags):
+                continue
+            contexts = list(template.examples.as_contexts()) if template.templated else [{}]
+            scenarios.extend(template.render(context) for context in contexts)
+    return scenarios
+
+
+class AsyncScenarioRunner:
+    """Runs scenarios concurrently, each in its own browser context, with a concurrency limit"""
+
+    def __init__(self, config=None, concurrency=None, browser_name=None, headless=None, registry=None):
+        self.config = config if config is not None else ConfigManager.instance()
+        runner_config = self.config.get('async_runner') or {}
+        self.concurrency = concurrency or runner_config.get('concurrency', 8)
+        self.browser_name = browser_name or self.config.get('browser', 'chromium')
+        self.headless = self.config.get('headless', False) if headless is None else headless
+        if registry is None:
+            import step_definitions.async_steps  # noqa: F401 - registers the async steps
+            registry = STEP_REGISTRY
+        self.registry = registry
+
+    def run(self, scenarios):
+        """Run scenarios to completion and return their results"""
+        return asyncio.run(self.run_async(scenarios))
+
+    async def launch(self, playwright):
+        """Launch the runner's browser"""
+        slow_mo = self.config.get('slow_mo', 500) if self.config.get('demo_mode', False) else 0
+        return await getattr(playwright, self.browser_name).launch(headless=self.headless, slow_mo=slow_mo)
+
+    async def run_async(self, scenarios):
+        """Run scenarios inside the current event loop"""
+        from playwright.async_api import async_playwright
+        async with async_playwright() as playwright:
+            browser = await self.launch(playwright)
+            try:
+                semaphore = asyncio.Semaphore(self.concurrency)
+                return await asyncio.gather(*(self.run_scenario(browser, scenario, semaphore) for scenario in scenarios))
+            finally:
+                await browser.close()
+
+    async def run_scenario(self, browser, scenario, semaphore):
+        """Run one scenario in a fresh context once a concurrency slot is free"""
+        result = ScenarioResult(scenario.feature.rel_filename, scenario.name)
+        async with semaphore:
+            context = await browser.new_context(viewport={'width': 1280, 'height': 720})
+            started = time.perf_counter()
+            try:
+                scenario_context = ScenarioContext(await context.new_page(), self.config)
+                for scenario_step in scenario.steps:
+                    result.failed_step = scenario_step.name
+                    step_started = time.perf_counter()
+                    func, kwargs = self.registry.find(scenario_step.name)
+                    await func(scenario_context, **kwargs)
+                    result.step_durations.append((scenario_step.name, time.perf_counter() - step_started))
+                result.passed = True
+                result.failed_step = None
+            except Exception as e:
+                result.error = e
+            finally:
+                result.duration = time.perf_counter() - started
+                await context.close()
+        return result
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run feature scenarios concurrently with asyncio")
+    parser.add_argument('paths', nargs='*', default=['features'], help="Feature files or directories")
+    parser.add_argument('--concurrency', type=int, default=None, help="Maximum scenarios in flight")
+    parser.add_argument('--tags', nargs='*', default=None, help="Only run scenarios with one of these tags")
+    parser.add_argument('--browser', default=None, help="Browser to use (chromium, firefox, webkit)")
+    args = parser.parse_args(argv)
+
+    runner = AsyncScenarioRunner(concurrency=args.concurrency, browser_name=args.browser)
+    scenarios = collect_scenarios(args.paths, args.tags)
+    storefront = LocalStorefront.from_config(runner.config) if LocalStorefront.is_enabled(runner.config) else None
+    if storefront:
+        runner.config.override('base_url', storefront.start().url)
+    started = time.perf_counter()
+    try:
+        results = runner.run(scenarios)
+    finally:
+        if storefront:
+            storefront.stop()
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        status = "PASSED" if result.passed else "FAILED"
+        print(f"{status} {result.feature}::{result.name} ({result.duration:.2f}s)")
+        if not result.passed:
+            print(f"    step: {result.failed_step}")
+            print(f"    error: {result.error}")
+    failed = sum(1 for result in results if not result.passed)
+    print(f"{len(results) - failed} passed, {failed} failed in {elapsed:.2f}s "
+          f"(concurrency {runner.concurrency})")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
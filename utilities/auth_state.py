@@ -0,0 +1,100 @@
+"""
+Cache of authenticated Playwright storage state, keyed by the users in config.yaml
+"""
+import hashlib
+import time
+
+
+class AuthStateCache:
+    """Logs each configured test user in once per session and replays the saved state
+
+    A cached state is only reused while the config that produced it (base URL and
+    credentials) is unchanged and its session cookie has not expired.
+    """
+
+    SESSION_COOKIE = 'session-username'
+    INVENTORY_PATH = '/inventory.html'
+
+    def __init__(self, config):
+        self.config = config
+        self._states = {}
+
+    @property
+    def inventory_url(self):
+        """URL of the page a logged in user lands on"""
+        return self.config['base_url'].rstrip('/') + self.INVENTORY_PATH
+
+    def find_user(self, username, password):
+        """Return the test_users key matching the given credentials, if any"""
+        for user_key, user in (self.config.get('test_users') or {}).items():
+            if user.get('username') == username and user.get('password') == password:
+                return user_key
+        return None
+
+    def fingerprint(self, user_key):
+        """Hash of everything in the config that the saved state depends on"""
+        user = self.config['test_users'][user_key]
+        raw = '|'.join([self.config['base_url'], user['username'], user['password']])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, user_key):
+        """Return the cached storage state for a user, or None if missing or stale"""
+        entry = self._states.get(user_key)
+        if entry is None:
+            return None
+        fingerprint, state = entry
+        if fingerprint != self.fingerprint(user_key) or not self._session_cookie_valid(state):
+            self.invalidate(user_key)
+            return None
+        return state
+
+    def store(self, user_key, state):
+        """Remember the storage state of a freshly logged in user"""
+        if self._session_cookie_valid(state):
+            self._states[user_key] = (self.fingerprint(user_key), state)
+
+    def invalidate(self, user_key):
+        """Forget the cached state for a user"""
+        self._states.pop(user_key, None)
+
+    def capture(self, user_key, context):
+        """Log a user in through the UI in the given context and cache the resulting state"""
+        from pages.login_page import LoginPage
+        user = self.config['test_users'][user_key]
+        page = context.new_page()
+        try:
+            login_page = LoginPage(page, self.config)
+            login_page.navigate_to_login_page()
+            login_page.login_with_credentials(user['username'], user['password'])
+            page.wait_for_url(f"**{self.INVENTORY_PATH}")
+            self.store(user_key, context.storage_state())
+        finally:
+            page.close()
+        state = self.get(user_key)
+        if state is None:
+            raise RuntimeError(f"Logging in as '{user_key}' did not produce a '{self.SESSION_COOKIE}' cookie")
+        return state
+
+    def restore(self, page, user_key):
+        """Restore a cached login into an existing page and open the inventory page
+
+        Returns False when there is no usable state or the application rejected the
+        restored session, in which case the caller should log in through the UI.
+        """
+        state = self.get(user_key)
+        if state is None:
+            return False
+        page.context.add_cookies(state['cookies'])
+        page.goto(self.inventory_url)
+        if self.INVENTORY_PATH not in page.url:
+            self.invalidate(user_key)
+            return False
+        return True
+
+    def _session_cookie_valid(self, state):
+        """Check that the state carries a session cookie that has not expired"""
+        for cookie in state.get('cookies', []):
+            if cookie.get('name') == self.SESSION_COOKIE:
+                expires = cookie.get('expires', -1)
+                return expires == -1 or expires > time.time()
+        return False
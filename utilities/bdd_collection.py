@@ -0,0 +1,168 @@
+"""
+Faster pytest-bdd collection: an on-disk Gherkin cache and an indexed step registry
+
+pytest-bdd parses every feature file again in every process and, for every step it
+runs, scans all fixture definitions of the session and tries each step parser in
+turn. ``install`` replaces both: parsed features are pickled under a key made of the
+file's path and content hash (and the pytest-bdd version), and step definitions are
+indexed by their exact text or the first word of their pattern, so a step is only
+matched against the few definitions that can possibly parse it.
+"""
+import hashlib
+import importlib
+import importlib.metadata
+import os
+import pickle
+import re
+import time
+
+import pytest_bdd.feature
+import pytest_bdd.parser
+from pytest_bdd.parsers import string
+from pytest_bdd.steps import StepNamePrefix
+
+STEP_DEF_PREFIX = f"{StepNamePrefix.step_def.value}_"
+_FIRST_WORD = re.compile(r'\S+(?=\s)')
+PYTEST_BDD_VERSION = importlib.metadata.version('pytest-bdd')
+# pytest_bdd.scenario is shadowed by the scenario() function the package exports
+_scenario_module = importlib.import_module('pytest_bdd.scenario')
+
+
+class FeatureCache:
+    """Parsed features pickled on disk, keyed by path, content hash and pytest-bdd version"""
+
+    def __init__(self, directory, parse):
+        self.directory = directory
+        self.parse = parse
+        self.parsed = 0
+        self.loaded = 0
+        self.seconds = 0.0
+
+    def key(self, base_path, filename, encoding):
+        path = os.path.abspath(os.path.join(base_path, filename))
+        digest = hashlib.sha256(f"{PYTEST_BDD_VERSION}:{path}:{base_path}:{encoding}:".encode())
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+        return digest.hexdigest()[:32]
+
+    def parse_feature(self, base_path, filename, encoding='utf-8'):
+        """Drop-in replacement for pytest_bdd.parser.parse_feature"""
+        started = time.perf_counter()
+        try:
+            cache_path = os.path.join(self.directory, self.key(base_path, filename, encoding) + '.pickle')
+            if os.path.exists(cache_path):
+                try:
+                    with open(cache_path, 'rb') as file:
+                        feature = pickle.load(file)
+                    self.loaded += 1
+                    return feature
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                    pass  # unreadable or written by another pytest-bdd: parse again
+            feature = self.parse(base_path, filename, encoding=encoding)
+            self.parsed += 1
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as file:
+                pickle.dump(feature, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            return feature
+        finally:
+            self.seconds += time.perf_counter() - started
+
+
+def index_key(parser):
+    """Where a step parser goes in the index: ('exact', text), ('word', first word) or ('any', None)"""
+    if isinstance(parser, string):
+        return 'exact', parser.name
+    pattern = getattr(parser, 'name', None)
+    if isinstance(pattern, str) and type(parser).__name__ in ('parse', 'cfparse'):
+        # Text up to the first placeholder is literal; its first word is complete if followed by a space
+        match = _FIRST_WORD.match(pattern.split('{', 1)[0])
+        if match:
+            return 'word', match.group()
+    return 'any', None
+
+
+class StepIndex:
+    """Step definition fixtures of a session indexed by exact text and first word"""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.lookups = 0
+        self._size = None
+        self._exact = {}
+        self._words = {}
+        self._any = []
+        self._matches = {}
+
+    def refresh(self, fixturemanager):
+        """Rebuild the index when fixture definitions were added (e.g. a new module was collected)"""
+        size = sum(len(fixturedefs) for fixturedefs in fixturemanager._arg2fixturedefs.values())
+        if size == self._size:
+            return
+        self._size = size
+        self._exact, self._words, self._any, self._matches = {}, {}, [], {}
+        order = 0
+        for fixturename, fixturedefs in list(fixturemanager._arg2fixturedefs.items()):
+            if not fixturename.startswith(STEP_DEF_PREFIX):
+                continue
+            for fixturedef in fixturedefs:
+                context = getattr(fixturedef.func, '_pytest_bdd_step_context', None)
+                if context is None:
+                    continue
+                kind, key = index_key(context.parser)
+                entry = (order, fixturename, fixturedef, context)
+                order += 1
+                if kind == 'exact':
+                    self._exact.setdefault(key, []).append(entry)
+                elif kind == 'word':
+                    self._words.setdefault(key, []).append(entry)
+                else:
+                    self._any.append(entry)
+
+    def candidates(self, text):
+        first_word = _FIRST_WORD.match(text + ' ')
+        return sorted(self._exact.get(text, []) + self._words.get(first_word.group() if first_word else '', [])
+                      + self._any, key=lambda entry: entry[0])
+
+    def find_fixturedefs_for_step(self, step, fixturemanager, nodeid):
+        """Drop-in replacement for pytest_bdd.scenario.find_fixturedefs_for_step"""
+        started = time.perf_counter()
+        self.refresh(fixturemanager)
+        # Step definitions are module, class or conftest fixtures, so every test of a module/class sees the same ones
+        key = (step.type, step.name, nodeid.rsplit('::', 1)[0])
+        if key not in self._matches:
+            self._matches[key] = [
+                fixturedef for _, fixturename, fixturedef, context in self.candidates(step.name)
+                if (context.type is None or context.type == step.type)
+                and context.parser.is_matching(step.name)
+                and fixturedef in (fixturemanager.getfixturedefs(fixturename, nodeid) or [])
+            ]
+        self.lookups += 1
+        self.seconds += time.perf_counter() - started
+        return iter(self._matches[key])
+
+
+def duplicate_bindings(items):
+    """Test items that run a scenario (with the same parameters) that another item already binds"""
+    seen = set()
+    duplicates = []
+    for item in items:
+        scenario = getattr(getattr(item, 'obj', None), '__scenario__', None)
+        if scenario is None:
+            continue
+        callspec = getattr(item, 'callspec', None)
+        key = (scenario.feature.filename, scenario.name, callspec.id if callspec else None)
+        if key in seen:
+            duplicates.append(item)
+        seen.add(key)
+    return duplicates
+
+
+def install(cache_dir):
+    """Route pytest-bdd's feature parsing through a FeatureCache and its step lookup through a StepIndex"""
+    feature_cache = FeatureCache(cache_dir, pytest_bdd.parser.parse_feature)
+    step_index = StepIndex()
+    pytest_bdd.feature.parse_feature = feature_cache.parse_feature
+    _scenario_module.find_fixturedefs_for_step = step_index.find_fixturedefs_for_step
+    return feature_cache, step_index
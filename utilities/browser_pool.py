@@ -0,0 +1,120 @@
+"""
+Browser pool that launches each browser once and hands out isolated contexts
+"""
+
+
+class PooledBrowser:
+    """A launched browser together with its usage counters"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.active_contexts = 0
+        self.contexts_served = 0
+        self.retired = False
+
+
+class BrowserPool:
+    """Launches browsers lazily, shares them across tests and recycles them after N contexts
+
+    The pool lives for one pytest session, which under pytest-xdist means one pool
+    per worker process. Every test still gets its own fresh ``BrowserContext``, so
+    cookies, storage and pages never leak between tests.
+    """
+
+    def __init__(self, launch_options=None, size=1, max_contexts_per_browser=1, recycle_after=0):
+        self.launch_options = launch_options or {}
+        self.size = max(1, int(size))
+        self.max_contexts_per_browser = max(1, int(max_contexts_per_browser))
+        self.recycle_after = max(0, int(recycle_after or 0))
+        self.launch_count = 0
+        self._playwright = None
+        self._browsers = {}
+        self._leases = {}
+
+    @classmethod
+    def from_config(cls, config, launch_options=None):
+        """Build a pool from the ``browser_pool`` section of config.yaml"""
+        pool_config = config.get('browser_pool') or {}
+        return cls(
+            launch_options=launch_options,
+            size=pool_config.get('size', 1),
+            max_contexts_per_browser=pool_config.get('max_contexts_per_browser', 1),
+            recycle_after=pool_config.get('recycle_after', 0)
+        )
+
+    def start(self):
+        """Start the Playwright driver"""
+        if self._playwright is None:
+            # Imported on first use so runs that never open a browser do not load Playwright
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+        return self
+
+    def new_context(self, browser_name, **context_options):
+        """Return a new isolated context from a pooled browser"""
+        pooled = self._acquire(browser_name)
+        context = pooled.browser.new_context(**context_options)
+        pooled.active_contexts += 1
+        pooled.contexts_served += 1
+        self._leases[id(context)] = (browser_name, pooled)
+        return context
+
+    def release(self, context):
+        """Close a context and recycle its browser once it has served enough tests"""
+        browser_name, pooled = self._leases.pop(id(context), (None, None))
+        try:
+            context.close()
+        finally:
+            if pooled is not None:
+                pooled.active_contexts -= 1
+                if self.recycle_after and pooled.contexts_served >= self.recycle_after:
+                    pooled.retired = True
+                if pooled.retired and pooled.active_contexts == 0:
+                    self._close_browser(browser_name, pooled)
+
+    def close(self):
+        """Close every pooled browser and stop the Playwright driver"""
+        for browser_name, browsers in list(self._browsers.items()):
+            for pooled in list(browsers):
+                self._close_browser(browser_name, pooled)
+        self._browsers.clear()
+        self._leases.clear()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _acquire(self, browser_name):
+        """Pick the least busy browser with spare capacity, launching one if needed"""
+        self.start()
+        browsers = self._browsers.setdefault(browser_name, [])
+        browsers[:] = [pooled for pooled in browsers if pooled.browser.is_connected()]
+        available = [
+            pooled for pooled in browsers
+            if not pooled.retired and pooled.active_contexts < self.max_contexts_per_browser
+        ]
+        if available:
+            return min(available, key=lambda pooled: pooled.active_contexts)
+        if len([pooled for pooled in browsers if not pooled.retired]) < self.size:
+            return self._launch(browser_name)
+        raise RuntimeError(
+            f"Browser pool exhausted for '{browser_name}': {self.size} browser(s) with "
+            f"{self.max_contexts_per_browser} context(s) each are already in use"
+        )
+
+    def _launch(self, browser_name):
+        """Launch a new browser of the given type and add it to the pool"""
+        browser_type = getattr(self._playwright, browser_name)
+        pooled = PooledBrowser(browser_type.launch(**self.launch_options))
+        self._browsers[browser_name].append(pooled)
+        self.launch_count += 1
+        return pooled
+
+    def _close_browser(self, browser_name, pooled):
+        """Close a pooled browser and forget about it"""
+        browsers = self._browsers.get(browser_name, [])
+        if pooled in browsers:
+            browsers.remove(pooled)
+        try:
+            pooled.browser.close()
+        except Exception:
+            pass
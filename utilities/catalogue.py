@@ -0,0 +1,242 @@
+"""
+Test-case catalogue compiled from TestData/TestCaseDocument.xlsx
+
+The workbook is the source of truth for the test case ids (TC_AUTH_01, ...) that
+scenarios carry as tags. It is parsed with zipfile and ElementTree only when its
+sha256 changes and compiled into an SQLite cache; collection then looks each id
+up by primary key to register its marker and attach the module marker, priority
+and expected duration.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import xml.etree.ElementTree as ET
+import zipfile
+
+NAMESPACES = {
+    'main': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main',
+    'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+}
+RELATIONSHIP_ID = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+# Workbook column headers (normalized) and the catalogue field they fill
+COLUMNS = {
+    'test_case_id': 'id',
+    'module': 'module',
+    'description': 'description',
+    'detailed_steps': 'steps',
+    'expected_result': 'expected_result',
+    'priority': 'priority',
+    'markers': 'markers',
+    'tags': 'markers',
+    'expected_duration': 'expected_duration',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS cases (
+    id TEXT PRIMARY KEY,
+    module TEXT,
+    description TEXT,
+    steps TEXT,
+    expected_result TEXT,
+    priority TEXT,
+    markers TEXT NOT NULL,
+    expected_duration REAL
+);
+"""
+FIELDS = ('id', 'module', 'description', 'steps', 'expected_result', 'priority', 'markers', 'expected_duration')
+
+# Case ids registered as markers when there is neither a workbook nor a cache to read them from
+FALLBACK_CASES = {
+    'TC_AUTH_01': 'Login with Valid credentials',
+    'TC_AUTH_02': 'Login with invalid credentials',
+    'TC_AUTH_03': 'Login with credentials from the login data set',
+    'TC_INV_01': 'Verify product listing',
+    'TC_INV_02': 'Sort products by Name (A–Z)',
+    'TC_CART_01': 'View cart contents',
+}
+
+
+def column_index(reference):
+    """Zero-based column of a cell reference such as 'C12'"""
+    index = 0
+    for letter in re.match(r'[A-Z]+', reference).group():
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def read_xlsx(path, sheet=0):
+    """Rows of one worksheet as lists of cell strings, read with the standard library only"""
+    with zipfile.ZipFile(path) as archive:
+        shared = []
+        if 'xl/sharedStrings.xml' in archive.namelist():
+            for item in ET.fromstring(archive.read('xl/sharedStrings.xml')).findall('main:si', NAMESPACES):
+                shared.append(''.join(text.text or '' for text in item.iter(f"{{{NAMESPACES['main']}}}t")))
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        relationship = workbook.findall('main:sheets/main:sheet', NAMESPACES)[sheet].get(RELATIONSHIP_ID)
+        targets = {rel.get('Id'): rel.get('Target') for rel in
+                   ET.fromstring(archive.read('xl/_rels/workbook.xml.rels')).findall('rel:Relationship', NAMESPACES)}
+        target = targets[relationship].lstrip('/')
+        worksheet = ET.fromstring(archive.read(target if target.startswith('xl/') else f"xl/{target}"))
+    rows = []
+    for row in worksheet.iter(f"{{{NAMESPACES['main']}}}row"):
+        values = []
+        for cell in row.findall('main:c', NAMESPACES):
+            kind = cell.get('t')
+            if kind == 'inlineStr':
+                value = ''.join(text.text or '' for text in cell.iter(f"{{{NAMESPACES['main']}}}t"))
+            else:
+                raw = cell.findtext('main:v', default='', namespaces=NAMESPACES)
+                value = shared[int(raw)] if kind == 's' and raw else raw
+            index = column_index(cell.get('r')) if cell.get('r') else len(values)
+            values.extend([''] * (index + 1 - len(values)))
+            values[index] = value
+        rows.append(values)
+    return rows
+
+
+def normalize_header(header):
+    return re.sub(r'[^a-z0-9]+', '_', header.strip().lower()).strip('_')
+
+
+def parse_cases(rows):
+    """Catalogue entries from worksheet rows; the first row holds the column headers"""
+    if not rows:
+        return []
+    fields = [COLUMNS.get(normalize_header(header)) for header in rows[0]]
+    cases = []
+    for values in rows[1:]:
+        case = dict.fromkeys(FIELDS)
+        for field, value in zip(fields, values):
+            if field:
+                case[field] = value.strip().replace('\r\n', '\n') or None
+        if not case['id']:
+            continue
+        case['markers'] = [marker for marker in re.split(r'[,\s]+', case['markers'] or '') if marker]
+        case['expected_duration'] = float(case['expected_duration']) if case['expected_duration'] else None
+        cases.append(case)
+    return cases
+
+
+class CaseCatalogue:
+    """Test cases of the workbook, served from a cache rebuilt only when the workbook changes"""
+
+    def __init__(self, workbook_path, cache_path, module_markers=None, extra_markers=None):
+        self.workbook_path = workbook_path
+        self.cache_path = cache_path
+        self.module_markers = module_markers or {}
+        self.extra_markers = extra_markers or {}
+        self.rebuilt = False
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(cache_path, timeout=30)
+        self.connection.executescript(SCHEMA)
+        self.refresh()
+
+    @staticmethod
+    def paths(config):
+        """Absolute workbook and cache paths from the test_catalogue section of config.yaml"""
+        catalogue_config = config.get('test_catalogue') or {}
+        root = os.path.dirname(os.path.dirname(__file__))
+        paths = {}
+        for key, default in (('workbook', 'TestData/TestCaseDocument.xlsx'), ('cache_path', 'reports/test_catalogue.sqlite')):
+            path = catalogue_config.get(key, default)
+            paths[key] = path if os.path.isabs(path) else os.path.join(root, path)
+        return paths
+
+    @classmethod
+    def from_config(cls, config):
+        """Open the catalogue configured in the test_catalogue section of config.yaml, or None if it has no workbook"""
+        catalogue_config = config.get('test_catalogue') or {}
+        paths = cls.paths(config)
+        if not catalogue_config.get('enabled', True) or not os.path.exists(paths['workbook']):
+            return None
+        return cls(paths['workbook'], paths['cache_path'],
+                   module_markers=catalogue_config.get('module_markers'),
+                   extra_markers=catalogue_config.get('markers'))
+
+    @classmethod
+    def fallback_cases(cls, config):
+        """(id, description) pairs and their source when from_config gives no catalogue
+
+        The cache compiled by an earlier run is read if there is one, else FALLBACK_CASES
+        is used. Scenarios still carry the case ids as tags, so ``--strict-markers`` needs
+        them registered either way.
+        """
+        cache_path = cls.paths(config)['cache_path']
+        if os.path.exists(cache_path):
+            try:
+                connection = sqlite3.connect(f"file:{cache_path}?mode=ro", uri=True)
+                try:
+                    rows = connection.execute("SELECT id, description FROM cases ORDER BY id").fetchall()
+                finally:
+                    connection.close()
+                if rows:
+                    return rows, 'cache'
+            except sqlite3.Error:
+                pass  # unreadable or from an older schema: fall back to the static list
+        return list(FALLBACK_CASES.items()), 'static'
+
+    @staticmethod
+    def file_hash(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 16), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _cached_hash(self):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'workbook_sha256'").fetchone()
+        return row[0] if row else None
+
+    def refresh(self):
+        """Recompile the cache if the workbook's hash differs from the one it was built from"""
+        source_hash = self.file_hash(self.workbook_path)
+        if self._cached_hash() == source_hash:
+            return
+        # xdist workers may all get here; the first one to take the write lock compiles
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            if self._cached_hash() != source_hash:
+                cases = parse_cases(read_xlsx(self.workbook_path))
+                self.connection.execute("DELETE FROM cases")
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO cases VALUES ({', '.join('?' * len(FIELDS))})",
+                    [tuple(json.dumps(case[field]) if field == 'markers' else case[field] for field in FIELDS)
+                     for case in cases])
+                self.connection.execute("INSERT OR REPLACE INTO meta VALUES ('workbook_sha256', ?)", (source_hash,))
+                self.rebuilt = True
+            self.connection.commit()
+        except BaseException:
+            self.connection.rollback()
+            raise
+
+    def _case(self, row):
+        case = dict(zip(FIELDS, row))
+        case['markers'] = json.loads(case['markers'])
+        return case
+
+    def get(self, case_id):
+        """A test case by id, or None"""
+        row = self.connection.execute(f"SELECT {', '.join(FIELDS)} FROM cases WHERE id = ?", (case_id,)).fetchone()
+        return self._case(row) if row else None
+
+    def cases(self):
+        """Every test case, ordered by id"""
+        return [self._case(row) for row in
+                self.connection.execute(f"SELECT {', '.join(FIELDS)} FROM cases ORDER BY id")]
+
+    def markers_for(self, case):
+        """Markers a test case implies: its module's marker, the workbook's markers and configured extras"""
+        markers = [self.module_markers[case['module']]] if case['module'] in self.module_markers else []
+        for marker in case['markers'] + list(self.extra_markers.get(case['id'], [])):
+            if marker not in markers:
+                markers.append(marker)
+        return markers
+
+    def close(self):
+        self.connection.close()
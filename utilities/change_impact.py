@@ -0,0 +1,387 @@
+"""
+Change-impact analysis: the scenarios a change since a git ref can affect
+
+The map is built by static analysis (ast) of step_definitions/ and pages/. Feature
+steps are matched to the step definitions that parse them, step definitions to the
+page-object members they use through their page fixtures (``login_page`` is a
+LoginPage), and page-object methods to the members they use on ``self``, resolved
+through their base classes (BasePage). The lines ``git diff`` reports mark the
+functions, methods, locators and scenarios they fall in, and everything that
+depends on those is affected. Files the analysis does not map (conftest.py,
+config.yaml, utilities/, ...) fall back to the full suite.
+"""
+import ast
+import fnmatch
+import glob
+import os
+import re
+import subprocess
+from collections import defaultdict
+
+from pytest_bdd import parsers
+from pytest_bdd.parser import parse_feature
+
+FEATURES_DIR = 'features'
+PAGES_DIR = 'pages'
+STEPS_DIR = 'step_definitions'
+TESTS_DIR = 'tests'
+PARSERS = {'string': parsers.string, 'parse': parsers.parse, 'cfparse': parsers.cfparse, 're': parsers.re}
+STEP_DECORATORS = {'given': 'given', 'when': 'when', 'then': 'then', 'step': None}
+HUNK = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def git_changes(ref, root):
+    """{path relative to root: changed line numbers, or None for added, deleted and untracked files}"""
+    def git(*args):
+        completed = subprocess.run(['git', '-c', 'core.quotepath=off', *args], cwd=root, capture_output=True, text=True)
+        if completed.returncode:
+            raise RuntimeError(f"git {' '.join(args)} failed: {completed.stderr.strip()}")
+        return completed.stdout
+
+    changes = {}
+    for line in git('diff', '--name-status', '--no-renames', '--relative', ref, '--').splitlines():
+        status, path = line.split('\t', 1)
+        changes[path] = set() if status == 'M' else None
+    path, header = None, False
+    for line in git('diff', '--no-color', '--no-renames', '--relative', '--unified=0', ref, '--').splitlines():
+        if line.startswith('diff --git '):
+            path, header = None, True
+        elif header and line.startswith('+++ b/'):
+            path = line[6:]
+        elif line.startswith('@@'):
+            header = False
+            start, count = HUNK.match(line).groups()
+            start, count = int(start), 1 if count is None else int(count)
+            if isinstance(changes.get(path), set):
+                # A pure deletion is reported as the line it follows: mark both neighbours
+                changes[path].update(range(start, start + count) if count else (start, start + 1))
+    for path in git('ls-files', '--others', '--exclude-standard').splitlines():
+        changes[path] = None
+    return changes
+
+
+def span(node):
+    """First line (including decorators) and last line of a statement"""
+    return min([node.lineno] + [decorator.lineno for decorator in getattr(node, 'decorator_list', [])]), node.end_lineno
+
+
+def touched(node, lines):
+    """Whether a changed line falls in a statement; docstrings never count"""
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+        return False
+    first, last = span(node)
+    return lines is None or any(first <= line <= last for line in lines)
+
+
+def references(node):
+    """Attributes used on plain names ({(name, attribute)}) and names loaded in a statement"""
+    attributes, names = set(), set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Attribute):
+            value = child.value
+            if isinstance(value, ast.Name):
+                attributes.add((value.id, child.attr))
+            elif isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id == 'super':
+                attributes.add(('self', child.attr))
+        elif isinstance(child, ast.Name):
+            names.add(child.id)
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        names.update(arg.arg for arg in node.args.args + node.args.kwonlyargs)
+    return attributes, names
+
+
+def assigned_names(node):
+    """Names a module or class level statement defines"""
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    targets = node.targets if isinstance(node, ast.Assign) else [getattr(node, 'target', None)]
+    return [target.id for target in targets if isinstance(target, ast.Name)]
+
+
+def fixture_name(class_name):
+    """Page fixture that provides a page object class: LoginPage -> login_page"""
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', class_name).lower()
+
+
+def module_name(path):
+    """Dotted module of a python file relative to the project root"""
+    return os.path.splitext(path)[0].replace('/', '.').removesuffix('.__init__')
+
+
+def imported_modules(path):
+    """Dotted names a python file imports (modules and the names imported from them)"""
+    try:
+        with open(path, encoding='utf-8') as file:
+            tree = ast.parse(file.read())
+    except (OSError, SyntaxError):
+        return set()
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+    return modules
+
+
+class ChangeImpact:
+    """Scenarios and test modules affected by a set of changed files and lines"""
+
+    def __init__(self, root, changes, full_suite=(), ignore=(), smoke=(), data_sources=None):
+        self.root = root
+        self.changes = changes
+        self.smoke = list(smoke)
+        self.data_sources = {os.path.normpath(path): name for name, path in (data_sources or {}).items()}
+        self.full_suite = None
+        self.dependencies = defaultdict(set)
+        self.changed = set()
+        self.classes = {}
+        self.steps = []
+        self.scenarios = set()
+        self.modules = {module_name(path) for path in changes if path.endswith('.py')}
+        self._imports = {}
+
+        for path in sorted(changes):
+            reason = self.classify(path, full_suite, ignore)
+            if reason:
+                self.full_suite = reason
+                return
+        self.scan_pages()
+        self.scan_steps()
+        self.scan_features(self.affected())
+
+    @classmethod
+    def from_config(cls, config, ref, root=None):
+        """Analyze the changes since a git ref with the change_impact section of config.yaml"""
+        root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        impact_config = config.get('change_impact') or {}
+        sources = (config.get('data_sources') or {}).get('sources') or {}
+        return cls(root, git_changes(ref, root),
+                   full_suite=impact_config.get('full_suite', ['conftest.py', 'config.yaml']),
+                   ignore=impact_config.get('ignore', []),
+                   smoke=impact_config.get('smoke', []),
+                   data_sources={name: source['path'] for name, source in sources.items()})
+
+    def classify(self, path, full_suite, ignore):
+        """Why a changed file forces the full suite, or None if the analysis covers it"""
+        directory, name = os.path.split(path)
+        if any(fnmatch.fnmatch(path, pattern) for pattern in full_suite):
+            return f"{path} changed"
+        if path.endswith('.feature') and path.startswith(f"{FEATURES_DIR}/") \
+                or directory in (PAGES_DIR, STEPS_DIR) and name.endswith('.py'):
+            return f"{path} was added or deleted" if self.changes[path] is None and \
+                not os.path.exists(os.path.join(self.root, path)) else None
+        if path.startswith(f"{TESTS_DIR}/") or os.path.normpath(path) in self.data_sources:
+            return None
+        if any(fnmatch.fnmatch(path, pattern) for pattern in ignore):
+            return None
+        return f"{path} is not covered by the change-impact map"
+
+    def python_files(self, directory):
+        for path in sorted(glob.glob(os.path.join(self.root, directory, '*.py'))):
+            relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+            with open(path, encoding='utf-8') as file:
+                yield relative, ast.parse(file.read()), self.changes.get(relative, set())
+
+    def mark(self, node, statement, lines):
+        if touched(statement, lines):
+            self.changed.add(node)
+
+    def resolve(self, class_name, member):
+        """Class in the hierarchy of class_name that defines member, or None"""
+        page_class = self.classes.get(class_name)
+        if page_class is None:
+            return None
+        if member in page_class['members']:
+            return class_name
+        for base in page_class['bases']:
+            owner = self.resolve(base, member)
+            if owner:
+                return owner
+        return None
+
+    def scan_pages(self):
+        """Page object classes: their members and the members and module names each method uses"""
+        methods = []
+        whole_classes = set()
+        for path, tree, lines in self.python_files(PAGES_DIR):
+            module_names = {name for statement in tree.body for name in assigned_names(statement)}
+            for statement in tree.body:
+                if isinstance(statement, ast.ClassDef):
+                    members = {}
+                    self.classes[statement.name] = {'bases': [getattr(base, 'id', getattr(base, 'attr', None))
+                                                              for base in statement.bases], 'members': members}
+                    header = range(span(statement)[0], statement.body[0].lineno)
+                    if lines is None or any(line in header for line in lines):
+                        whole_classes.add(statement.name)
+                    for member in statement.body:
+                        if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                            node = ('member', statement.name, member.name)
+                            members[member.name] = node
+                            methods.append((statement.name, node, member, path, module_names))
+                            # Instance attributes (self.page, self.config) depend on the methods assigning them
+                            for child in ast.walk(member):
+                                if isinstance(child, ast.Attribute) and isinstance(child.ctx, ast.Store) \
+                                        and isinstance(child.value, ast.Name) and child.value.id == 'self':
+                                    attribute = members.setdefault(child.attr, ('member', statement.name, child.attr))
+                                    self.dependencies[attribute].add(node)
+                            self.mark(node, member, lines)
+                        elif assigned_names(member):
+                            for name in assigned_names(member):
+                                node = members[name] = ('member', statement.name, name)
+                                self.dependencies[node].update(('name', path, used) for used in references(member)[1]
+                                                               if used in module_names)
+                                self.mark(node, member, lines)
+                        elif touched(member, lines):
+                            whole_classes.add(statement.name)
+                elif assigned_names(statement):
+                    for name in assigned_names(statement):
+                        node = ('name', path, name)
+                        self.dependencies[node].update(('name', path, used) for used in references(statement)[1]
+                                                       if used in module_names and used != name)
+                        self.mark(node, statement, lines)
+                elif touched(statement, lines):
+                    # Imports and other module level code: everything in the module
+                    whole_classes.update(node.name for node in tree.body if isinstance(node, ast.ClassDef))
+                    self.changed.update(('name', path, name) for name in module_names)
+        for class_name, node, method, path, module_names in methods:
+            attributes, names = references(method)
+            for receiver, attribute in attributes:
+                if receiver in ('self', 'cls', class_name):
+                    owner = self.resolve(class_name, attribute)
+                    if owner:
+                        self.dependencies[node].add(('member', owner, attribute))
+            self.dependencies[node].update(('name', path, name) for name in names if name in module_names)
+        # A class whose header changed (e.g. its bases) changes for every class derived from it
+        for class_name in self.classes:
+            if any(self.derives_from(class_name, changed) for changed in whole_classes):
+                self.changed.update(self.classes[class_name]['members'].values())
+
+    def derives_from(self, class_name, base):
+        if class_name == base:
+            return True
+        return any(self.derives_from(parent, base) for parent in self.classes.get(class_name, {}).get('bases', []))
+
+    def step_parser(self, decorator, parser_names):
+        """pytest-bdd parser of a step decorator, or None if it is not a literal (None matches every step)"""
+        if not decorator.args:
+            return None
+        argument = decorator.args[0]
+        if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+            return parsers.string(argument.value)
+        if isinstance(argument, ast.Call) and argument.args and isinstance(argument.args[0], ast.Constant):
+            function = argument.func
+            kind = function.attr if isinstance(function, ast.Attribute) and \
+                getattr(function.value, 'id', None) in parser_names['module'] else parser_names['functions'].get(
+                getattr(function, 'id', None))
+            if kind in PARSERS and not argument.keywords:
+                try:
+                    return PARSERS[kind](argument.args[0].value)
+                except (ValueError, re.error):
+                    return None
+        return None
+
+    def scan_steps(self):
+        """pytest-bdd step definitions: the step they parse and the page-object members they use"""
+        page_fixtures = {fixture_name(class_name): class_name for class_name in self.classes}
+        for path, tree, lines in self.python_files(STEPS_DIR):
+            decorators, parser_names = {}, {'module': set(), 'functions': {}}
+            for statement in tree.body:
+                if isinstance(statement, ast.ImportFrom) and statement.module == 'pytest_bdd':
+                    for alias in statement.names:
+                        if alias.name in STEP_DECORATORS:
+                            decorators[alias.asname or alias.name] = STEP_DECORATORS[alias.name]
+                        elif alias.name == 'parsers':
+                            parser_names['module'].add(alias.asname or alias.name)
+                elif isinstance(statement, ast.ImportFrom) and statement.module == 'pytest_bdd.parsers':
+                    parser_names['functions'].update((alias.asname or alias.name, alias.name) for alias in statement.names)
+            module_names = {name for statement in tree.body for name in assigned_names(statement)}
+            for statement in tree.body:
+                if not assigned_names(statement):
+                    if touched(statement, lines):
+                        self.changed.update(('name', path, name) for name in module_names)
+                    continue
+                attributes, names = references(statement)
+                for name in assigned_names(statement):
+                    node = ('name', path, name)
+                    self.dependencies[node].update(('name', path, used) for used in names
+                                                   if used in module_names and used != name)
+                    for receiver, attribute in attributes:
+                        owner = self.resolve(page_fixtures.get(receiver), attribute)
+                        if owner:
+                            self.dependencies[node].add(('member', owner, attribute))
+                    self.mark(node, statement, lines)
+                for decorator in getattr(statement, 'decorator_list', []):
+                    if isinstance(decorator, ast.Call) and getattr(decorator.func, 'id', None) in decorators:
+                        step_type = decorators[decorator.func.id]
+                        self.steps.append((step_type, self.step_parser(decorator, parser_names),
+                                           ('name', path, statement.name)))
+
+    def affected(self):
+        """Every node that is changed or depends, directly or not, on a changed node"""
+        dependents = defaultdict(set)
+        for node, dependencies in self.dependencies.items():
+            for dependency in dependencies:
+                dependents[dependency].add(node)
+        affected, pending = set(self.changed), list(self.changed)
+        while pending:
+            for node in dependents[pending.pop()]:
+                if node not in affected:
+                    affected.add(node)
+                    pending.append(node)
+        return affected
+
+    def step_affected(self, step, affected):
+        """Whether any step definition that parses a feature step is affected; unmatched steps are"""
+        matches = [node for step_type, parser, node in self.steps
+                   if step_type in (None, step.type) and (parser is None or parser.is_matching(step.name))]
+        return not matches or any(node in affected for node in matches)
+
+    def scan_features(self, affected):
+        """Scenarios whose lines, steps or data source changed"""
+        changed_sources = {name for path, name in self.data_sources.items()
+                           if any(os.path.normpath(changed) == path for changed in self.changes)}
+        for path in sorted(glob.glob(os.path.join(self.root, FEATURES_DIR, '**', '*.feature'), recursive=True)):
+            relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+            lines = self.changes.get(relative, set())
+            feature = parse_feature(self.root, relative)
+            with open(path, encoding='utf-8') as file:
+                text = file.read().splitlines()
+            # A scenario's lines start at the tags above it; lines before the first scenario belong to all of them
+            starts = {}
+            for name, scenario in feature.scenarios.items():
+                start = scenario.line_number
+                while start > 1 and text[start - 2].strip().startswith('@'):
+                    start -= 1
+                starts[name] = start
+            owners = set(starts) if lines is None else set()
+            for line in lines or ():
+                before = [name for name, start in starts.items() if start <= line]
+                owners.update([max(before, key=starts.get)] if before else starts)
+            for name, scenario in feature.scenarios.items():
+                if name in owners or {f"data:{source}" for source in changed_sources} & scenario.tags \
+                        or any(self.step_affected(step, affected) for step in scenario.steps):
+                    self.scenarios.add((relative, name))
+
+    def affects_scenario(self, feature_path, name):
+        """Whether a scenario of a feature file (absolute or relative to the root) is affected"""
+        relative = os.path.relpath(os.path.join(self.root, feature_path), self.root).replace(os.sep, '/')
+        return self.full_suite is not None or (relative, name) in self.scenarios
+
+    def project_imports(self, relative):
+        """Project modules a python file imports, directly or through other project modules"""
+        if relative not in self._imports:
+            self._imports[relative] = set()
+            for module in imported_modules(os.path.join(self.root, relative)):
+                for candidate in (module.replace('.', '/') + '.py', module.replace('.', '/') + '/__init__.py'):
+                    if os.path.exists(os.path.join(self.root, candidate)):
+                        self._imports[relative] |= {module_name(candidate)} | self.project_imports(candidate)
+        return self._imports[relative]
+
+    def affects_module(self, path):
+        """Whether a test module changed or imports a changed module"""
+        if self.full_suite is not None:
+            return True
+        relative = os.path.relpath(os.path.join(self.root, path), self.root).replace(os.sep, '/')
+        return relative in self.changes or bool(self.project_imports(relative) & self.modules)
@@ -0,0 +1,297 @@
+"""
+Streaming test data sources for large data-driven runs
+
+JSON-lines, CSV and chunked YAML files are read as generators, one row at a time.
+Collection only keeps a ``RowRef`` per row (the row's byte position and id), and
+the row itself is read back from that position when the test runs, so memory no
+longer grows with the size of the data set. The position index of a file is
+cached on disk, so every xdist worker after the first skips the scan.
+
+A data source feeds pytest-bdd Scenario Outlines through a feature tag
+(``@data:<name>`` with ``<name>`` in the data_sources section of config.yaml, and
+an Examples table with just the header row) or a plain test through the marker
+``@pytest.mark.data_source('<name or path>', tags=[...], batch=N)`` and the
+``data_row`` argument (``data_rows`` for batches of N rows per test).
+
+Rows may carry a ``tags`` field (a list, or a comma/space separated string) for
+filtering, and an ``id`` field used in the test id.
+"""
+import csv
+import functools
+import hashlib
+import json
+import os
+import re
+from collections.abc import Mapping
+
+import yaml
+
+DATA_TAG_PREFIX = 'data:'
+INDEX_VERSION = 1
+_DOCUMENT_START = re.compile(rb'^---(\s|$)')
+
+
+def row_tags(row):
+    """Tags of a row as a set"""
+    tags = row.get('tags') or []
+    if isinstance(tags, str):
+        tags = re.split(r'[,\s]+', tags)
+    return {str(tag).lstrip('@') for tag in tags if tag}
+
+
+class RowRef(Mapping):
+    """A row of a data source that is only read when one of its values is needed
+
+    Being a Mapping, it can stand in for the Examples row of a Scenario Outline.
+    """
+
+    def __init__(self, source, position, row_id):
+        self.source = source
+        self.position = position
+        self.id = row_id
+
+    @property
+    def row(self):
+        return self.source.row_at(self.position)
+
+    def __getitem__(self, key):
+        return self.row[key]
+
+    def __iter__(self):
+        return iter(self.row)
+
+    def __len__(self):
+        return len(self.row)
+
+    def __repr__(self):
+        return f"<RowRef {os.path.basename(self.source.path)}:{self.id}>"
+
+
+class RowBatch:
+    """Consecutive rows of a source that one test iterates over, read lazily"""
+
+    def __init__(self, refs):
+        self.refs = refs
+
+    @property
+    def id(self):
+        return f"{self.refs[0].id}..{self.refs[-1].id}" if len(self.refs) > 1 else self.refs[0].id
+
+    def __iter__(self):
+        return (ref.row for ref in self.refs)
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __repr__(self):
+        return f"<RowBatch {len(self.refs)} rows {self.id}>"
+
+
+class DataSource:
+    """A file of test data rows, read as a stream"""
+
+    FORMATS = {}
+    _instances = {}
+
+    def __init__(self, path, index_dir=None):
+        self.path = os.path.abspath(path)
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.index_dir = index_dir
+        self.row_at = functools.lru_cache(maxsize=64)(self._row_at)
+
+    @classmethod
+    def register(cls, *extensions):
+        """Class decorator mapping file extensions to a source format"""
+        def decorator(source_class):
+            for extension in extensions:
+                cls.FORMATS[extension] = source_class
+            return source_class
+        return decorator
+
+    @classmethod
+    def open(cls, path, index_dir=None):
+        """Get the process-wide source for a file, picking the format from its extension"""
+        path = os.path.abspath(path)
+        if path not in cls._instances:
+            extension = os.path.splitext(path)[1].lower()
+            if extension not in cls.FORMATS:
+                raise ValueError(f"Unsupported data source '{path}' (supported: {', '.join(sorted(cls.FORMATS))})")
+            cls._instances[path] = cls.FORMATS[extension](path, index_dir)
+        return cls._instances[path]
+
+    @classmethod
+    def from_config(cls, config, name):
+        """Open a source named in the data_sources section of config.yaml, or a path relative to the project"""
+        sources_config = config.get('data_sources') or {}
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        index_dir = sources_config.get('index_dir', 'reports/data_index')
+        index_dir = index_dir if not index_dir or os.path.isabs(index_dir) else os.path.join(root, index_dir)
+        options = dict((sources_config.get('sources') or {}).get(name) or {'path': name})
+        path = options.pop('path')
+        return cls.open(path if os.path.isabs(path) else os.path.join(root, path), index_dir), options
+
+    def records(self):
+        """Yield (position, row) for every row in the file; implemented per format"""
+        raise NotImplementedError
+
+    def _row_at(self, position):
+        """Read the row stored at a position; implemented per format"""
+        raise NotImplementedError
+
+    def __iter__(self):
+        """Every row, streamed"""
+        return (row for _, row in self.records())
+
+    def index(self):
+        """(position, id, tags) of every row, from the on-disk cache when the file is unchanged"""
+        stat = os.stat(self.path)
+        signature = f"{INDEX_VERSION}:{self.path}:{stat.st_size}:{stat.st_mtime_ns}"
+        cache_path = None
+        if self.index_dir:
+            cache_path = os.path.join(self.index_dir, hashlib.sha256(signature.encode()).hexdigest()[:20] + '.json')
+            if os.path.exists(cache_path):
+                with open(cache_path, 'r') as file:
+                    return [(tuple(position) if isinstance(position, list) else position, row_id, tags)
+                            for position, row_id, tags in json.load(file)]
+        entries = []
+        for number, (position, row) in enumerate(self.records()):
+            entries.append((position, str(row.get('id', f"{self.name}-{number}")), sorted(row_tags(row))))
+        if cache_path:
+            os.makedirs(self.index_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump(entries, file)
+            os.replace(tmp_path, cache_path)
+        return entries
+
+    def refs(self, tags=None, shard=None):
+        """Yield a RowRef per row that has one of ``tags`` and falls in shard ``(i, N)`` (1-based)"""
+        wanted = {tag.lstrip('@') for tag in tags} if tags else None
+        kept = 0
+        for position, row_id, row_tag_list in self.index():
+            if wanted and not wanted.intersection(row_tag_list):
+                continue
+            kept += 1
+            if shard and (kept - 1) % shard[1] != shard[0] - 1:
+                continue
+            yield RowRef(self, position, row_id)
+
+    def batches(self, size, tags=None, shard=None):
+        """Yield RowBatches of up to ``size`` rows"""
+        batch = []
+        for ref in self.refs(tags, shard):
+            batch.append(ref)
+            if len(batch) == size:
+                yield RowBatch(batch)
+                batch = []
+        if batch:
+            yield RowBatch(batch)
+
+
+@DataSource.register('.jsonl', '.ndjson')
+class JsonLinesSource(DataSource):
+    """One JSON object per line"""
+
+    def records(self):
+        with open(self.path, 'rb') as file:
+            while True:
+                position = file.tell()
+                line = file.readline()
+                if not line:
+                    return
+                if line.strip():
+                    yield position, json.loads(line)
+
+    def _row_at(self, position):
+        with open(self.path, 'rb') as file:
+            file.seek(position)
+            return json.loads(file.readline())
+
+
+@DataSource.register('.csv')
+class CsvSource(DataSource):
+    """CSV with a header row; quoted fields may span lines"""
+
+    def __init__(self, path, index_dir=None):
+        super().__init__(path, index_dir)
+        self._header = None
+
+    @staticmethod
+    def _reader(file):
+        # csv pulls one line at a time, so file.tell() stays at the end of the last record read
+        return csv.reader(line.decode('utf-8-sig') for line in iter(file.readline, b''))
+
+    @property
+    def header(self):
+        if self._header is None:
+            with open(self.path, 'rb') as file:
+                self._header = next(self._reader(file), [])
+        return self._header
+
+    def records(self):
+        with open(self.path, 'rb') as file:
+            reader = self._reader(file)
+            next(reader, None)
+            while True:
+                position = file.tell()
+                values = next(reader, None)
+                if values is None:
+                    return
+                if values:
+                    yield position, dict(zip(self.header, values))
+
+    def _row_at(self, position):
+        with open(self.path, 'rb') as file:
+            file.seek(position)
+            return dict(zip(self.header, next(self._reader(file))))
+
+
+@DataSource.register('.yaml', '.yml')
+class YamlSource(DataSource):
+    """A stream of YAML documents, each one row (a mapping) or a chunk of rows (a list)
+
+    Only one document is parsed at a time, so a file can hold any number of chunks.
+    """
+
+    def __init__(self, path, index_dir=None):
+        super().__init__(path, index_dir)
+        self._document_at = functools.lru_cache(maxsize=2)(self._load_document)
+
+    def documents(self):
+        """Yield (offset, text) of each document, split on '---' lines"""
+        with open(self.path, 'rb') as file:
+            offset, lines = 0, []
+            while True:
+                position = file.tell()
+                line = file.readline()
+                if not line or _DOCUMENT_START.match(line):
+                    if any(text.strip() and not text.startswith((b'#', b'%')) for text in lines):
+                        yield offset, b''.join(lines)
+                    if not line:
+                        return
+                    offset, lines = position, []
+                lines.append(line)
+
+    @staticmethod
+    def _rows(document):
+        return document if isinstance(document, list) else [document] if document else []
+
+    def records(self):
+        for offset, text in self.documents():
+            for item, row in enumerate(self._rows(yaml.safe_load(text))):
+                yield (offset, item), row
+
+    def _load_document(self, offset):
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            lines = [file.readline()]
+            while True:
+                line = file.readline()
+                if not line or _DOCUMENT_START.match(line):
+                    break
+                lines.append(line)
+        return self._rows(yaml.safe_load(b''.join(lines)))
+
+    def _row_at(self, position):
+        offset, item = position
+        return self._document_at(offset)[item]
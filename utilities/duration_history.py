@@ -0,0 +1,225 @@
+"""
+SQLite history of scenario and step durations, used to balance shards and order tests
+
+Usage:
+    python -m utilities.duration_history import-junit reports/junit_report.xml
+    python -m utilities.duration_history show
+"""
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+DEFAULT_DURATION = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    run_id TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    duration REAL NOT NULL,
+    outcome TEXT NOT NULL,
+    browser TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_nodeid ON scenarios (nodeid, recorded_at);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id TEXT NOT NULL,
+    nodeid TEXT NOT NULL,
+    step TEXT NOT NULL,
+    duration REAL NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_step ON steps (step);
+"""
+
+
+def strip_xdist_group(nodeid):
+    """Remove the '@group' suffix xdist's loadgroup scheduling appends to node ids"""
+    at = nodeid.rfind('@')
+    return nodeid[:at] if at > nodeid.rfind(']') else nodeid
+
+
+def parse_shard(value):
+    """Parse a 'i/N' shard spec into a 1-based (index, count) tuple"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got '{value}'")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and N, got '{value}'")
+    return index, count
+
+
+def split_into_shards(durations, count):
+    """Split node ids into ``count`` shards of roughly equal total duration
+
+    Uses longest-processing-time-first: the slowest remaining test always goes to
+    the shard with the least work so far. Ties are broken by node id so every
+    process computes the same split.
+    """
+    shards = [[] for _ in range(count)]
+    totals = [0.0] * count
+    for nodeid, duration in sorted(durations.items(), key=lambda entry: (-entry[1], entry[0])):
+        index = totals.index(min(totals))
+        shards[index].append(nodeid)
+        totals[index] += duration
+    return shards
+
+
+class DurationHistory:
+    """Per-scenario and per-step durations, outcomes and browser for every recorded run"""
+
+    def __init__(self, path, window=5):
+        self.path = path
+        self.window = window
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, config):
+        """Open the history file configured in the duration_history section of config.yaml"""
+        history_config = config.get('duration_history') or {}
+        path = history_config.get('path', 'reports/duration_history.sqlite')
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
+        return cls(path, window=history_config.get('window', 5))
+
+    @staticmethod
+    def new_run_id():
+        """Identifier for a test run"""
+        return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    def record_scenario(self, run_id, nodeid, duration, outcome, browser=None, steps=()):
+        """Store the duration of one scenario and of each of its steps"""
+        recorded_at = datetime.now().isoformat()
+        self.connection.execute(
+            "INSERT INTO scenarios VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, nodeid, duration, outcome, browser, recorded_at)
+        )
+        self.connection.executemany(
+            "INSERT INTO steps VALUES (?, ?, ?, ?, ?)",
+            [(run_id, nodeid, step['step'], step['duration'], step['outcome']) for step in steps]
+        )
+
+    def commit(self):
+        """Write pending records to disk"""
+        self.connection.commit()
+
+    def close(self):
+        """Commit and close the history file"""
+        self.connection.commit()
+        self.connection.close()
+
+    def expected_durations(self, nodeids, defaults=None):
+        """Median of the last ``window`` recorded durations for each node id
+
+        Node ids without history get their entry in ``defaults`` (e.g. the test
+        catalogue's expected duration), else the median of the known ones (or a
+        default), so new tests are spread across shards instead of piling up in one.
+        """
+        known = {}
+        for nodeid in nodeids:
+            rows = self.connection.execute(
+                "SELECT duration FROM scenarios WHERE nodeid = ? AND outcome != 'skipped' "
+                "ORDER BY recorded_at DESC LIMIT ?",
+                (nodeid, self.window)
+            ).fetchall()
+            if rows:
+                known[nodeid] = statistics.median(row[0] for row in rows)
+        fallback = statistics.median(known.values()) if known else DEFAULT_DURATION
+        defaults = defaults or {}
+        return {nodeid: known.get(nodeid, defaults.get(nodeid, fallback)) for nodeid in nodeids}
+
+    def step_summary(self):
+        """Count, mean and max duration per step text across the history"""
+        return self.connection.execute(
+            "SELECT step, COUNT(*), AVG(duration), MAX(duration) FROM steps "
+            "GROUP BY step ORDER BY AVG(duration) DESC"
+        ).fetchall()
+
+    def import_junit(self, junit_path, browser=None):
+        """Backfill scenario durations from a JUnit XML report written by --junitxml"""
+        run_id = self.new_run_id()
+        count = 0
+        for testcase in ET.parse(junit_path).getroot().iter('testcase'):
+            parts = testcase.get('classname', '').split('.')
+            classes = []
+            while parts and parts[-1][:1].isupper():
+                classes.insert(0, parts.pop())
+            nodeid = '/'.join(parts) + '.py::' + ''.join(f"{cls}::" for cls in classes) + testcase.get('name')
+            if testcase.find('skipped') is not None:
+                outcome = 'skipped'
+            elif testcase.find('failure') is not None or testcase.find('error') is not None:
+                outcome = 'failed'
+            else:
+                outcome = 'passed'
+            self.record_scenario(run_id, nodeid, float(testcase.get('time', 0)), outcome, browser)
+            count += 1
+        self.commit()
+        return count
+
+
+class DurationRecorder:
+    """pytest plugin that feeds report durations into the history at the end of each test
+
+    It sums the setup/call/teardown durations of the test reports, the same data
+    --junitxml writes, so it runs on the xdist controller and sees every worker's
+    tests. Step timings travel on the call report as ``step_durations``.
+    """
+
+    def __init__(self, history, browser=None):
+        self.history = history
+        self.browser = browser
+        self.run_id = DurationHistory.new_run_id()
+        self._pending = {}
+
+    def pytest_runtest_logreport(self, report):
+        nodeid = strip_xdist_group(report.nodeid)
+        entry = self._pending.setdefault(nodeid, {'duration': 0.0, 'outcome': 'passed', 'steps': []})
+        entry['duration'] += report.duration
+        if report.failed:
+            entry['outcome'] = 'failed'
+        elif report.skipped and entry['outcome'] == 'passed':
+            entry['outcome'] = 'skipped'
+        entry['steps'].extend(getattr(report, 'step_durations', None) or [])
+        if report.when == 'teardown':
+            del self._pending[nodeid]
+            self.history.record_scenario(
+                self.run_id, nodeid, entry['duration'], entry['outcome'], self.browser, entry['steps'])
+
+    def pytest_sessionfinish(self, session):
+        self.history.close()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from utilities.helpers import ConfigManager
+
+    parser = argparse.ArgumentParser(description="Inspect or backfill the scenario duration history")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    import_parser = subparsers.add_parser('import-junit', help="Backfill durations from a JUnit XML report")
+    import_parser.add_argument('junit_path')
+    import_parser.add_argument('--browser', default=None)
+    subparsers.add_parser('show', help="Show per-step duration statistics")
+    args = parser.parse_args(argv)
+
+    history = DurationHistory.from_config(ConfigManager.instance())
+    try:
+        if args.command == 'import-junit':
+            print(f"Imported {history.import_junit(args.junit_path, args.browser)} test cases into {history.path}")
+        else:
+            for step, count, mean, longest in history.step_summary():
+                print(f"{mean:8.3f}s avg {longest:8.3f}s max {count:6d}x  {step}")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
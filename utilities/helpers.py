@@ -1,66 +1,179 @@
 """
 Utility functions for test framework
 """
+import copy
 import os
+import time
 import yaml
 import json
 from datetime import datetime
 import logging
 
+from utilities.data_sources import DataSource
+from utilities.structured_logging import QueueLogging
+
+_MISSING = object()
+
+def _parse_bool(value):
+    """Parse a boolean flag from an environment variable"""
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
 class ConfigManager:
-    """Manages configuration loading and access"""
+    """Manages configuration loading and access
+
+    One instance per config file is shared by the whole process (see ``instance``).
+    The YAML is parsed once and only re-read when the file's mtime changes, and the
+    environment variables in ``ENV_OVERLAYS`` take precedence over the file. Both
+    are checked at most every ``CHECK_INTERVAL`` seconds, or on the next lookup
+    after ``reload``.
+    """
+    
+    ENV_OVERLAYS = {
+        'HEADLESS': ('headless', _parse_bool),
+        'BASE_URL': ('base_url', str),
+        'BROWSER': ('browser', str),
+        'STOREFRONT': ('storefront', str),
+        'DEMO_MODE': ('demo_mode', _parse_bool),
+    }
+    CHECK_INTERVAL = 1.0
+    _instances = {}
     
     def __init__(self, config_path=None):
         if config_path is None:
             config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.yaml')
-        self.config_path = config_path
-        self.config = self._load_config()
+        self.config_path = os.path.abspath(config_path)
+        self._config = None
+        self._signature = None
+        self._checked_at = None
+        self._lookups = {}
+        self._overrides = {}
+    
+    @classmethod
+    def instance(cls, config_path=None):
+        """Get the process-wide manager for a config file"""
+        manager = cls(config_path)
+        return cls._instances.setdefault(manager.config_path, manager)
+    
+    @property
+    def config(self):
+        """Configuration with environment overlays and overrides applied"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.CHECK_INTERVAL:
+            self._checked_at = now
+            signature = (os.stat(self.config_path).st_mtime_ns,
+                         tuple(os.environ.get(name) for name in self.ENV_OVERLAYS))
+            if signature != self._signature:
+                self._config = self._apply_overlays(self._load_config())
+                self._signature = signature
+                self._lookups = {}
+        return self._config
+
+    def reload(self):
+        """Check the file and the environment again on the next lookup"""
+        self._checked_at = None
     
     def _load_config(self):
         """Load configuration from YAML file"""
         with open(self.config_path, 'r') as file:
-            return yaml.safe_load(file)
+            return yaml.safe_load(file) or {}
+    
+    def _apply_overlays(self, config):
+        """Apply environment variables and programmatic overrides on top of the file"""
+        for env_name, (key, convert) in self.ENV_OVERLAYS.items():
+            value = os.environ.get(env_name)
+            if value is not None:
+                config[key] = convert(value)
+        for key, value in self._overrides.items():
+            *parents, leaf = key.split('.')
+            target = config
+            for k in parents:
+                target = target.setdefault(k, {})
+            target[leaf] = value
+        return config
+    
+    def override(self, key, value):
+        """Override a (dotted) configuration key for the rest of the process"""
+        self._overrides[key] = value
+        self._signature = None
+        self._checked_at = None
     
     def get(self, key, default=None):
-        """Get configuration value"""
-        keys = key.split('.')
-        value = self.config
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
+        """Get configuration value; sections and lists are copies, so callers cannot change the shared config"""
+        config = self.config
+        value = self._lookups.get(key, _MISSING)
+        if value is _MISSING:
+            value = config
+            for k in key.split('.'):
+                if isinstance(value, dict) and k in value:
+                    value = value[k]
+                else:
+                    value = _MISSING
+                    break
+            self._lookups[key] = value
+        if value is _MISSING:
+            return default
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+    
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
         return value
+    
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
 
 class LogManager:
-    """Manages logging for the test framework"""
+    """Manages logging for the test framework
+
+    Records go through one process-wide queue and are written as JSON lines by a
+    background thread (see utilities/structured_logging.py), one file per xdist
+    worker, merged when the session ends. Levels can be set per module in the
+    ``logging.levels`` section of config.yaml.
+    """
     
     @staticmethod
-    def setup_logger(name, log_file=None, level=logging.INFO):
-        """Setup logger with file and console handlers"""
+    def configure(config, clear=False):
+        """Attach the loggers listed in config.yaml to the queue and apply the per-module levels"""
+        logging_config = config.get('logging') or {}
+        backend = QueueLogging.instance(config)
+        if clear:
+            # Worker files of an earlier run; only the process that merges may remove them
+            QueueLogging.clear(backend.path)
+        for name in logging_config.get('loggers', ['framework']):
+            logger = logging.getLogger(name)
+            logger.setLevel(LogManager.level_for(name, config, logging_config.get('level', 'INFO')))
+            backend.attach(logger)
+        for name, level in (logging_config.get('levels') or {}).items():
+            logging.getLogger(name).setLevel(level)
+        return backend
+    
+    @staticmethod
+    def level_for(name, config, default=logging.INFO):
+        """Level configured for a logger or its closest configured parent module"""
+        levels = (config.get('logging') or {}).get('levels') or {}
+        parts = name.split('.')
+        for index in range(len(parts), 0, -1):
+            level = levels.get('.'.join(parts[:index]))
+            if level is not None:
+                return level
+        return default
+    
+    @staticmethod
+    def setup_logger(name, log_file=None, level=logging.INFO, config=None):
+        """Set up a logger that writes through the queue; log_file is the merged JSON-lines log"""
+        config = config or ConfigManager.instance()
         logger = logging.getLogger(name)
-        logger.setLevel(level)
-        
-        if not logger.handlers:
-            # Console handler
-            console_handler = logging.StreamHandler()
-            console_formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            console_handler.setFormatter(console_formatter)
-            logger.addHandler(console_handler)
-            
-            # File handler
-            if log_file:
-                os.makedirs(os.path.dirname(log_file), exist_ok=True)
-                file_handler = logging.FileHandler(log_file)
-                file_formatter = logging.Formatter(
-                    '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
-                )
-                file_handler.setFormatter(file_formatter)
-                logger.addHandler(file_handler)
-        
+        logger.setLevel(LogManager.level_for(name, config, level))
+        QueueLogging.instance(config, log_file).attach(logger)
         return logger
+    
+    @staticmethod
+    def shutdown(merge=True):
+        """Flush and stop the logging threads, then merge each log's worker files"""
+        for path in QueueLogging.close_all():
+            if merge:
+                QueueLogging.merge(path)
 
 class TestDataManager:
     """Manages test data loading and access"""
@@ -76,6 +189,27 @@ class TestDataManager:
         """Load test data from YAML file"""
         with open(file_path, 'r') as file:
             return yaml.safe_load(file)
+    
+    @staticmethod
+    def stream_data(file_path):
+        """Iterate over the rows of a JSON-lines, CSV or (chunked) YAML file without loading it whole"""
+        return iter(DataSource.open(file_path))
+
+class WorkerManager:
+    """Helpers for running under pytest-xdist"""
+    
+    @staticmethod
+    def get_worker_id():
+        """Get the xdist worker id (gw0, gw1, ...) or 'master' outside xdist"""
+        return os.environ.get('PYTEST_XDIST_WORKER', 'master')
+    
+    @staticmethod
+    def get_artifact_dir(base_dir):
+        """Get an artifact directory that is private to the current xdist worker"""
+        worker_id = os.environ.get('PYTEST_XDIST_WORKER')
+        artifact_dir = os.path.join(base_dir, worker_id) if worker_id else base_dir
+        os.makedirs(artifact_dir, exist_ok=True)
+        return artifact_dir
 
 class ReportManager:
     """Manages test reporting utilities"""
@@ -89,7 +223,7 @@ class ReportManager:
     def create_report_directory(base_dir="reports"):
         """Create report directory with timestamp"""
         timestamp = ReportManager.generate_timestamp()
-        report_dir = os.path.join(base_dir, f"test_run_{timestamp}")
+        report_dir = os.path.join(WorkerManager.get_artifact_dir(base_dir), f"test_run_{timestamp}")
         os.makedirs(report_dir, exist_ok=True)
         return report_dir
 
@@ -99,8 +233,7 @@ class ScreenshotManager:
     @staticmethod
     def create_screenshot_directory(base_dir="screenshots"):
         """Create screenshot directory"""
-        os.makedirs(base_dir, exist_ok=True)
-        return base_dir
+        return WorkerManager.get_artifact_dir(base_dir)
     
     @staticmethod
     def get_screenshot_path(test_name, timestamp=None):
@@ -0,0 +1,96 @@
+"""
+Import-time profile of the framework's startup
+
+Runs a command under ``python -X importtime`` in a fresh interpreter and reports
+what each module costs: the slowest imports (including what they import) and the
+time attributed to each top-level package. ``--forbid`` fails if a package is
+imported at all, e.g. to keep Playwright out of collection-only runs.
+
+Usage:
+    python -m utilities.import_profile                         # pytest --collect-only -q
+    python -m utilities.import_profile tests/test_cart.py --forbid playwright
+    python -m utilities.import_profile --module conftest --budget 0.5
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+def parse_importtime(output):
+    """(module, self seconds, cumulative seconds, depth) for each line of -X importtime output"""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us) / 1e6, int(cumulative_us) / 1e6, len(indent) // 2))
+    return imports
+
+
+def by_package(imports):
+    """Self time per top-level package, slowest first"""
+    totals = defaultdict(float)
+    for module, self_time, _, _ in imports:
+        totals[module.split('.')[0]] += self_time
+    return sorted(totals.items(), key=lambda entry: -entry[1])
+
+
+def profile(arguments):
+    """Run ``python -X importtime <arguments>`` from the project root and return its imports"""
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [PROJECT_ROOT, os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', *arguments], cwd=PROJECT_ROOT,
+                               env=environment, capture_output=True, text=True)
+    return parse_importtime(completed.stderr)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show what each imported module costs at startup")
+    parser.add_argument('pytest_args', nargs='*', help="Arguments for pytest (default: --collect-only -q)")
+    parser.add_argument('--module', default=None, help="Profile importing this module instead of a pytest run")
+    parser.add_argument('--top', type=int, default=25, help="Number of modules and packages to show")
+    parser.add_argument('--forbid', nargs='*', default=[], help="Fail if any of these packages is imported")
+    parser.add_argument('--budget', type=float, default=None, help="Fail if total import time exceeds this many seconds")
+    # Options this command does not know (e.g. --collect-only, -m smoke) are passed on to pytest
+    args, pytest_options = parser.parse_known_args(argv)
+    args.pytest_args += pytest_options
+
+    if args.module:
+        arguments = ['-c', f"import {args.module}"]
+    else:
+        # -s: pytest would otherwise capture the importtime lines written while collecting
+        arguments = ['-m', 'pytest', '-s', '-p', 'no:cacheprovider', *(args.pytest_args or ['--collect-only', '-q'])]
+    imports = profile(arguments)
+    if not imports:
+        print(f"No imports recorded for: python -X importtime {' '.join(arguments)}")
+        return 1
+    total = sum(self_time for _, self_time, _, _ in imports)
+
+    print(f"{len(imports)} modules imported in {total:.3f}s: python {' '.join(arguments)}")
+    print(f"\n{'slowest imports (with what they import)':<60} {'cumulative':>10} {'self':>9}")
+    for module, self_time, cumulative, depth in sorted(imports, key=lambda entry: -entry[2])[:args.top]:
+        print(f"{('  ' * depth + module)[:60]:<60} {cumulative * 1000:8.1f}ms {self_time * 1000:7.1f}ms")
+    print(f"\n{'package':<60} {'self':>10} {'share':>9}")
+    for package, self_time in by_package(imports)[:args.top]:
+        print(f"{package:<60} {self_time * 1000:8.1f}ms {self_time / total:8.1%}")
+
+    failed = False
+    packages = {module.split('.')[0] for module, _, _, _ in imports}
+    for package in args.forbid:
+        if package in packages:
+            print(f"FORBIDDEN {package} was imported")
+            failed = True
+    if args.budget is not None and total > args.budget:
+        print(f"OVER BUDGET {total:.3f}s > {args.budget:.3f}s")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Step, page-object method and Playwright call latency instrumentation
+
+Enabled with ``pytest --instrument``. BDD step timings come from the pytest-bdd
+step hooks; page-object methods decorated with ``timed`` and every call made
+through ``TimedProxy`` (the ``page`` fixture when instrumented) are attributed to
+the step that was running. The xdist controller appends all spans to a JSON-lines
+file tagged with a run id, so runs can be compared later.
+
+Usage:
+    python -m utilities.instrumentation show            # latest run
+    python -m utilities.instrumentation show --compare  # latest run against the one before
+"""
+import argparse
+import functools
+import json
+import math
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(spans, kind='step'):
+    """Count, p50, p95 and max duration per span name of one kind, slowest p95 first"""
+    durations = defaultdict(list)
+    for span in spans:
+        if span['kind'] == kind:
+            durations[span['name']].append(span['duration'])
+    rows = [(name, len(values), percentile(values, 0.5), percentile(values, 0.95), max(values))
+            for name, values in durations.items()]
+    return sorted(rows, key=lambda row: -row[3])
+
+
+def format_table(rows, title):
+    """Render summarize() rows as a fixed-width table"""
+    lines = [f"{title:<60} {'count':>6} {'p50':>9} {'p95':>9} {'max':>9}"]
+    for name, count, p50, p95, longest in rows:
+        lines.append(f"{name[:60]:<60} {count:6d} {p50:8.3f}s {p95:8.3f}s {longest:8.3f}s")
+    return lines
+
+
+class Instrumentation:
+    """Spans recorded in this process since the last drain, attributed to the running step"""
+
+    enabled = False
+    current_step = None
+    spans = []
+
+    @classmethod
+    def enable(cls):
+        cls.enabled = True
+
+    @classmethod
+    def start_step(cls, name):
+        cls.current_step = name
+
+    @classmethod
+    def record(cls, kind, name, duration):
+        """Add one span; a no-op unless instrumentation is enabled"""
+        if cls.enabled:
+            cls.spans.append({'kind': kind, 'name': name, 'step': cls.current_step, 'duration': duration})
+
+    @classmethod
+    def drain(cls):
+        """Return and forget the spans recorded so far"""
+        spans, cls.spans, cls.current_step = cls.spans, [], None
+        return spans
+
+
+def timed(func):
+    """Record the duration of a page-object method as a 'page' span"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not Instrumentation.enabled:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            Instrumentation.record('page', func.__qualname__, time.perf_counter() - started)
+    return wrapper
+
+
+class TimedProxy:
+    """Wraps a Playwright Page or Locator and records each method call as a 'playwright' span
+
+    Locators returned by calls or properties are wrapped too, so ``page.locator(...).first.click()``
+    is timed as ``locator.click``.
+    """
+
+    def __init__(self, target, prefix):
+        self._target = target
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        from playwright.sync_api import Locator
+        attribute = getattr(self._target, name)
+        if isinstance(attribute, Locator):
+            return TimedProxy(attribute, 'locator')
+        if not callable(attribute) or name.startswith('_'):
+            return attribute
+
+        @functools.wraps(attribute)
+        def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = attribute(*args, **kwargs)
+            finally:
+                Instrumentation.record('playwright', f"{self._prefix}.{name}", time.perf_counter() - started)
+            return TimedProxy(result, 'locator') if isinstance(result, Locator) else result
+        return call
+
+    def __repr__(self):
+        return f"<TimedProxy {self._target!r}>"
+
+    @classmethod
+    def wrap_page(cls, page):
+        return cls(page, 'page')
+
+
+class InstrumentationRecorder:
+    """pytest plugin on the xdist controller (or plain run) that writes spans and prints the summary"""
+
+    def __init__(self, path):
+        self.path = path
+        self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.spans = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a')
+
+    def pytest_runtest_logreport(self, report):
+        spans = [{'kind': 'step', 'name': step['step'], 'step': step['step'], 'duration': step['duration']}
+                 for step in getattr(report, 'step_durations', None) or []]
+        spans.extend(getattr(report, 'instrumentation', None) or [])
+        for span in spans:
+            span = dict(span, run_id=self.run_id, nodeid=report.nodeid)
+            self.spans.append(span)
+            self._file.write(json.dumps(span) + '\n')
+
+    def pytest_sessionfinish(self, session):
+        self._file.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        for kind, title in (('step', 'step'), ('page', 'page-object method'), ('playwright', 'playwright call')):
+            rows = summarize(self.spans, kind)
+            if rows:
+                terminalreporter.section(f"{title} latency")
+                for line in format_table(rows[:25], title):
+                    terminalreporter.write_line(line)
+        if self.spans:
+            terminalreporter.write_line(f"spans written to {self.path} (run {self.run_id})")
+
+
+def load_runs(path):
+    """Spans from a JSON-lines file, grouped by run id in file order"""
+    runs = {}
+    with open(path, 'r') as file:
+        for line in file:
+            if line.strip():
+                span = json.loads(line)
+                runs.setdefault(span['run_id'], []).append(span)
+    return runs
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from utilities.helpers import ConfigManager
+
+    parser = argparse.ArgumentParser(description="Summarize recorded step latency")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    show_parser = subparsers.add_parser('show', help="p50/p95/max per step for a run")
+    show_parser.add_argument('--run', default=None, help="Run id (defaults to the latest)")
+    show_parser.add_argument('--kind', default='step', choices=['step', 'page', 'playwright'])
+    show_parser.add_argument('--compare', action='store_true', help="Show the p95 change against the previous run")
+    args = parser.parse_args(argv)
+
+    path = ConfigManager.instance().get('instrumentation.path', 'reports/instrumentation.jsonl')
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
+    runs = load_runs(path) if os.path.exists(path) else {}
+    if not runs:
+        print(f"No spans in {path}; run pytest --instrument first")
+        return 1
+    run_ids = list(runs)
+    run_id = args.run or run_ids[-1]
+    rows = summarize(runs[run_id], args.kind)
+    print(f"run {run_id}")
+    if args.compare and run_ids.index(run_id) > 0:
+        previous = {row[0]: row[3] for row in summarize(runs[run_ids[run_ids.index(run_id) - 1]], args.kind)}
+        table = format_table(rows, args.kind)
+        print(f"{table[0]} {'p95 diff':>9}")
+        for line, row in zip(table[1:], rows):
+            change = f"{row[3] - previous[row[0]]:+8.3f}s" if row[0] in previous else "     new"
+            print(f"{line} {change}")
+    else:
+        for line in format_table(rows, args.kind):
+            print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
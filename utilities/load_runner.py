@@ -0,0 +1,263 @@
+"""
+Load generation that runs feature scenarios as concurrent virtual users
+
+Each virtual user repeatedly runs the chosen scenarios (round-robin) through the
+async scenario runner, so the steps and page objects are the same ones the suite
+uses. Users are spread over processes, started gradually over the ramp-up, and
+paced so that all of them together aim for the target rate of scenario starts
+per second until the run duration ends.
+
+Usage:
+    python -m utilities.load_runner features/cart.feature --users 20 --processes 2 \\
+        --ramp-up 30 --duration 300 --rate 4 --base-url https://staging.example.com
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from utilities.async_runner import AsyncScenarioRunner, collect_scenarios
+from utilities.helpers import ConfigManager
+from utilities.instrumentation import format_table, summarize
+
+# Time given to every process to start its browser before the shared clock starts
+START_DELAY = 3.0
+
+
+class LoadProfile:
+    """How many virtual users, in how many processes, how fast and for how long"""
+
+    def __init__(self, users=1, processes=1, ramp_up=0.0, duration=60.0, rate=None):
+        self.users = max(1, int(users))
+        self.processes = max(1, min(int(processes), self.users))
+        self.ramp_up = float(ramp_up)
+        self.duration = float(duration)
+        self.rate = float(rate) if rate else None
+
+    @classmethod
+    def from_config(cls, config, **overrides):
+        """Build a profile from the load_runner section of config.yaml; non-None overrides win"""
+        profile_config = dict(config.get('load_runner') or {})
+        profile_config.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**{key: profile_config[key] for key in ('users', 'processes', 'ramp_up', 'duration', 'rate')
+                      if key in profile_config})
+
+    def users_for_process(self, process_index):
+        """Global indexes of the virtual users a process runs (users are dealt out round-robin)"""
+        return list(range(process_index, self.users, self.processes))
+
+    def start_offset(self, user_index):
+        """Seconds after the start at which a user begins, spreading users evenly over the ramp-up"""
+        return self.ramp_up * user_index / self.users
+
+    @property
+    def pacing(self):
+        """Seconds between scenario starts of one user needed to reach the target rate (0 = as fast as possible)"""
+        return self.users / self.rate if self.rate else 0.0
+
+    def as_dict(self):
+        return {'users': self.users, 'processes': self.processes, 'ramp_up': self.ramp_up,
+                'duration': self.duration, 'rate': self.rate}
+
+
+class VirtualUsers:
+    """Runs the virtual users of one process in a single event loop and browser"""
+
+    def __init__(self, runner, scenarios, profile, user_indexes, start_at, process_index=0):
+        self.runner = runner
+        self.scenarios = scenarios
+        self.profile = profile
+        self.user_indexes = user_indexes
+        self.start_at = start_at
+        self.deadline = start_at + profile.duration
+        self.process_index = process_index
+        self.records = []
+
+    def run(self):
+        """Run until the deadline and return one record per scenario iteration"""
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        from playwright.async_api import async_playwright
+        async with async_playwright() as playwright:
+            browser = await self.runner.launch(playwright)
+            try:
+                await asyncio.gather(*(self.user(browser, user_index) for user_index in self.user_indexes))
+            finally:
+                await browser.close()
+        return self.records
+
+    async def user(self, browser, user_index):
+        """One virtual user: wait for its ramp-up slot, then iterate at the profile's pace"""
+        await asyncio.sleep(max(0.0, self.start_at + self.profile.start_offset(user_index) - time.time()))
+        slot = asyncio.Semaphore(1)
+        iteration = user_index
+        while time.time() < self.deadline:
+            started = time.time()
+            scenario = self.scenarios[iteration % len(self.scenarios)]
+            result = await self.runner.run_scenario(browser, scenario, slot)
+            self.records.append({
+                'feature': result.feature,
+                'scenario': result.name,
+                'passed': result.passed,
+                'error': None if result.passed else f"{type(result.error).__name__}: {result.error}",
+                'failed_step': result.failed_step,
+                'started': started,
+                'duration': result.duration,
+                'steps': result.step_durations,
+                'user': user_index,
+                'process': self.process_index,
+            })
+            iteration += 1
+            pause = min(self.profile.pacing - (time.time() - started), self.deadline - time.time())
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+
+def run_process(paths, tags, profile_dict, process_index, start_at, browser_name, headless, base_url):
+    """Entry point of one load process; module-level so it can be pickled for spawn"""
+    config = ConfigManager.instance()
+    if base_url:
+        config.override('base_url', base_url)
+    profile = LoadProfile(**profile_dict)
+    runner = AsyncScenarioRunner(config, browser_name=browser_name, headless=headless)
+    users = VirtualUsers(runner, collect_scenarios(paths, tags), profile,
+                         profile.users_for_process(process_index), start_at, process_index)
+    return users.run()
+
+
+class LoadReport:
+    """Throughput, error rate and latency percentiles of a load run"""
+
+    def __init__(self, profile, records):
+        self.profile = profile
+        self.records = sorted(records, key=lambda record: record['started'])
+
+    @property
+    def iterations(self):
+        return len(self.records)
+
+    @property
+    def failures(self):
+        return sum(1 for record in self.records if not record['passed'])
+
+    @property
+    def error_rate(self):
+        return self.failures / self.iterations if self.iterations else 0.0
+
+    @property
+    def elapsed(self):
+        """Seconds from the first scenario start to the last scenario end"""
+        if not self.records:
+            return 0.0
+        return max(record['started'] + record['duration'] for record in self.records) - self.records[0]['started']
+
+    @property
+    def throughput(self):
+        """Completed scenarios per second"""
+        return self.iterations / self.elapsed if self.elapsed else 0.0
+
+    def spans(self):
+        """Scenario and step durations in the span format of utilities.instrumentation"""
+        spans = []
+        for record in self.records:
+            spans.append({'kind': 'scenario', 'name': record['scenario'], 'duration': record['duration']})
+            spans.extend({'kind': 'step', 'name': name, 'duration': duration} for name, duration in record['steps'])
+        return spans
+
+    def top_errors(self, limit=5):
+        """Most frequent (failed step, error) pairs"""
+        return Counter((record['failed_step'], record['error'])
+                       for record in self.records if not record['passed']).most_common(limit)
+
+    def lines(self):
+        """Human-readable report"""
+        lines = [
+            f"{self.iterations} scenarios in {self.elapsed:.1f}s: {self.throughput:.2f}/s, "
+            f"{self.failures} failed ({self.error_rate:.1%} error rate)",
+            f"profile: {self.profile.as_dict()}",
+            '',
+        ]
+        spans = self.spans()
+        lines.extend(format_table(summarize(spans, 'scenario'), 'scenario'))
+        lines.append('')
+        lines.extend(format_table(summarize(spans, 'step'), 'step'))
+        if self.failures:
+            lines.append('')
+            lines.append('top errors:')
+            lines.extend(f"{count:6d}x  at \"{step}\": {error}" for (step, error), count in self.top_errors())
+        return lines
+
+    def as_dict(self):
+        return {'profile': self.profile.as_dict(), 'iterations': self.iterations, 'failures': self.failures,
+                'error_rate': self.error_rate, 'throughput': self.throughput, 'elapsed': self.elapsed,
+                'records': self.records}
+
+
+class LoadRunner:
+    """Runs a load profile over chosen scenarios, in this process or across several"""
+
+    def __init__(self, profile, paths, tags=None, browser_name=None, headless=True, base_url=None):
+        self.profile = profile
+        self.paths = paths
+        self.tags = tags
+        self.browser_name = browser_name
+        self.headless = headless
+        self.base_url = base_url
+
+    def run(self):
+        """Run the profile and return a LoadReport"""
+        if not collect_scenarios(self.paths, self.tags):
+            raise ValueError(f"No scenarios found in {self.paths} for tags {self.tags}")
+        start_at = time.time() + START_DELAY
+        arguments = [(self.paths, self.tags, self.profile.as_dict(), index, start_at,
+                      self.browser_name, self.headless, self.base_url) for index in range(self.profile.processes)]
+        if self.profile.processes == 1:
+            records = run_process(*arguments[0])
+        else:
+            # spawn: every process starts its own Playwright driver from a clean interpreter
+            with ProcessPoolExecutor(self.profile.processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+                records = [record for chunk in pool.map(run_process, *zip(*arguments)) for record in chunk]
+        return LoadReport(self.profile, records)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run feature scenarios as concurrent virtual users")
+    parser.add_argument('paths', nargs='*', default=['features'], help="Feature files or directories")
+    parser.add_argument('--tags', nargs='*', default=None, help="Only run scenarios with one of these tags")
+    parser.add_argument('--users', type=int, default=None, help="Virtual users")
+    parser.add_argument('--processes', type=int, default=None, help="Processes to spread the users over")
+    parser.add_argument('--ramp-up', type=float, default=None, help="Seconds over which users start")
+    parser.add_argument('--duration', type=float, default=None, help="Seconds to generate load for")
+    parser.add_argument('--rate', type=float, default=None, help="Target scenario starts per second (all users)")
+    parser.add_argument('--browser', default=None, help="Browser to use (chromium, firefox, webkit)")
+    parser.add_argument('--base-url', default=None, help="Storefront to load (defaults to base_url)")
+    parser.add_argument('--max-error-rate', type=float, default=None, help="Exit 1 above this error rate (0-1)")
+    parser.add_argument('--output', default=None, help="Also write the report and every iteration as JSON")
+    args = parser.parse_args(argv)
+
+    config = ConfigManager.instance()
+    profile = LoadProfile.from_config(config, users=args.users, processes=args.processes, ramp_up=args.ramp_up,
+                                      duration=args.duration, rate=args.rate)
+    runner = LoadRunner(profile, args.paths, args.tags, browser_name=args.browser,
+                        headless=True, base_url=args.base_url)
+    report = runner.run()
+    print('\n'.join(report.lines()))
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w') as file:
+            json.dump(report.as_dict(), file, indent=2)
+    max_error_rate = config.get('load_runner.max_error_rate', 0.0) if args.max_error_rate is None else args.max_error_rate
+    return 1 if report.error_rate > max_error_rate else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# Local stand-in for the storefront (enable with `storefront: local` in config.yaml or STOREFRONT=local)
+from utilities.local_storefront.server import Fault, LocalStorefront
@@ -0,0 +1,169 @@
+"""
+HTTP server for the local storefront, with optional latency and error injection
+"""
+import fnmatch
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+# Page URLs of the real site mapped to the bundled files
+ROUTES = {
+    '/': '/index.html',
+    '/inventory.html': '/inventory.html',
+    '/cart.html': '/cart.html',
+}
+
+
+class Fault:
+    """Latency and/or an error status injected into requests whose path matches a glob pattern"""
+
+    def __init__(self, path='*', latency_ms=0, status=None, rate=1.0):
+        self.path = path
+        self.latency_ms = latency_ms
+        self.status = status
+        self.rate = rate
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a fault from a ``local_storefront.faults`` entry of config.yaml"""
+        return cls(data.get('path', '*'), data.get('latency_ms', 0), data.get('status'), data.get('rate', 1.0))
+
+    def matches(self, path):
+        """Check whether the fault applies to a request path"""
+        return fnmatch.fnmatchcase(path, self.path)
+
+    def __repr__(self):
+        return f"<Fault {self.path} latency={self.latency_ms}ms status={self.status} rate={self.rate}>"
+
+
+class StorefrontRequestHandler(SimpleHTTPRequestHandler):
+    """Serves the bundled pages and applies the server's faults before responding"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=STATIC_DIR, **kwargs)
+
+    def do_GET(self):
+        if self.server.storefront.apply_faults(self):
+            return
+        super().do_GET()
+
+    def do_HEAD(self):
+        if self.server.storefront.apply_faults(self):
+            return
+        super().do_HEAD()
+
+    def translate_path(self, path):
+        request_path = urlsplit(path).path
+        if request_path.startswith('/static/'):
+            request_path = request_path[len('/static'):]
+        return super().translate_path(ROUTES.get(request_path, request_path))
+
+    def end_headers(self):
+        # Every run must see the current files, never a browser-cached copy
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        """Keep test output clean; requests are counted by the storefront instead"""
+
+
+class LocalStorefront:
+    """Local stand-in for the storefront, served from a background thread
+
+    Serves the login, inventory and cart pages with the markup, ``data-test``
+    attributes, ``session-username`` cookie and ``localStorage`` cart the page
+    objects rely on, so the suite can run without network access.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, faults=(), seed=None):
+        self.host = host
+        self.port = port
+        self.faults = list(faults)
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a storefront from the local_storefront section of config.yaml"""
+        storefront_config = config.get('local_storefront') or {}
+        faults = [Fault.from_dict(fault) for fault in storefront_config.get('faults') or []]
+        latency_ms = storefront_config.get('latency_ms', 0)
+        if latency_ms:
+            faults.insert(0, Fault('*', latency_ms=latency_ms))
+        return cls(
+            host=storefront_config.get('host', '127.0.0.1'),
+            port=storefront_config.get('port', 0),
+            faults=faults,
+            seed=storefront_config.get('seed')
+        )
+
+    @staticmethod
+    def is_enabled(config):
+        """Whether tests should run against the local storefront instead of base_url"""
+        return str(config.get('storefront', 'remote')).lower() == 'local'
+
+    @property
+    def url(self):
+        """Base URL of the running server"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a daemon thread; port 0 picks a free port"""
+        self._server = ThreadingHTTPServer((self.host, self.port), StorefrontRequestHandler)
+        self._server.daemon_threads = True
+        self._server.storefront = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='local-storefront', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and wait for its thread"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @contextmanager
+    def inject(self, path='*', latency_ms=0, status=None, rate=1.0):
+        """Apply a fault for the duration of a with block, e.g. to test a slow inventory page"""
+        fault = Fault(path, latency_ms, status, rate)
+        with self._lock:
+            self.faults.append(fault)
+        try:
+            yield fault
+        finally:
+            with self._lock:
+                self.faults.remove(fault)
+
+    def apply_faults(self, handler):
+        """Delay or fail a request; return True when an error response was sent"""
+        path = urlsplit(handler.path).path
+        with self._lock:
+            self.request_count += 1
+            faults = [fault for fault in self.faults if fault.matches(path) and self.random.random() < fault.rate]
+        delay = sum(fault.latency_ms for fault in faults)
+        if delay:
+            time.sleep(delay / 1000)
+        for fault in faults:
+            if fault.status:
+                handler.send_error(fault.status, "Injected by local storefront")
+                return True
+        return False
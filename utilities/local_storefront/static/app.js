@@ -0,0 +1,197 @@
+// Local stand-in for the saucedemo storefront: same markup, session cookie and localStorage cart
+(function () {
+    'use strict';
+
+    var SESSION_COOKIE = 'session-username';
+    var CART_KEY = 'cart-contents';
+    var PASSWORD = 'secret_sauce';
+    var USERS = ['standard_user', 'locked_out_user', 'problem_user', 'performance_glitch_user', 'error_user', 'visual_user'];
+
+    var PRODUCTS = [
+        {id: 0, name: 'Sauce Labs Bike Light', price: 9.99,
+         desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included."},
+        {id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99,
+         desc: 'Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt.'},
+        {id: 2, name: 'Sauce Labs Onesie', price: 7.99,
+         desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+        {id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99,
+         desc: 'This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton.'},
+        {id: 4, name: 'Sauce Labs Backpack', price: 29.99,
+         desc: 'carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection.'},
+        {id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99,
+         desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office."}
+    ];
+
+    var SORTS = {
+        az: function (a, b) { return a.name.localeCompare(b.name); },
+        za: function (a, b) { return b.name.localeCompare(a.name); },
+        lohi: function (a, b) { return a.price - b.price; },
+        hilo: function (a, b) { return b.price - a.price; }
+    };
+
+    function slug(name) {
+        return name.toLowerCase().replace(/ /g, '-');
+    }
+
+    function el(tag, attrs, children) {
+        var node = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (key) { node.setAttribute(key, attrs[key]); });
+        (children || []).forEach(function (child) {
+            node.appendChild(typeof child === 'string' ? document.createTextNode(child) : child);
+        });
+        return node;
+    }
+
+    function sessionUser() {
+        var match = document.cookie.match(new RegExp('(?:^|; )' + SESSION_COOKIE + '=([^;]*)'));
+        return match ? decodeURIComponent(match[1]) : null;
+    }
+
+    function getCart() {
+        try {
+            return JSON.parse(localStorage.getItem(CART_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function setCart(ids) {
+        if (ids.length) {
+            localStorage.setItem(CART_KEY, JSON.stringify(ids));
+        } else {
+            localStorage.removeItem(CART_KEY);
+        }
+        renderBadge();
+    }
+
+    function renderBadge() {
+        var link = document.querySelector('.shopping_cart_link');
+        var count = getCart().length;
+        link.textContent = '';
+        if (count) {
+            link.appendChild(el('span', {'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge'}, [String(count)]));
+        }
+    }
+
+    function cartButton(product, extraClass) {
+        var inCart = getCart().indexOf(product.id) !== -1;
+        var button = el('button', {
+            'class': 'btn btn_small ' + extraClass + (inCart ? ' btn_secondary' : ' btn_primary'),
+            'data-test': (inCart ? 'remove-' : 'add-to-cart-') + slug(product.name),
+            'name': (inCart ? 'remove-' : 'add-to-cart-') + slug(product.name)
+        }, [inCart ? 'Remove' : 'Add to cart']);
+        button.addEventListener('click', function () {
+            var cart = getCart();
+            var index = cart.indexOf(product.id);
+            if (index === -1) {
+                cart.push(product.id);
+            } else {
+                cart.splice(index, 1);
+            }
+            setCart(cart);
+            render();
+        });
+        return button;
+    }
+
+    function showError(message) {
+        var container = document.querySelector('.error-message-container');
+        container.className = 'error-message-container error';
+        container.textContent = '';
+        container.appendChild(el('h3', {'data-test': 'error'}, [message]));
+    }
+
+    function initLogin() {
+        var params = new URLSearchParams(location.search);
+        if (params.get('from')) {
+            showError("Epic sadface: You can only access '" + params.get('from') + "' when you are logged in.");
+        }
+        document.getElementById('login_form').addEventListener('submit', function (event) {
+            event.preventDefault();
+            var username = document.querySelector('[data-test="username"]').value;
+            var password = document.querySelector('[data-test="password"]').value;
+            if (!username) {
+                return showError('Epic sadface: Username is required');
+            }
+            if (!password) {
+                return showError('Epic sadface: Password is required');
+            }
+            if (USERS.indexOf(username) === -1 || password !== PASSWORD) {
+                return showError('Epic sadface: Username and password do not match any user in this service');
+            }
+            if (username === 'locked_out_user') {
+                return showError('Epic sadface: Sorry, this user has been locked out.');
+            }
+            var expires = new Date(Date.now() + 10 * 60 * 1000).toUTCString();
+            document.cookie = SESSION_COOKIE + '=' + encodeURIComponent(username) + '; expires=' + expires + '; path=/';
+            location.href = '/inventory.html';
+        });
+    }
+
+    function renderInventory() {
+        var list = document.querySelector('.inventory_list');
+        var order = document.querySelector('.product_sort_container').value;
+        list.textContent = '';
+        PRODUCTS.slice().sort(SORTS[order]).forEach(function (product) {
+            list.appendChild(el('div', {'class': 'inventory_item', 'data-test': 'inventory-item'}, [
+                el('div', {'class': 'inventory_item_description'}, [
+                    el('div', {'class': 'inventory_item_label'}, [
+                        el('a', {'id': 'item_' + product.id + '_title_link', 'href': '#'}, [
+                            el('div', {'class': 'inventory_item_name', 'data-test': 'inventory-item-name'}, [product.name])
+                        ]),
+                        el('div', {'class': 'inventory_item_desc', 'data-test': 'inventory-item-desc'}, [product.desc])
+                    ]),
+                    el('div', {'class': 'pricebar'}, [
+                        el('div', {'class': 'inventory_item_price', 'data-test': 'inventory-item-price'}, ['$' + product.price.toFixed(2)]),
+                        cartButton(product, 'btn_inventory')
+                    ])
+                ])
+            ]));
+        });
+    }
+
+    function renderCart() {
+        var list = document.querySelector('.cart_list');
+        Array.prototype.forEach.call(list.querySelectorAll('.cart_item'), function (item) { list.removeChild(item); });
+        getCart().forEach(function (id) {
+            var product = PRODUCTS[id];
+            if (!product) {
+                return;
+            }
+            list.appendChild(el('div', {'class': 'cart_item', 'data-test': 'inventory-item'}, [
+                el('div', {'class': 'cart_quantity', 'data-test': 'item-quantity'}, ['1']),
+                el('div', {'class': 'cart_item_label'}, [
+                    el('a', {'id': 'item_' + product.id + '_title_link', 'href': '#'}, [
+                        el('div', {'class': 'inventory_item_name', 'data-test': 'inventory-item-name'}, [product.name])
+                    ]),
+                    el('div', {'class': 'inventory_item_desc', 'data-test': 'inventory-item-desc'}, [product.desc]),
+                    el('div', {'class': 'item_pricebar'}, [
+                        el('div', {'class': 'inventory_item_price', 'data-test': 'inventory-item-price'}, ['$' + product.price.toFixed(2)]),
+                        cartButton(product, 'cart_button')
+                    ])
+                ])
+            ]));
+        });
+    }
+
+    var page = location.pathname.replace(/^\/+/, '') || 'index.html';
+    var render = page === 'cart.html' ? renderCart : renderInventory;
+
+    if (page === 'index.html') {
+        initLogin();
+        return;
+    }
+    if (!sessionUser()) {
+        location.replace('/?from=' + encodeURIComponent('/' + page));
+        return;
+    }
+    if (page === 'inventory.html') {
+        document.querySelector('.product_sort_container').addEventListener('change', render);
+    } else {
+        document.getElementById('continue-shopping').addEventListener('click', function () {
+            location.href = '/inventory.html';
+        });
+    }
+    renderBadge();
+    render();
+}());
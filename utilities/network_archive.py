@@ -0,0 +1,256 @@
+"""
+HAR record-and-replay of browser traffic, with response bodies deduplicated across archives
+
+Archives live in ``<archive_dir>/<feature>.har``. Bodies are stored once per content
+hash in ``<archive_dir>/blobs`` and referenced from entries through ``_file``, the
+same convention Playwright uses for HAR attachments.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+NETWORK_MODES = ('live', 'record', 'replay')
+
+# Bodies are stored decoded, so these no longer describe them
+DROPPED_RESPONSE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+def body_hash(post_data):
+    """sha256 of a request body, or '' for requests without one"""
+    return hashlib.sha256(post_data).hexdigest() if post_data else ''
+
+
+def request_key(method, url, post_data_hash=''):
+    """Identity of a request when matching it against an archive"""
+    return f"{method} {url} {post_data_hash}"
+
+
+def merge_headers(headers_array, dropped=()):
+    """Turn a Playwright headers array into a dict, joining repeated headers (set-cookie) with newlines"""
+    headers = {}
+    for header in headers_array:
+        name = header['name'].lower()
+        if name in dropped:
+            continue
+        headers[name] = f"{headers[name]}\n{header['value']}" if name in headers else header['value']
+    return headers
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on ``path`` (created if needed) across processes, e.g. xdist workers"""
+    with open(path, 'a+b') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            # LK_LOCK retries for about 10 seconds before giving up
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ReplayMissError(AssertionError):
+    """A request made during replay has no recorded response"""
+
+
+class HarArchive:
+    """One HAR file per feature; entries carry the node id of the scenario that recorded them"""
+
+    def __init__(self, archive_dir, name):
+        self.archive_dir = archive_dir
+        self.blob_dir = os.path.join(archive_dir, 'blobs')
+        self.path = os.path.join(archive_dir, f"{name}.har")
+
+    @classmethod
+    def from_config(cls, config, name):
+        """Archive for a feature in the directory configured under network.archive_dir"""
+        archive_dir = config.get('network.archive_dir', 'recordings')
+        if not os.path.isabs(archive_dir):
+            archive_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), archive_dir)
+        return cls(archive_dir, name)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load_entries(self):
+        """All entries of the archive, or an empty list if it was never recorded"""
+        try:
+            with open(self.path, 'r') as file:
+                return json.load(file)['log']['entries']
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def replace_scenario(self, scenario, entries):
+        """Store a scenario's entries, replacing whatever it recorded before"""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        # Scenarios of one feature can record on several workers at once; without the lock a
+        # concurrent read-modify-write would drop the other worker's entries
+        with file_lock(f"{self.path}.lock"):
+            kept = [entry for entry in self.load_entries() if entry.get('_scenario') != scenario]
+            har = {'log': {
+                'version': '1.2',
+                'creator': {'name': 'utilities.network_archive', 'version': '1.0'},
+                'pages': [],
+                'entries': kept + entries,
+            }}
+            fd, tmp_path = tempfile.mkstemp(dir=self.archive_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as file:
+                json.dump(har, file, indent=1)
+            os.replace(tmp_path, self.path)
+
+    def write_blob(self, body):
+        """Store a body under its content hash (once) and return its path relative to the archive"""
+        name = hashlib.sha256(body).hexdigest()
+        blob_path = os.path.join(self.blob_dir, name)
+        if not os.path.exists(blob_path):
+            os.makedirs(self.blob_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                file.write(body)
+            os.replace(tmp_path, blob_path)
+        return f"blobs/{name}"
+
+    def read_blob(self, relative_path):
+        with open(os.path.join(self.archive_dir, relative_path), 'rb') as file:
+            return file.read()
+
+
+class NetworkRecorder:
+    """Fetches every request from the network and records it into the feature archive"""
+
+    def __init__(self, archive, scenario):
+        self.archive = archive
+        self.scenario = scenario
+        self.entries = []
+
+    def attach(self, context):
+        """Route the context's traffic through the recorder (register before other route handlers)"""
+        context.route('**/*', self.handle)
+
+    def handle(self, route):
+        from playwright.sync_api import Error as PlaywrightError
+        request = route.request
+        started = time.perf_counter()
+        try:
+            # Redirects are recorded as-is so the browser follows them during replay too
+            response = route.fetch(max_redirects=0)
+        except PlaywrightError:
+            route.abort('failed')
+            return
+        body = response.body()
+        self.entries.append(self._entry(request, response, body, (time.perf_counter() - started) * 1000))
+        route.fulfill(response=response, body=body)
+
+    def save(self):
+        """Write this scenario's traffic into the archive"""
+        self.archive.replace_scenario(self.scenario, self.entries)
+
+    def _entry(self, request, response, body, elapsed_ms):
+        headers = response.headers_array()
+        entry = {
+            '_scenario': self.scenario,
+            'startedDateTime': datetime.now(timezone.utc).isoformat(),
+            'time': round(elapsed_ms, 3),
+            'request': {
+                'method': request.method,
+                'url': request.url,
+                'httpVersion': 'HTTP/1.1',
+                'headers': request.headers_array(),
+                'queryString': [],
+                'cookies': [],
+                'headersSize': -1,
+                'bodySize': len(request.post_data_buffer or b''),
+            },
+            'response': {
+                'status': response.status,
+                'statusText': response.status_text,
+                'httpVersion': 'HTTP/1.1',
+                'headers': headers,
+                'cookies': [],
+                'content': {
+                    'size': len(body),
+                    'mimeType': merge_headers(headers).get('content-type', ''),
+                    '_file': self.archive.write_blob(body),
+                },
+                'redirectURL': merge_headers(headers).get('location', ''),
+                'headersSize': -1,
+                'bodySize': len(body),
+            },
+            'cache': {},
+            'timings': {'send': 0, 'wait': round(elapsed_ms, 3), 'receive': 0},
+        }
+        if request.post_data_buffer:
+            entry['request']['postData'] = {
+                'mimeType': request.headers.get('content-type', ''),
+                'text': request.post_data_buffer.decode('utf-8', 'replace'),
+                '_sha256': body_hash(request.post_data_buffer),
+            }
+        return entry
+
+
+class NetworkReplayer:
+    """Serves requests from the feature archive and records every request it cannot serve
+
+    Entries recorded by the running scenario are preferred; the rest of the feature's
+    entries (shared Background steps, other scenarios) are used after them. Repeated
+    requests get the recorded responses in order, then the last one again.
+    """
+
+    def __init__(self, archive, scenario):
+        self.archive = archive
+        self.scenario = scenario
+        self.misses = []
+        self._responses = {}
+        self._served = {}
+        entries = archive.load_entries()
+        entries.sort(key=lambda entry: entry.get('_scenario') != scenario)
+        for entry in entries:
+            request = entry['request']
+            key = request_key(request['method'], request['url'], request.get('postData', {}).get('_sha256', ''))
+            self._responses.setdefault(key, []).append(entry['response'])
+
+    def attach(self, context):
+        """Route the context's traffic to the archive (register before other route handlers)"""
+        context.route('**/*', self.handle)
+
+    def handle(self, route):
+        request = route.request
+        key = request_key(request.method, request.url, body_hash(request.post_data_buffer))
+        responses = self._responses.get(key)
+        if not responses:
+            self.misses.append(f"{request.method} {request.url}")
+            route.abort('internetdisconnected')
+            return
+        index = self._served.get(key, 0)
+        self._served[key] = index + 1
+        response = responses[min(index, len(responses) - 1)]
+        route.fulfill(
+            status=response['status'],
+            headers=merge_headers(response['headers'], DROPPED_RESPONSE_HEADERS),
+            body=self.archive.read_blob(response['content']['_file'])
+        )
+
+    def check(self):
+        """Raise ReplayMissError listing the requests the archive could not answer"""
+        if self.misses:
+            listed = '\n    '.join(self.misses)
+            raise ReplayMissError(
+                f"{len(self.misses)} request(s) not found in {self.archive.path} "
+                f"(re-record with --network=record):\n    {listed}")
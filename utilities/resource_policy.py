@@ -0,0 +1,147 @@
+"""
+Declarative network resource policy that blocks or stubs requests for a browser context
+"""
+import fnmatch
+import json
+import os
+
+STUB_CONTENT_TYPES = {
+    'script': 'application/javascript',
+    'stylesheet': 'text/css',
+    'fetch': 'application/json',
+    'xhr': 'application/json',
+}
+
+
+class ResourceSizes:
+    """Response sizes seen while resources were allowed, used to estimate the bytes a policy avoided
+
+    Blocked requests never load, so their sizes come from a calibration run that
+    lets everything through (``--calibrate-resources``). Only the ``limit`` most
+    recently seen URLs are kept.
+    """
+
+    def __init__(self, path=None, limit=5000):
+        self.path = path
+        self.limit = limit
+        self.sizes = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as file:
+                    self.sizes = json.load(file)
+            except (OSError, ValueError):
+                self.sizes = {}
+
+    def observe(self, response):
+        """Remember the Content-Length of a response that was allowed through"""
+        length = response.headers.get('content-length')
+        if length and length.isdigit():
+            # Re-inserted so the dict stays ordered from least to most recently seen
+            self.sizes.pop(response.url, None)
+            self.sizes[response.url] = int(length)
+
+    def get(self, url):
+        """Known size of a URL in bytes, or None"""
+        return self.sizes.get(url)
+
+    def save(self):
+        """Persist the learned sizes for later runs"""
+        if self.path:
+            # Keep sizes learned by other xdist workers, then drop the least recently seen
+            merged = {url: size for url, size in ResourceSizes(self.path).sizes.items() if url not in self.sizes}
+            merged.update(self.sizes)
+            merged = dict(list(merged.items())[-self.limit:])
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump(merged, file)
+            os.replace(tmp_path, self.path)
+
+
+class ResourceStats:
+    """Requests and bytes a policy avoided in one context; unsized requests have no known size"""
+
+    def __init__(self):
+        self.blocked = 0
+        self.stubbed = 0
+        self.bytes_avoided = 0
+        self.unsized = 0
+
+    def avoided(self, size):
+        """Count the bytes of an avoided request, if its size is known"""
+        if size is None:
+            self.unsized += 1
+        else:
+            self.bytes_avoided += size
+
+    def as_dict(self):
+        """Plain dict, safe to attach to a test report"""
+        return {'blocked': self.blocked, 'stubbed': self.stubbed, 'bytes_avoided': self.bytes_avoided,
+                'unsized': self.unsized}
+
+
+class ResourcePolicy:
+    """Blocks requests by resource type or URL pattern and stubs others with an empty 200 response
+
+    Allowed requests fall back to any other route handler on the context, so the
+    policy can be layered over other routing (it must be registered last).
+    """
+
+    def __init__(self, block_resource_types=(), block_urls=(), stub_urls=(), sizes=None):
+        self.block_resource_types = set(block_resource_types or ())
+        self.block_urls = list(block_urls or ())
+        self.stub_urls = list(stub_urls or ())
+        self.sizes = sizes if sizes is not None else ResourceSizes()
+        self.stats = ResourceStats()
+
+    @classmethod
+    def from_config(cls, config, markers=(), feature=None, sizes=None):
+        """Build the policy for a test from the resource_policy section of config.yaml
+
+        Entries under ``overrides`` are keyed by marker name (feature tags are markers)
+        or feature file name, and are merged over the defaults in that order.
+        Returns None when the policy is disabled for the test.
+        """
+        policy_config = dict(config.get('resource_policy') or {})
+        overrides = policy_config.pop('overrides', None) or {}
+        for key in list(markers) + ([feature] if feature else []):
+            policy_config.update(overrides.get(key) or {})
+        if not policy_config.get('enabled', True):
+            return None
+        return cls(
+            block_resource_types=policy_config.get('block_resource_types'),
+            block_urls=policy_config.get('block_urls'),
+            stub_urls=policy_config.get('stub_urls'),
+            sizes=sizes
+        )
+
+    @property
+    def is_active(self):
+        """Whether the policy would intercept anything at all"""
+        return bool(self.block_resource_types or self.block_urls or self.stub_urls)
+
+    def apply(self, context):
+        """Route every request of the context through the policy"""
+        if self.is_active:
+            context.route('**/*', self.handle)
+        context.on('response', self.sizes.observe)
+
+    def handle(self, route):
+        """Block, stub or let a request through"""
+        request = route.request
+        if request.resource_type in self.block_resource_types or self._matches(request.url, self.block_urls):
+            self.stats.blocked += 1
+            self.stats.avoided(self.sizes.get(request.url))
+            route.abort('blockedbyclient')
+        elif self._matches(request.url, self.stub_urls):
+            self.stats.stubbed += 1
+            self.stats.avoided(self.sizes.get(request.url))
+            route.fulfill(status=200, body='',
+                          content_type=STUB_CONTENT_TYPES.get(request.resource_type, 'text/plain'))
+        else:
+            route.fallback()
+
+    @staticmethod
+    def _matches(url, patterns):
+        """Check a URL against glob patterns"""
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
@@ -0,0 +1,72 @@
+"""
+Persistent cache of which candidate selector worked for each page object and app version
+"""
+import json
+import os
+import tempfile
+
+
+class SelectorCache:
+    """JSON file mapping '<Page>.<locator>@<app version>' to the selector that matched last time
+
+    ``NO_MATCH`` records that none of the candidates appeared, so callers can go
+    straight to their fallback instead of waiting out the timeout again.
+    """
+
+    NO_MATCH = '<no match>'
+    _instances = {}
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = self._read()
+
+    @classmethod
+    def instance(cls, config):
+        """Get the process-wide cache for the file configured in config.yaml"""
+        path = (config.get('selector_cache') or {}).get('path', 'reports/selector_cache.json')
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
+        if path not in cls._instances:
+            cls._instances[path] = cls(path)
+        return cls._instances[path]
+
+    @staticmethod
+    def make_key(page_name, locator_name, app_version):
+        """Cache key for one locator of one page object"""
+        return f"{page_name}.{locator_name}@{app_version}"
+
+    def get(self, key):
+        """Selector that worked last time, or None"""
+        return self._entries.get(key)
+
+    def set(self, key, selector):
+        """Remember the winning selector and persist it, keeping entries written by other workers"""
+        if self._entries.get(key) == selector:
+            return
+        self._write({**self._entries, **self._read(), key: selector})
+
+    def remove(self, key):
+        """Forget a selector that no longer matches"""
+        if key not in self._entries:
+            return
+        entries = {**self._entries, **self._read()}
+        entries.pop(key, None)
+        self._write(entries)
+
+    def _write(self, entries):
+        """Persist the entries atomically"""
+        self._entries = entries
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump(self._entries, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _read(self):
+        """Load the cache file, treating a missing or corrupt file as empty"""
+        try:
+            with open(self.path, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
@@ -0,0 +1,190 @@
+"""
+Queue-based, structured logging for the framework
+
+Loggers set up through ``LogManager`` share one ``QueueHandler``: the test thread
+only stamps each record with the xdist worker, scenario, step and time into the
+step (``LogContext``) and puts it on a queue. A ``QueueListener`` thread formats the
+records as JSON lines into a file per worker (``framework.gw0.jsonl``) and, above
+``console_level``, as text to stderr. ``merge`` combines the worker files into one
+time-ordered log at session end.
+"""
+import copy
+import glob
+import heapq
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+CONTEXT_FIELDS = ('worker', 'scenario', 'nodeid', 'step', 'step_elapsed')
+# Attributes every LogRecord has; anything else was passed with extra= and is written as a field
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', *CONTEXT_FIELDS}
+
+_context = ContextVar('log_context', default={})
+
+
+def worker_id():
+    return os.environ.get('PYTEST_XDIST_WORKER', 'master')
+
+
+class LogContext:
+    """Scenario and step being run, stamped on every record logged from the same context"""
+
+    @staticmethod
+    def scenario(name, nodeid=None):
+        _context.set({'scenario': name, 'nodeid': nodeid})
+
+    @staticmethod
+    def step(name):
+        _context.set({**_context.get(), 'step': name, 'step_started': time.perf_counter()})
+
+    @staticmethod
+    def clear():
+        _context.set({})
+
+
+class ContextFilter(logging.Filter):
+    """Adds the worker, scenario, step and seconds since the step started on the logging thread"""
+
+    def filter(self, record):
+        context = _context.get()
+        record.worker = worker_id()
+        record.scenario = context.get('scenario')
+        record.nodeid = context.get('nodeid')
+        record.step = context.get('step')
+        started = context.get('step_started')
+        record.step_elapsed = round(time.perf_counter() - started, 6) if started is not None else None
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the message and the traceback apart instead of formatting them together"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, context fields and extras"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='microseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'location': f"{record.module}:{record.funcName}:{record.lineno}",
+        }
+        entry.update((field, getattr(record, field, None)) for field in CONTEXT_FIELDS)
+        entry.update((key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class QueueLogging:
+    """A log queue with its listener thread, writing the per-worker file of one merged log"""
+
+    _instances = {}
+
+    def __init__(self, path, console_level='WARNING'):
+        self.path = path
+        self.worker_path = self.worker_file(path, worker_id())
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.queue = queue.SimpleQueue()
+        self.handler = StructuredQueueHandler(self.queue)
+        self.handler.addFilter(ContextFilter())
+        file_handler = logging.FileHandler(self.worker_path, encoding='utf-8', delay=True)
+        file_handler.setFormatter(JsonLinesFormatter())
+        self.handlers = [file_handler]
+        if console_level:
+            console_handler = logging.StreamHandler(sys.stderr)
+            console_handler.setLevel(console_level)
+            console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+            self.handlers.append(console_handler)
+        self.listener = logging.handlers.QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+        self.listener.start()
+        self._loggers = []
+
+    @classmethod
+    def instance(cls, config, path=None):
+        """Get the process-wide backend for a log file (default: logging.path in config.yaml)"""
+        logging_config = config.get('logging') or {}
+        path = path or logging_config.get('path', 'reports/logs/framework.jsonl')
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
+        if path not in cls._instances:
+            cls._instances[path] = cls(path, console_level=logging_config.get('console_level', 'WARNING'))
+        return cls._instances[path]
+
+    @staticmethod
+    def worker_file(path, worker):
+        stem, _ = os.path.splitext(path)
+        return f"{stem}.{worker}.jsonl"
+
+    def attach(self, logger):
+        """Send a logger's records through the queue unless an ancestor it propagates to already does"""
+        current = logger
+        while current is not None:
+            if self.handler in current.handlers:
+                return
+            current = current.parent if current.propagate else None
+        logger.addHandler(self.handler)
+        self._loggers.append(logger)
+
+    def close(self):
+        """Write what is queued, stop the listener and detach from the loggers"""
+        for logger in self._loggers:
+            logger.removeHandler(self.handler)
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+    @classmethod
+    def close_all(cls):
+        """Flush and stop every backend created in this process; returns the merged log paths"""
+        paths = list(cls._instances)
+        for backend in cls._instances.values():
+            backend.close()
+        cls._instances = {}
+        return paths
+
+    @classmethod
+    def clear(cls, path):
+        """Remove worker files left behind by an earlier run"""
+        for worker_path in glob.glob(cls.worker_file(glob.escape(path), '*')):
+            os.remove(worker_path)
+
+    @classmethod
+    def merge(cls, path):
+        """Merge the worker files of a log into it, ordered by time; returns the number of records"""
+        worker_paths = sorted(glob.glob(cls.worker_file(glob.escape(path), '*')))
+        files = [open(worker_path, encoding='utf-8') for worker_path in worker_paths]
+        count = 0
+        try:
+            # Each worker file is already in time order, so a streaming k-way merge is enough
+            streams = [((json.loads(line)['time'], line) for line in file if line.strip()) for file in files]
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as merged:
+                for _, line in heapq.merge(*streams):
+                    merged.write(line if line.endswith('\n') else line + '\n')
+                    count += 1
+        finally:
+            for file in files:
+                file.close()
+        os.replace(f"{path}.tmp", path)
+        for worker_path in worker_paths:
+            os.remove(worker_path)
+        return count
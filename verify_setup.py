@@ -24,9 +24,8 @@ def test_imports():
         print("✓ pytest-bdd imported successfully")
         
         # Test config loading
-        config_path = os.path.join(project_root, 'config.yaml')
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
+        from utilities.helpers import ConfigManager
+        config = ConfigManager.instance(os.path.join(project_root, 'config.yaml'))
         print("✓ config.yaml loaded successfully")
         print(f"  Base URL: {config.get('base_url')}")
         